@@ -1,15 +1,49 @@
+from __future__ import annotations
+from time import perf_counter
+_import_start = perf_counter()
+
 from widgets import Frame, Label, Button
 from canvas import Canvas, CanvasObject
+from itemstore import CanvasItem
 from widget import Widget, BaseWidget
 from event import Event
 from grid import Grid
-import pygame_winapi
+from style import Style
+from backend import create_backend
 import constants
 
+from importlib import import_module
+from weakref import WeakSet
 from threading import Lock
 from sys import stderr
 import traceback
 import pygame
+import gc
+
+_import_time = perf_counter() - _import_start
+
+
+def _get_winapi():
+    # `pygame_winapi` loads `ctypes.windll` so only import it when needed
+    import pygame_winapi
+    return pygame_winapi
+
+
+# The opt-in parts are only imported when they are first used:
+#     {name: module}
+_LAZY_NAMES = {"ListView": "listview", "Table": "table",
+               "TextView": "textview", "Text": "text", "Entry": "text",
+               "InputRecorder": "recording", "InputReplayer": "recording",
+               "LayoutSnapshot": "layout", "EventTracer": "tracing",
+               "Variable": "variables", "StringVar": "variables",
+               "IntVar": "variables", "DoubleVar": "variables"}
+
+def __getattr__(name:str):
+    if name in _LAZY_NAMES:
+        value = globals()[name] = getattr(import_module(_LAZY_NAMES[name]),
+                                          name)
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 ROOT_HANDLED_EVENTS = ("<Configure>", "<Enter>", "<Leave>",
@@ -51,6 +85,10 @@ class AfterHandler:
 
     def stop_after_script(self, id:int) -> None:
         if id in self.functions_dict:
+            with self.lock:
+                pygame.time.set_timer(id, 0)
+                # Don't keep the function (and what it uses) alive
+                self.functions_dict.pop(id)
             self.free_id(id)
 
     def callit(self, event:Event) -> str:
@@ -66,32 +104,188 @@ class AfterHandler:
         return "break"
 
 
+class CursorHandler:
+    """
+    Works out the cursor of the deepest widget under the mouse once per
+    frame and only calls into SDL when it actually changes.
+    """
+    def __init__(self, root):
+        self.root = root
+        # SDL starts with the default cursor so there is nothing to do
+        # until the mouse enters/leaves a widget
+        self.current = constants.parse_cursor("")
+        self.dirty = False
+        self.compiled = {} # {cursor: pygame.cursors.Cursor}
+
+    def invalidate(self) -> None:
+        self.dirty = True
+
+    def get_cursor(self):
+        # `_mouse_over_widget` starts with the deepest widget
+        for widget in self.root._mouse_over_widget:
+            if not widget._destroyed:
+                return widget._cursor
+        return self.root._default_cursor
+
+    def compile(self, cursor) -> pygame.cursors.Cursor:
+        if cursor not in self.compiled:
+            if isinstance(cursor, tuple):
+                self.compiled[cursor] = pygame.cursors.Cursor(*cursor)
+            else:
+                self.compiled[cursor] = pygame.cursors.Cursor(cursor)
+        return self.compiled[cursor]
+
+    def update(self) -> None:
+        if not self.dirty:
+            return None
+        self.dirty = False
+        cursor = self.get_cursor()
+        if cursor == self.current:
+            return None
+        try:
+            if cursor == "none":
+                pygame.mouse.set_visible(False)
+            else:
+                if self.current == "none":
+                    pygame.mouse.set_visible(True)
+                pygame.mouse.set_cursor(self.compile(cursor))
+        except pygame.error:
+            # Some video drivers (like "dummy") don't have cursors
+            pass
+        self.current = cursor
+
+
 class Tk(Frame):
-    def __init__(self, fps=50):
+    def __init__(self, fps=50, backend:str="surface"):
         self.mode = 0
         self._overrideredirect = False
         self._fullscreen = False
         self.event_queue = []
+        self._startup_times = {"import": _import_time}
+        start = perf_counter()
 
-        numpass, numfail = pygame.init()
-        if numfail != 0:
-            stderr.write("Warning `pygame.init()` returned errors but we are " \
-                         "ignoring them.\n")
+        # Only start the subsystems that we need. Fonts are started by
+        # `constants.parse_font` the first time that a font is needed.
+        pygame.display.init()
+        self._startup_times["init"] = perf_counter() - start
 
         self.clock = pygame.time.Clock()
-        super().__init__(root=self, dictate_own_size=False)
+        # Widgets draw through this. Look at `backend.SurfaceBackend`
+        self._backend = create_backend(backend)
+        self._cursor_handler = CursorHandler(self)
+        # Created the first time that they are needed (by `animate` and
+        # `variables.Variable._add_widget`)
+        self._animation_handler = None
+        self._variable_handler = None
+        self._live_widgets = WeakSet()
+        # Only used while `Frame.grid_many` runs: {(text, font, fg): Surface}
+        self._text_surface_cache = None
+        # For `bind_class`/`bind_all`. Look at `BaseWidget._get_dispatch_plan`
+        self._tag_bindings = {} # {tag: {sequence: [function, ...]}}
+        self._dispatch_plans = {}
         self._mouse_over_widget = []
+        self._layout_frozen = 0 # Look at `grid.LayoutFreeze`
+        super().__init__(root=self, dictate_own_size=False)
         self._widget_sent_pressed = None
         self._focused_widget = None
         self._running = True
+        # The latest target from `geometry`. Look at `_apply_geometry`
+        self._pending_size = None
+        self._pending_position = None
+        self._pending_geometry_events = False
+        self._defer_geometry = False
         self.fps = fps
         super()._bind("<WM_DELETE_WINDOW>", lambda event: self.destroy())
         self._width = 400
         self._height = 400
+        display_start = perf_counter()
         self._create_new_display()
-        self._screen_size = pygame_winapi.get_screen_size()
+        self._startup_times["display"] = perf_counter() - display_start
+        self._screen_size_cache = None
 
         self._after_handler = AfterHandler(self)
+        self._recorder = None
+        self._replayer = None
+        self._tracer = None
+        self._startup_times["tk"] = perf_counter() - start
+
+    def memory_report(self, collect:bool=True) -> dict:
+        """
+        Returns the number of live/destroyed widgets, their bindings and the
+        bytes used by their surfaces grouped by widget type. Look at
+        `memory.memory_report`. If `collect`, the garbage collector runs
+        first so only real leaks show up as "destroyed".
+        """
+        from memory import memory_report # Imports `tracemalloc`
+        if collect:
+            gc.collect()
+        return memory_report(tuple(self._live_widgets))
+
+    def layout_snapshot(self, filename:str) -> LayoutSnapshot:
+        """
+        Use like this:
+            with root.layout_snapshot("panel.layout"):
+                # Create and grid the widgets
+        The layout is computed once at the end of the `with` block (or
+        loaded from `filename` if the structure and window size are the
+        same as last time). Look at `layout.LayoutSnapshot`.
+        """
+        from layout import LayoutSnapshot
+        return LayoutSnapshot(self, filename)
+
+    def animate(self, widget:BaseWidget, option:str, to, duration:int=300,
+                easing="linear", callback=None) -> int:
+        """
+        Changes `option` (for example "width", "bg" or "padx") of `widget`
+        to `to` over `duration` milliseconds. `widget.config` has to take
+        `option` (`Label`s don't take "width") or `ValueError` is raised.
+        `easing` is one of "linear", "ease_in", "ease_out", "ease_in_out" or
+        a function that takes and returns a float from 0 to 1. `callback` is
+        called at the end. All animations are updated together once per
+        frame. Returns an id for `animate_cancel`. Look at
+        `animation.AnimationHandler`.
+        """
+        if self._animation_handler is None:
+            from animation import AnimationHandler
+            self._animation_handler = AnimationHandler(self)
+        return self._animation_handler.animate(widget, option, to, duration,
+                                               easing, callback)
+
+    def animate_cancel(self, id:int) -> None:
+        # The option keeps the value that it has now
+        if self._animation_handler is not None:
+            self._animation_handler.cancel(id)
+
+    def _forget_widget(self, widget:BaseWidget) -> None:
+        # Called when `widget` is destroyed so we don't keep it alive
+        if self._animation_handler is not None:
+            self._animation_handler.forget(widget)
+        if widget in self._mouse_over_widget:
+            self._mouse_over_widget = [other for other in
+                                       self._mouse_over_widget
+                                       if other is not widget]
+        if self._focused_widget is widget:
+            self._focused_widget = None
+        if self._widget_sent_pressed is widget:
+            self._widget_sent_pressed = None
+        self.event_queue[:] = [event for event in self.event_queue
+                               if event.widget is not widget]
+
+    def startup_times(self) -> dict:
+        """
+        Returns how long (in seconds) each part of the start-up took:
+            "import":   importing this module
+            "init":     starting the pygame subsystems
+            "display":  creating the window
+            "tk":       all of `Tk.__init__` (includes "init" and "display")
+        """
+        return dict(self._startup_times)
+
+    @property
+    def _screen_size(self) -> (int, int):
+        if self._screen_size_cache is None:
+            self._screen_size_cache = _get_winapi().get_screen_size()
+        return self._screen_size_cache
 
     def overrideredirect(self, value:bool) -> None:
         if not value:
@@ -105,12 +299,19 @@ class Tk(Frame):
     def _get_window_position(self) -> (int, int):
         if self._overrideredirect:
             return self._root_x, self._root_y
-        return pygame_winapi.get_window_position(self._hwnd)
+        return self._backend.get_position()
 
     def _create_new_display(self) -> None:
-        self._display = pygame.display.set_mode((self._width, self._height),
-                                                self.mode)
-        self._hwnd = pygame.display.get_wm_info()["window"]
+        self._backend.create((self._width, self._height), self.mode)
+        # Cached because every widget needs it when drawing
+        self._display_size = self._backend.get_size()
+        self._hwnd = self._backend.get_window_handle()
+        self._update()
+
+    def _resize_display(self) -> None:
+        # Same as `_create_new_display` but reuses the window
+        self._backend.resize((self._width, self._height))
+        self._display_size = self._backend.get_size()
         self._update()
 
     def fullscreen_toggle(self) -> None:
@@ -130,7 +331,7 @@ class Tk(Frame):
         self._height_fullscreen_backup = self._height
 
         width, height = self._screen_size
-        self.geometry(f"{width}x{height}+0+0")
+        self.geometry(width=width, height=height, x=0, y=0)
 
     def not_fullscreen(self) -> None:
         if not self._fullscreen:
@@ -142,7 +343,7 @@ class Tk(Frame):
         width = self._width_fullscreen_backup
         height = self._height_fullscreen_backup
 
-        self.geometry(f"{width}x{height}+{x}+{y}")
+        self.geometry(width=width, height=height, x=x, y=y)
 
     def winfo_rootx(self) -> int:
         return self._get_window_position()[0]
@@ -152,47 +353,160 @@ class Tk(Frame):
 
     def destroy(self) -> None:
         super().destroy()
+        self.stop_recording()
+        if self._replayer is not None:
+            self._replayer.finish()
         pygame.display.quit()
         self._running = False
 
-    def geometry(self, geometry:str="", send_events:bool=True) -> None:
-        if geometry == "":
-            w, h = self._width, self._height
-            x, y = self._get_window_position()
+    def geometry(self, geometry:str="", send_events:bool=True,
+                 width:int=None, height:int=None, x:int=None,
+                 y:int=None) -> str:
+        """
+        Use either a string ("WxH+X+Y", "WxH" or "+X+Y") or the `width`,
+        `height`, `x` and `y` arguments (no parsing needed). Without any
+        arguments, it returns the geometry as a string.
+
+        Inside of `mainloop` the changes are only applied once per frame
+        (with the latest values). Look at `_apply_geometry`.
+        """
+        if geometry != "":
+            if "+" in geometry:
+                geometry, x, y = geometry.split("+")
+                x, y = int(x), int(y)
+            if "x" in geometry:
+                width, height = geometry.split("x")
+                width, height = int(width), int(height)
+        elif (width is None) and (height is None) and (x is None) and \
+             (y is None):
+            w, h = self._get_target_size()
+            if self._pending_position is None:
+                x, y = self._get_window_position()
+            else:
+                x, y = self._pending_position
             return f"{w}x{h}+{x}+{y}"
 
-        x = y = None
-        width = height = None
-        if "+" in geometry:
-            geometry, x, y = geometry.split("+")
-            x, y = int(x), int(y)
-        if "x" in geometry:
-            width, height = geometry.split("x")
-            width, height = int(width), int(height)
-
-        if width is not None:
-            self._width = width
-            self._height = height
-            self._create_new_display()
-            self._update()
-            if self._overrideredirect and send_events:
-                super().event_generate("<GeometryResize>", width=width,
-                                       height=height)
-        if x is not None:
-            pygame_winapi.set_window_position(self._hwnd, x, y)
+        if (width is not None) or (height is not None):
+            old_width, old_height = self._get_target_size()
+            self._pending_size = (old_width if width is None else width,
+                                  old_height if height is None else height)
+        if (x is not None) or (y is not None):
+            if self._pending_position is None:
+                old_x, old_y = self._get_window_position()
+            else:
+                old_x, old_y = self._pending_position
+            self._pending_position = (old_x if x is None else x,
+                                      old_y if y is None else y)
+        self._pending_geometry_events |= send_events
+        if not self._defer_geometry:
+            self._apply_geometry()
+
+    def _get_target_size(self) -> (int, int):
+        # The size of the window after `_apply_geometry`
+        if self._pending_size is None:
+            return self._width, self._height
+        return self._pending_size
+
+    def _apply_geometry(self) -> None:
+        """
+        Applies the latest target from `geometry`. Called once per frame so
+        many calls to `geometry` (when scrolling/dragging fast) only resize
+        and relayout once.
+        """
+        size, position = self._pending_size, self._pending_position
+        send_events = self._pending_geometry_events and self._overrideredirect
+        self._pending_size = self._pending_position = None
+        self._pending_geometry_events = False
+
+        if (size is not None) and (size != (self._width, self._height)):
+            self._width, self._height = size
+            self._resize_display()
+            if send_events:
+                super().event_generate("<GeometryResize>", width=size[0],
+                                       height=size[1])
+        if position is not None:
+            x, y = position
+            self._backend.set_position(x, y)
             self._root_x, self._root_y = x, y
-            if self._overrideredirect and send_events:
+            if send_events:
                 super().event_generate("<GeometryMove>", new_x=x, new_y=y)
 
+    def record_input(self, filename:str) -> None:
+        """
+        Saves all of the input (and synthetic events) to `filename` until
+        `stop_recording` is called or the window is closed. Use
+        `replay_input` to play it back.
+        """
+        from recording import InputRecorder
+        self.stop_recording()
+        self._recorder = InputRecorder(self, filename)
+
+    def stop_recording(self) -> None:
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+
+    def replay_input(self, filename:str, realtime:bool=True,
+                     synthetic:bool=False,
+                     quit_at_end:bool=False) -> InputReplayer:
+        """
+        Uses the events saved by `record_input` instead of the real input.
+        With `realtime=False` the frames are replayed as fast as possible
+        (useful with the dummy video driver). Look at `InputReplayer`.
+        """
+        from recording import InputReplayer
+        self._replayer = InputReplayer(self, filename, realtime=realtime,
+                                       synthetic=synthetic,
+                                       quit_at_end=quit_at_end)
+        return self._replayer
+
+    def start_tracing(self, size:int=4096) -> EventTracer:
+        """
+        Saves when each of the last `size` events was received, translated,
+        dispatched, handled and presented until `stop_tracing` is called.
+        Look at `latency_summary` and `tracing.EventTracer`.
+        """
+        from tracing import EventTracer
+        self._tracer = EventTracer(size)
+        return self._tracer
+
+    def stop_tracing(self) -> None:
+        self._tracer = None
+
+    def latency_summary(self, name:str=None) -> dict:
+        """
+        Returns the p50/p90/p99/max time (in milliseconds) of each stage of
+        the traced events (only the ones called `name` if it isn't `None`).
+        For example, the p99 click-to-present latency is:
+            root.latency_summary("<Button-1>")["total"]["p99"]
+        """
+        if self._tracer is None:
+            raise RuntimeError("Call `start_tracing` first.")
+        return self._tracer.summary(name)
+
+    def _get_events(self) -> tuple:
+        # Returns this frame's events (after recording/replaying them)
+        other_events = tuple(self.event_queue)
+        self.event_queue.clear()
+        events = tuple(pygame.event.get())
+        if self._replayer is not None:
+            events, other_events = self._replayer.next_frame(events,
+                                                             other_events)
+        if self._recorder is not None:
+            self._recorder.write_frame(events, other_events)
+        return events + other_events
+
     def mainloop(self) -> None:
         if not self._running:
             raise RuntimeError("Window already closed.")
+        self._defer_geometry = True
         while self._running:
-            if self.fps != 0:
+            if (self.fps != 0) and ((self._replayer is None) or
+                                    self._replayer.realtime):
                 self.clock.tick(self.fps)
-            other_events = tuple(self.event_queue)
-            self.event_queue.clear()
-            for event in tuple(pygame.event.get()) + other_events:
+            if self._tracer is not None:
+                self._tracer.events_received()
+            for event in self._get_events():
                 if not self._running:
                     break
                 if isinstance(event, Event):
@@ -202,15 +516,28 @@ class Tk(Frame):
                     super().event_generate("<WM_DELETE_WINDOW>")
                 else:
                     tk_event = Event(event, widget=self._focused_widget)
+                    if self._tracer is not None:
+                        self._tracer.start(tk_event.names[0])
                     try:
                         self._master_event_handler(tk_event)
                     except Exception as error:
                         pygame.quit()
                         raise error
+                    if self._tracer is not None:
+                        self._tracer.end()
             if not self._running:
                 break
+            self._apply_geometry()
+            if self._animation_handler is not None:
+                self._animation_handler.update()
+            if self._variable_handler is not None:
+                self._variable_handler.update()
             super().update()
-            pygame.display.update()
+            self._cursor_handler.update()
+            self._backend.present()
+            if self._tracer is not None:
+                self._tracer.presented()
+        self._defer_geometry = False
         if not self._destroyed:
             self.destroy()
         pygame.quit()
@@ -235,6 +562,8 @@ class Tk(Frame):
                 event.widget = self
             else:
                 event.widget = self._focused_widget
+        if self._tracer is not None:
+            self._tracer.dispatched()
         event.widget._handle_event(event)
 
     def _handle_mouse_enter_leave_widget(self, event:Event) -> None:
@@ -263,8 +592,8 @@ class Tk(Frame):
 
 
 class MovableTk(Tk):
-    def __init__(self, fps=50):
-        super().__init__(fps)
+    def __init__(self, fps=50, backend:str="surface"):
+        super().__init__(fps, backend=backend)
         super().overrideredirect(True)
 
         # Moving the window
@@ -299,25 +628,27 @@ class MovableTk(Tk):
     def resize_plus(self, event:Event) -> str:
         if self._fullscreen:
             return None
-        width, height = super().winfo_width(), super().winfo_height()
+        width, height = self._get_target_size()
         new_width = width + 10
         if new_width >= super().winfo_screen_width():
             new_width = super().winfo_screen_width()
             new_height = super().winfo_screen_height()
         else:
             new_height = int(height/width*new_width + 0.5)
-        super().geometry(f"{new_width}x{new_height}")
-        super().event_generate("<Configure>")
+        super().geometry(width=new_width, height=new_height)
 
     def resize_minus(self, event:Event) -> str:
         if self._fullscreen:
             return None
-        width, height = super().winfo_width(), super().winfo_height()
+        width, height = self._get_target_size()
         new_width = width - 10
         if new_width < 300:
             new_width = 300
         new_height = int(height/width*new_width + 0.5)
-        super().geometry(f"{new_width}x{new_height}")
+        super().geometry(width=new_width, height=new_height)
+
+    def _resize_display(self) -> None:
+        super()._resize_display()
         super().event_generate("<Configure>")
 
     def start_move(self, event:Event) -> str:
@@ -338,7 +669,7 @@ class MovableTk(Tk):
             self.moved = True
             x = super().winfo_rootx() + event.x - self.last_x
             y = super().winfo_rooty() + event.y - self.last_y
-            super().geometry(f"+{x}+{y}")
+            super().geometry(x=x, y=y)
             return "break"
 
 
@@ -384,8 +715,571 @@ def test_creating_widget_events() -> None:
     root.event_generate("<WM_DELETE_WINDOW>")
     # root.mainloop()
 
+def test_headless_mainloop() -> None:
+    # Works with the "dummy" video driver (no cursors)
+    root = Tk(fps=100)
+    frame = Frame(root, bg="red", cursor="hand")
+    frame.grid_propagate(False)
+    frame.config(width=100, height=100)
+    frame.grid(row=0, column=0)
+    events = []
+    frame.bind("<Enter>", lambda event: events.append("enter"))
+    pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(50, 50),
+                                         rel=(0, 0), buttons=(0, 0, 0)))
+    root.after(50, root.destroy)
+    root.mainloop()
+    msg = "Failed! <Tk.mainloop> didn't handle the events."
+    assert events == ["enter"], msg
+
+def test_record_replay() -> None:
+    from tempfile import TemporaryDirectory
+    from os import path
+
+    def create_window() -> (Tk, list):
+        root = Tk(fps=100)
+        clicks = []
+        button = Button(root, text="x", fg="white", bg="black",
+                        command=lambda: clicks.append("button"))
+        button.grid(row=0, column=0)
+        root.bind("<KeyPress>", lambda event: clicks.append(event.char))
+        return root, clicks
+
+    with TemporaryDirectory() as directory:
+        filename = path.join(directory, "input.rec")
+        root, recorded_clicks = create_window()
+        root.record_input(filename)
+        for button_event in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            pygame.event.post(pygame.event.Event(button_event, button=1,
+                                                 pos=(5, 5)))
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a,
+                                             unicode="a", mod=0, scancode=0))
+        root.after(50, pygame.event.post, pygame.event.Event(pygame.QUIT))
+        root.mainloop()
+
+        root, replayed_clicks = create_window()
+        replayer = root.replay_input(filename, realtime=False,
+                                     quit_at_end=True)
+        root.mainloop()
+
+    msg = "Failed! The input wasn't recorded."
+    assert recorded_clicks == ["button", "a"], msg
+    msg = "Failed! The replay didn't do the same as the recording."
+    assert replayed_clicks == recorded_clicks, msg
+    assert replayer.stats()["frames"] > 1, msg
+
+def test_destroy_frees_widgets() -> None:
+    # Tests if destroyed widgets aren't kept alive by the root/grid
+    root = Tk()
+    frame = Frame(root)
+    frame.grid(row=3, column=3)
+    button = Button(frame, text="Close", fg="white", command=frame.destroy)
+    button.grid(row=0, column=0)
+    button.focus()
+    root._mouse_over_widget = [button, frame, root]
+    frame.destroy()
+    del frame, button
+
+    msg = "Failed! Destroying a widget doesn't compact the grid."
+    assert root._widgets == [[]], msg
+    msg = "Failed! The root still points to destroyed widgets."
+    assert root._focused_widget is None, msg
+    assert root._mouse_over_widget == [root], msg
+    msg = "Failed! Destroyed widgets are still alive."
+    assert tuple(root.memory_report().keys()) == ("Tk", ), msg
+    root.destroy()
+
+def test_bind_class() -> None:
+    # Tests the order of the bindtags: widget, class, masters and "all"
+    root = Tk()
+    frame = Frame(root)
+    frame.grid(row=0, column=0)
+    label = Label(frame, text="a", fg="white")
+    label.grid(row=0, column=0)
+    calls = []
+    label.bind("<Configure>", lambda event: calls.append("widget"))
+    root.bind_class("Label", "<Configure>", lambda event: calls.append("class"))
+    frame.bind("<Configure>", lambda event: calls.append("frame"))
+    root.bind("<Configure>", lambda event: calls.append("root"))
+    root.bind_all("<Configure>", lambda event: calls.append("all"))
+    label.event_generate("<Configure>", when="now")
+
+    msg = "Failed! The bindtags aren't handled in the correct order."
+    assert calls == ["widget", "class", "frame", "root", "all"], msg
+    calls.clear()
+    label.bindtags(("all", label))
+    label.event_generate("<Configure>", when="now")
+    assert calls == ["all", "widget"], msg
+
+    # Earlier tags go first even for different names of the same event
+    calls.clear()
+    label.bindtags(("Label", "all"))
+    root.bind_all("<Button-1>", lambda event: calls.append("all"))
+    root.bind_class("Label", "<ButtonPress-1>",
+                    lambda event: calls.append("class") or "break")
+    label.event_generate(("<Button-1>", "<ButtonPress-1>"), when="now")
+    msg = "Failed! A tag's \"break\" didn't stop the later tags."
+    assert calls == ["class"], msg
+    root.destroy()
+
+def test_button_clip() -> None:
+    # Tests if a button's border stays inside of its master
+    root = Tk()
+    root.config(bg="black")
+    frame = Frame(root, bg="black")
+    frame.grid_propagate(False)
+    frame.config(width=20, height=20)
+    frame.grid(row=0, column=0)
+    button = Button(frame, text="a long text", fg="black", bg="black",
+                    bd=4, bdcolour="red")
+    button.grid(row=0, column=0)
+    backend = root._backend
+    fills = []
+    fill_rect = backend.fill_rect
+    backend.fill_rect = lambda *args: fills.append(args) or fill_rect(*args)
+    root.redraw()
+    del backend.fill_rect
+
+    msg = "Failed! <Button> drew outside of its master."
+    assert button._req_width > 30, msg
+    assert backend.surface.get_at((10, 1))[:3] == (255, 0, 0), msg
+    for x in range(20, 40):
+        assert backend.surface.get_at((x, 1))[:3] == (0, 0, 0), msg
+    msg = "Failed! <Button> was drawn more than once."
+    assert sum(colour == (0, 0, 0) for colour, rect in fills) == 3, msg
+
+    backend.surface.fill((0, 0, 0))
+    backend.set_clip((100, 100, 10, 10))
+    button.redraw()
+    backend.set_clip(None)
+    msg = "Failed! <Button> drew its border while it was clipped away."
+    assert backend.surface.get_at((10, 1))[:3] == (0, 0, 0), msg
+    root.destroy()
+
+def test_widget_slots() -> None:
+    # Tests if none of the widgets have a `__dict__` (look at `__slots__`)
+    from listview import ListView
+    from table import Table
+    from textview import TextView
+    from text import Text, Entry
+    root = Tk()
+    frame = Frame(root)
+    frame.grid(row=0, column=0)
+    widgets = [frame, Label(frame, text="a", fg="white"),
+               Button(frame, text="b", fg="white", bg="black"),
+               Canvas(frame, width=50, height=50),
+               ListView(frame, data=range(100), height=60),
+               Table(frame, columns=("a", "b"), data=[(1, 2), (3, 4)]),
+               TextView(frame, text="a\nb"), Text(frame, text="a"),
+               Entry(frame, text="b")]
+    for row, widget in enumerate(widgets[1:]):
+        widget.grid(row=row, column=0)
+    # Use them a bit so the attributes that are set later are set too
+    widgets[3].create_rectangle(0, 0, 10, 10, fill="red")
+    widgets[4].yview_scroll(3)
+    widgets[5].sort(0, reverse=True)
+    widgets[6].append("c")
+    widgets[7].insert("end", "bc")
+    widgets[8].insert(0, "a")
+    root.update()
+
+    msg = "Failed! {} has a `__dict__`."
+    for widget in widgets:
+        name = widget.__class__.__name__
+        assert not hasattr(widget, "__dict__"), msg.format(name)
+    root.destroy()
+
+def test_listview() -> None:
+    from listview import ListView
+    root = Tk()
+    root.config(bg="black")
+    frame = Frame(root, bg="black")
+    frame.grid_propagate(False)
+    frame.config(width=100, height=50)
+    frame.grid(row=0, column=0)
+    sibling = Frame(root, bg="red")
+    sibling.grid_propagate(False)
+    sibling.config(width=100, height=200)
+    sibling.grid(row=1, column=0)
+    listview = ListView(frame, data=range(1000), row_height=10, height=200)
+    listview.grid(row=0, column=0)
+    # Half of it is outside of `frame` (like the rows of a scrolled list)
+    listview._update_y(30)
+    root.redraw()
+
+    listview.yview_scroll(2)
+    surface = root._backend.surface
+    msg = "Failed! <ListView> scrolled the pixels of other widgets."
+    assert all(surface.get_at((50, y))[:3] == (255, 0, 0)
+               for y in range(50, 100)), msg
+
+    msg = "Failed! <ListView> kept too many spare rows."
+    listview._update_height(200)
+    listview.yview_scroll(5)
+    rows = [*listview._rows.values(), *listview._spare_rows]
+    listview._update_height(20)
+    assert len(listview._spare_rows) <= listview._get_max_rows(), msg
+    kept = [*listview._rows.values(), *listview._spare_rows]
+    destroyed = [row for row in rows if row not in kept]
+    assert (len(destroyed) != 0) and all(row._destroyed
+                                         for row in destroyed), msg
+    root.destroy()
+
+def test_grid_many() -> None:
+    # Tests if `grid_many` gives the same layout as calling `grid` each time
+    root = Tk()
+    frames = (Frame(root), Frame(root))
+    frames[0].grid(row=0, column=0)
+    frames[1].grid(row=0, column=1)
+    cells = [[(Label, {"text": "a", "fg": "white"}, "news"), None],
+             [(Button, {"text": "bb", "fg": "white", "bg": ""}),
+              (Label, {"text": "a", "fg": "white", "padx": 1})]]
+    for row, row_of_cells in enumerate(cells):
+        for column, cell in enumerate(row_of_cells):
+            if cell is not None:
+                widget_class, kwargs, sticky = (*cell, "")[:3]
+                widget_class(frames[0], **kwargs).grid(row=row, column=column,
+                                                      sticky=sticky)
+    widgets = frames[1].grid_many(cells)
+
+    msg = "Failed! <Frame>.grid_many doesn't give the same layout."
+    assert widgets[0][1] is None, msg
+    geometries = [[(widget._x, widget._y, widget._width, widget._height)
+                   for widget in frame._children] for frame in frames]
+    assert geometries[0] == geometries[1], msg
+    msg = "Failed! <Frame>.grid_many doesn't share the rendered text."
+    assert widgets[0][0]._surface is widgets[1][1]._surface, msg
+    root.destroy()
+
+def test_layout_snapshot() -> None:
+    # Tests if the saved layout is the same as computing it
+    from tempfile import TemporaryDirectory
+    from os import path
+    geometries = []
+    with TemporaryDirectory() as directory:
+        filename = path.join(directory, "test.layout")
+        for i in range(2):
+            root = Tk()
+            root.geometry("300x200")
+            with root.layout_snapshot(filename) as snapshot:
+                frame = Frame(root)
+                frame.grid(row=0, column=1, sticky="news")
+                frame.columnconfigure(0, weight=1)
+                for row in range(3):
+                    label = Label(frame, text=str(row), fg="white")
+                    label.grid(row=row, column=row, sticky="ew")
+            geometries.append([(widget._get_abs_position(), widget._width,
+                                widget._height) for widget in
+                               (frame, *frame._children)])
+
+            msg = "Failed! <LayoutSnapshot> didn't use the saved layout."
+            assert snapshot.hit == (i == 1), msg
+            # The layout should still work after the snapshot
+            Label(frame, text="new", fg="white").grid(row=3, column=0)
+            msg = "Failed! The layout doesn't run after the snapshot."
+            assert frame._children[-1]._get_abs_position()[1] > 0, msg
+            root.destroy()
+
+    msg = "Failed! <LayoutSnapshot> saved the wrong layout."
+    assert geometries[0] == geometries[1], msg
+
+def test_layout_freeze() -> None:
+    # A snapshot only freezes its own root and only inside of the `with`
+    from tempfile import TemporaryDirectory
+    from os import path
+    root, other = Tk(), Tk()
+    with TemporaryDirectory() as directory:
+        filename = path.join(directory, "test.layout")
+        with root.layout_snapshot(filename):
+            label = Label(other, text="other", fg="white")
+            label.grid(row=0, column=0)
+            msg = "Failed! <LayoutSnapshot> froze the layout of another root."
+            assert label._width == label._req_width != 0, msg
+
+        try:
+            with root.layout_snapshot(filename):
+                raise KeyError("test")
+        except KeyError:
+            pass
+    msg = "Failed! An exception left the layout frozen."
+    assert root._layout_frozen == 0, msg
+    label = Label(root, text="root", fg="white")
+    label.grid(row=0, column=0)
+    assert label._width == label._req_width != 0, msg
+    root.destroy()
+    other.destroy()
+
+def test_geometry_coalescing() -> None:
+    class CountingTk(Tk):
+        def _resize_display(self) -> None:
+            self.resizes += 1
+            super()._resize_display()
+
+    root = CountingTk()
+    root.resizes = 0
+    # Same as inside of `mainloop`
+    root._defer_geometry = True
+    for i in range(20):
+        root.geometry(width=300 + i*10, height=200)
+    root.geometry("500x250")
+    msg = "Failed! <Tk.geometry> resized before the end of the frame."
+    assert (root.resizes == 0) and (root.winfo_width() == 400), msg
+    msg = "Failed! <Tk.geometry> doesn't return the latest target."
+    assert root.geometry().startswith("500x250+"), msg
+    root._apply_geometry()
+    msg = "Failed! <Tk.geometry> didn't resize exactly once."
+    assert root.resizes == 1, msg
+    msg = "Failed! <Tk.geometry> didn't resize the window."
+    assert root._display_size == (root.winfo_width(),
+                                  root.winfo_height()) == (500, 250), msg
+    root.destroy()
+
+def test_style() -> None:
+    class CountingFrame(Frame):
+        updates = 0
+
+        def _update(self, height:bool=True, width:bool=True) -> None:
+            self.updates += 1
+            super()._update(height=height, width=width)
+
+    root = Tk()
+    frame = CountingFrame(root)
+    frame.grid(row=0, column=0)
+    style = Style(fg="white", padx=2)
+    labels = [Label(frame, text=str(i), style=style) for i in range(10)]
+    for i, label in enumerate(labels):
+        label.grid(row=i, column=0)
+
+    frame.updates = 0
+    style.config(fg="red", padx=20)
+    msg = "Failed! <Style.config> didn't update every widget."
+    assert all((label._fg == (255, 0, 0)) and (label._padx == (20, 20))
+               for label in labels), msg
+    assert frame._req_width == labels[0]._req_width, msg
+    msg = "Failed! <Style.config> ran the layout more than once."
+    assert frame.updates == 1, msg
+
+    msg = "Failed! The style overrode an explicit option."
+    label = Label(frame, text="x", style=style, fg="white", padx=1)
+    assert (label._fg == (255, 255, 255)) and (label._padx == (1, 1)), msg
+    label.config(style=Style(fg="red", bg="blue"), fg="black")
+    assert (label._fg == (0, 0, 0)) and (label._bg == (0, 0, 255)), msg
+    root.destroy()
+
+def test_fonts_after_quit() -> None:
+    # `mainloop` calls `pygame.quit` at the end
+    root = Tk()
+    Label(root, text="first", fg="white").grid(row=0, column=0)
+    root.destroy()
+    pygame.quit()
+    root = Tk()
+    Label(root, text="second", fg="white").grid(row=0, column=0)
+    root.destroy()
+
+def test_animate() -> None:
+    root = Tk()
+    frame = Frame(root, bg="black")
+    frame.grid_propagate(False)
+    frame.config(width=100, height=50)
+    frame.grid(row=0, column=0)
+    label = Label(root, text="x", fg="black", bg="black")
+    label.grid(row=1, column=0)
+    done = []
+    root.animate(frame, "width", 200, duration=1000,
+                 callback=lambda: done.append(True))
+    root.animate(label, "fg", "white", duration=1000, easing="ease_in_out")
+
+    # Pretend that half of the time passed
+    handler = root._animation_handler
+    for tween in handler.tweens.values():
+        tween.start_time -= 500
+    handler.update()
+    msg = "Failed! <Tk.animate> didn't change the values half way."
+    assert (100 < frame._width < 200) and (0 < label._fg[0] < 255), msg
+    assert len(done) == 0, msg
+
+    for tween in handler.tweens.values():
+        tween.start_time -= 1000
+    handler.update()
+    msg = "Failed! <Tk.animate> didn't end with the right values."
+    assert (frame._width == 200) and (label._fg == (255, 255, 255)), msg
+    msg = "Failed! <Tk.animate> didn't call the callback."
+    assert (done == [True]) and (len(handler.tweens) == 0), msg
+    msg = "Failed! <Tk.animate> didn't move the other widgets."
+    assert label._get_abs_position()[1] == 50, msg
+
+    msg = "Failed! <Tk.animate> accepted an option that `config` doesn't take."
+    try:
+        root.animate(label, "width", 300)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(msg)
+    for option, value in (("padx", 20), ("bg", "red"), ("fg", "blue")):
+        root.animate(label, option, value, duration=100)
+    for tween in handler.tweens.values():
+        tween.start_time -= 100
+    handler.update()
+    msg = "Failed! <Tk.animate> didn't change all of the label's options."
+    assert (label._padx == (20, 20)) and (label._bg == (255, 0, 0)) and \
+           (label._fg == (0, 0, 255)), msg
+    root.destroy()
+
+def test_textvariable() -> None:
+    from variables import IntVar
+    root = Tk()
+    variable = IntVar(root, value=5)
+    label = Label(root, textvariable=variable, fg="white")
+    label.grid(row=0, column=0)
+    button = Button(root, textvariable=variable, fg="white")
+    button.grid(row=1, column=0)
+    msg = "Failed! `textvariable` didn't set the text."
+    assert label._text == button._text == "5", msg
+
+    writes = []
+    variable.trace_add("write", lambda *args: writes.append(variable.get()))
+    for i in range(100):
+        variable.set(i)
+    msg = "Failed! <Variable.set> changed the text before the frame ended."
+    assert label._text == "5", msg
+    msg = "Failed! <Variable.trace_add> wasn't called for each write."
+    assert len(writes) == 100, msg
+    root._variable_handler.update()
+    msg = "Failed! <Variable> didn't update the widgets."
+    assert label._text == button._text == "99", msg
+    assert label._width >= label._req_width, msg
+
+    label.destroy()
+    msg = "Failed! <Variable> kept a destroyed widget."
+    assert variable._widgets == [button], msg
+    root.destroy()
+
+def test_event_tracing() -> None:
+    root = Tk()
+    clicks = []
+    button = Button(root, text="x", fg="white", bg="green",
+                    command=lambda: clicks.append(1))
+    button.grid(row=0, column=0)
+    tracer = root.start_tracing(size=4)
+    # Same as one frame of `mainloop` with a click
+    for i in range(6):
+        tracer.events_received()
+        for button_event in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            event = pygame.event.Event(button_event, button=1, pos=(5, 5))
+            tk_event = Event(event, widget=None)
+            tracer.start(tk_event.names[0])
+            root._master_event_handler(tk_event)
+            tracer.end()
+        root._backend.present()
+        tracer.presented()
+
+    msg = "Failed! Tracing changed how the events are handled."
+    assert len(clicks) == 6, msg
+    msg = "Failed! <EventTracer> didn't keep the last events."
+    assert len(tracer.records()) == 4, msg
+    summary = root.latency_summary("<Button-1>")
+    assert summary["count"] == 2, msg
+    msg = "Failed! <EventTracer> has the wrong percentiles."
+    total = summary["total"]
+    assert 0 < total["p50"] <= total["p99"] <= total["max"], msg
+    stages = sum(summary[stage]["max"] for stage in ("translated",
+                 "dispatched", "handled", "presented"))
+    assert total["max"] <= stages + 1e-6, msg
+    root.destroy()
+
+def test_renderer_backend() -> None:
+    # Works with SDL's software renderer (the "dummy" video driver)
+    root = Tk(backend="renderer")
+    backend = root._backend
+    if backend.name != "renderer":
+        # Old pygame without `pygame._sdl2`
+        root.destroy()
+        return None
+    frame = Frame(root, bg="red")
+    frame.grid_propagate(False)
+    frame.config(width=50, height=40)
+    frame.grid(row=0, column=0)
+    label = Label(root, text="x", fg="white", bg="blue")
+    label.grid(row=1, column=0)
+    canvas = Canvas(root, bg="green", width=60, height=60)
+    canvas.grid(row=0, column=1)
+    canvas.create_rectangle(5, 5, 20, 20, fill="black")
+    root.update()
+
+    def get_pixel(x:int, y:int) -> (int, int, int):
+        return tuple(backend.renderer.to_surface().get_at((x, y)))[:3]
+
+    msg = "Failed! <RendererBackend> didn't draw the widgets."
+    x, y = canvas.winfo_x(), canvas.winfo_y()
+    assert get_pixel(10, 10) == (255, 0, 0), msg
+    assert get_pixel(label.winfo_x()+1, label.winfo_y()+1) == (0, 0, 255), msg
+    assert get_pixel(x+40, y+40) == (0, 128, 0), msg
+    assert get_pixel(x+10, y+10) == (0, 0, 0), msg
+
+    msg = "Failed! <RendererBackend> has the wrong clip offsets."
+    backend.set_clip((100, 100, 50, 50))
+    assert backend.get_clip() == pygame.Rect(100, 100, 50, 50), msg
+    backend.fill_rect((255, 255, 0), (110, 120, 5, 5))
+    backend.set_clip((390, 390, 50, 50))
+    assert backend.get_clip() == pygame.Rect(390, 390, 10, 10), msg
+    backend.set_clip(None)
+    assert backend.get_clip() == pygame.Rect(0, 0, 400, 400), msg
+    assert get_pixel(112, 122) == (255, 255, 0), msg
+    assert get_pixel(108, 122) != (255, 255, 0), msg
+
+    msg = "Failed! <RendererBackend.invalidate> didn't update the texture."
+    surface = pygame.Surface((4, 4))
+    surface.fill((0, 0, 255))
+    backend.blit(surface, (200, 200))
+    surface.fill((255, 0, 255))
+    backend.invalidate(surface)
+    backend.blit(surface, (200, 200))
+    assert get_pixel(201, 201) == (255, 0, 255), msg
+    backend.present()
+
+    msg = "Failed! <RendererBackend> didn't move its own window."
+    root.geometry("+30+40")
+    assert backend.window.position == (30, 40), msg
+    assert (root.winfo_rootx(), root.winfo_rooty()) == (30, 40), msg
+    root.overrideredirect(True)
+    root.geometry(x=50, y=60)
+    assert root.geometry() == "400x400+50+60", msg
+    assert backend.get_position() == (50, 60), msg
+
+    # `layout.apply_changes` swaps this in while it runs
+    from backend import NullBackend
+    msg = "Failed! <NullBackend> doesn't forward to the real backend."
+    null = NullBackend(backend)
+    null.resize((300, 200))
+    null.set_position(10, 20)
+    null.present()
+    assert (null.get_size() == (300, 200)) and \
+           (backend.get_position() == (10, 20)), msg
+    root.destroy()
+
+def benchmark_widget_overhead(count:int=10000) -> None:
+    # Prints how much memory/time each type of widget needs
+    from memory import measure_widget_overhead
+    root = Tk()
+    frame = Frame(root)
+    factories = (("Label", lambda: Label(frame, text="x", fg="white")),
+                 ("Button", lambda: Button(frame, text="x", fg="white")),
+                 ("Frame", lambda: Frame(frame)))
+    for name, factory in factories:
+        size, time = measure_widget_overhead(factory, count)
+        stderr.write(f"[Benchmark]: {name}: {size:.0f} bytes and " \
+                     f"{time*1e6:.1f}us per widget\n")
+    root.destroy()
+
 def test() -> None:
-    tests = (test_creating_update_destroy, test_creating_widget_events)
+    tests = (test_creating_update_destroy, test_creating_widget_events,
+             test_headless_mainloop, test_record_replay,
+             test_destroy_frees_widgets, test_bind_class, test_button_clip,
+             test_widget_slots, test_listview, test_grid_many,
+             test_layout_snapshot, test_layout_freeze,
+             test_geometry_coalescing, test_style,
+             test_fonts_after_quit,
+             test_animate, test_textvariable, test_event_tracing,
+             test_renderer_backend)
     for _test in tests:
         _test()
 
@@ -0,0 +1,166 @@
+from __future__ import annotations
+from layout import apply_changes
+from sys import stderr
+import traceback
+import inspect
+import constants
+
+import pygame
+
+
+def ease_in_out(t:float) -> float:
+    if t < 0.5:
+        return 4*t*t*t
+    return 1 - (-2*t + 2)**3/2
+
+EASINGS = {"linear": lambda t: t,
+           "ease_in": lambda t: t*t,
+           "ease_out": lambda t: 1 - (1 - t)*(1 - t),
+           "ease_in_out": ease_in_out}
+
+# The attributes that hold the current values of the options
+ATTRIBUTES = {"width": "_req_width", "height": "_req_height"}
+COLOUR_OPTIONS = ("bg", "fg", "bdcolour")
+_accepted_options = {} # {(class, option): bool}
+
+
+def accepts_option(cls:type, option:str) -> bool:
+    """
+    Returns `True` if `cls.config` takes `option`. The `config`s that take
+    `**kwargs` pass them to the `config` of the next class in the MRO.
+    """
+    key = (cls, option)
+    if key not in _accepted_options:
+        output = False
+        for base in cls.__mro__:
+            if "config" not in base.__dict__:
+                continue
+            parameters = inspect.signature(base.__dict__["config"]).parameters
+            if option in parameters:
+                output = True
+                break
+            if not any(parameter.kind == parameter.VAR_KEYWORD
+                       for parameter in parameters.values()):
+                break
+        _accepted_options[key] = output
+    return _accepted_options[key]
+
+
+class Tween:
+    """
+    Moves one option of a widget from its current value to `end`. The
+    value only depends on the time so if a frame is late, the states in
+    between are skipped.
+    """
+    __slots__ = ("id", "widget", "option", "start", "end", "start_time",
+                 "duration", "easing", "callback", "last")
+
+    def __init__(self, id:int, widget, option:str, end, duration:int,
+                 easing, callback):
+        if not accepts_option(type(widget), option):
+            raise ValueError(f"{widget.__class__.__name__} doesn't have " \
+                             f"a \"{option}\" option")
+        self.id = id
+        self.widget = widget
+        self.option = option
+        self.start = getattr(widget, ATTRIBUTES.get(option, "_" + option),
+                             None)
+        if option in COLOUR_OPTIONS:
+            end = constants.parse_colour(end)
+        elif isinstance(self.start, tuple) and isinstance(end, int):
+            # For example `padx`
+            end = (end, )*len(self.start)
+        if (self.start is None) or (end is None):
+            raise ValueError(f"Can't animate \"{option}\" of {widget}")
+        self.end = end
+        self.start_time = pygame.time.get_ticks()
+        self.duration = max(1, duration)
+        if isinstance(easing, str):
+            if easing not in EASINGS:
+                raise ValueError(f"Unknown easing: \"{easing}\"")
+            easing = EASINGS[easing]
+        self.easing = easing
+        self.callback = callback
+        self.last = self.start
+
+    def get_value(self, now:int) -> (object, bool):
+        # Returns the value at `now` and if the tween is done
+        t = min(1, (now - self.start_time)/self.duration)
+        if t == 1:
+            return self.end, True
+        t = self.easing(t)
+        if isinstance(self.start, tuple):
+            return tuple(round(a + (b - a)*t)
+                         for a, b in zip(self.start, self.end)), False
+        return round(self.start + (self.end - self.start)*t), False
+
+
+class AnimationHandler:
+    """
+    Runs all of the tweens once per frame (from `Tk.mainloop`). All of the
+    new values are applied together by `layout.apply_changes` so the
+    layout runs at most once per frame.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.next_id = 0
+        self.tweens = {} # {(widget, option): Tween}
+
+    def animate(self, widget, option:str, to, duration:int, easing,
+                callback) -> int:
+        self.next_id += 1
+        # A new tween replaces the old one for the same option
+        self.tweens[(widget, option)] = Tween(self.next_id, widget, option,
+                                              to, duration, easing, callback)
+        return self.next_id
+
+    def cancel(self, id:int) -> None:
+        for key, tween in tuple(self.tweens.items()):
+            if tween.id == id:
+                del self.tweens[key]
+
+    def forget(self, widget) -> None:
+        # Called when `widget` is destroyed
+        for key in tuple(self.tweens.keys()):
+            if key[0] is widget:
+                del self.tweens[key]
+
+    def config(self, widget, options:dict) -> None:
+        # Used by `apply_changes`. If one option fails, only its tween is
+        # dropped and the other options are still changed
+        try:
+            return widget.config(**options)
+        except Exception as error:
+            if len(options) == 1:
+                stderr.write("An exception occured in an animation\n")
+                traceback.print_exc()
+                for option in options:
+                    self.tweens.pop((widget, option), None)
+                return None
+        for option, value in options.items():
+            self.config(widget, {option: value})
+
+    def update(self) -> None:
+        if len(self.tweens) == 0:
+            return None
+        now = pygame.time.get_ticks()
+        changes = {} # {widget: {option: value}}
+        finished = []
+        for key, tween in tuple(self.tweens.items()):
+            value, done = tween.get_value(now)
+            if value != tween.last:
+                tween.last = value
+                changes.setdefault(tween.widget, {})[tween.option] = value
+            if done:
+                del self.tweens[key]
+                finished.append(tween)
+        if len(changes) != 0:
+            apply_changes(self.root, changes, self.config)
+        for tween in finished:
+            if tween.callback is not None:
+                try:
+                    tween.callback()
+                except Exception as error:
+                    stderr.write("An exception occured in an animation's " \
+                                 "callback\n")
+                    traceback.print_exc()
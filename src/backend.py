@@ -0,0 +1,362 @@
+from __future__ import annotations
+from weakref import WeakKeyDictionary
+from sys import stderr
+
+import pygame
+
+
+class SurfaceBackend:
+    """
+    The interface that widgets draw through. This one draws straight onto
+    the window's surface with `pygame.draw` and `Surface.blit` (everything
+    happens on the CPU).
+
+    Functions defined:
+        create(size:(int, int), flags:int) -> None
+        resize(size:(int, int)) -> None
+        get_size() -> (int, int)
+        get_window_handle() -> int
+        get_position() -> (int, int)
+        set_position(x:int, y:int) -> None
+        get_clip() -> pygame.Rect
+        set_clip(rect:pygame.Rect) -> None
+        fill_rect(colour:tuple, rect:tuple) -> None
+        draw_rect(colour:tuple, rect:tuple, width:int) -> None
+        draw_line(colour:tuple, start:tuple, end:tuple, width:int) -> None
+        draw_lines(colour:tuple, points:list, width:int, antialias:bool)
+        blit(surface:pygame.Surface, position:tuple, area:tuple) -> None
+        convert(surface:pygame.Surface) -> pygame.Surface
+        invalidate(surface:pygame.Surface) -> None
+        scroll(rect:pygame.Rect, dy:int) -> bool
+        present() -> None
+    """
+    name = "surface"
+
+    def __init__(self, vsync:bool=True):
+        # `vsync` only matters for the `RendererBackend`
+        self.surface = None
+        self.window = None # Only made the first time that `resize` is called
+        self.flags = 0
+
+    def create(self, size:(int, int), flags:int) -> None:
+        self.surface = pygame.display.set_mode(size, flags)
+        self.flags = flags
+
+    def resize(self, size:(int, int)) -> None:
+        # Changes the size of the window that we already have (much faster
+        # than making a new one with `set_mode`)
+        if self.window is None:
+            try:
+                from pygame._sdl2 import video
+            except ImportError:
+                return self.create(size, self.flags)
+            # Must be kept alive while the window is open because SDL keeps
+            # a pointer to it (dropping it crashes the next window event)
+            self.window = video.Window.from_display_module()
+        self.window.size = size
+        self.surface = pygame.display.get_surface()
+        if self.surface.get_size() != tuple(size):
+            self.create(size, self.flags)
+
+    def get_size(self) -> (int, int):
+        return self.surface.get_size()
+
+    def get_window_handle(self) -> int:
+        return pygame.display.get_wm_info()["window"]
+
+    def get_position(self) -> (int, int):
+        # `pygame_winapi` loads `ctypes.windll` so only import it when needed
+        import pygame_winapi
+        return pygame_winapi.get_window_position(self.get_window_handle())
+
+    def set_position(self, x:int, y:int) -> None:
+        import pygame_winapi
+        pygame_winapi.set_window_position(self.get_window_handle(), x, y)
+
+    def get_clip(self) -> pygame.Rect:
+        return self.surface.get_clip()
+
+    def set_clip(self, rect:pygame.Rect) -> None:
+        self.surface.set_clip(rect)
+
+    def fill_rect(self, colour:tuple, rect:tuple) -> None:
+        # The 0 is the thickness
+        pygame.draw.rect(self.surface, colour, rect, 0)
+
+    def draw_rect(self, colour:tuple, rect:tuple, width:int) -> None:
+        pygame.draw.rect(self.surface, colour, rect, width)
+
+    def draw_line(self, colour:tuple, start:(int, int), end:(int, int),
+                  width:int=1) -> None:
+        pygame.draw.line(self.surface, colour, start, end, width)
+
+    def draw_lines(self, colour:tuple, points:[(int, int), ...],
+                   width:int=1, antialias:bool=False) -> None:
+        if antialias:
+            pygame.draw.aalines(self.surface, colour, False, points)
+        else:
+            pygame.draw.lines(self.surface, colour, False, points, width)
+
+    def blit(self, surface:pygame.Surface, position:(int, int),
+             area:tuple=None) -> None:
+        self.surface.blit(surface, position, area)
+
+    def convert(self, surface:pygame.Surface) -> pygame.Surface:
+        # Convert to the display's pixel format so blitting it is fast
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    def invalidate(self, surface:pygame.Surface) -> None:
+        # Call after changing the pixels of a surface that was drawn before
+        return None
+
+    def scroll(self, rect:pygame.Rect, dy:int) -> bool:
+        """
+        Moves the pixels inside of `rect` by `dy`. Returns `False` if the
+        backend can't do that (then the whole area has to be redrawn).
+        """
+        old_clip = self.surface.get_clip()
+        self.surface.set_clip(rect.clip(old_clip))
+        self.surface.scroll(0, dy)
+        self.surface.set_clip(old_clip)
+        return True
+
+    def present(self) -> None:
+        pygame.display.update()
+
+
+class RendererBackend:
+    """
+    Draws with an SDL2 `Renderer` (on the GPU if there is one). Surfaces
+    (text, images) are uploaded to a `Texture` the first time they are
+    drawn and the textures are reused until the surface is garbage
+    collected or `invalidate`d.
+
+    The widgets only redraw what changed so everything is drawn onto a
+    target texture that keeps its pixels. `present` copies it to the
+    window. Clipping uses the renderer's viewport so all coordinates have
+    to be moved by the viewport's position.
+
+    `draw_lines` ignores `antialias` and `scroll` isn't supported.
+    """
+    name = "renderer"
+
+    def __init__(self, vsync:bool=True):
+        from pygame._sdl2 import video, sdl2
+        self.video = video
+        self.sdl2 = sdl2
+        self.vsync = vsync
+        self.window = None
+        self.renderer = None
+        self.accelerated = False
+        self.textures = WeakKeyDictionary() # {pygame.Surface: Texture}
+        self.flags = 0
+
+    def create(self, size:(int, int), flags:int) -> None:
+        # SDL doesn't allow a renderer on the window made by `set_mode` so
+        # the window is made here. The events still go through `pygame.event`
+        if self.window is None:
+            self.window = self.video.Window(size=size,
+                                    resizable=bool(flags & pygame.RESIZABLE),
+                                    borderless=bool(flags & pygame.NOFRAME))
+            try:
+                self.renderer = self.video.Renderer(self.window, accelerated=1,
+                                                    vsync=self.vsync)
+                self.accelerated = True
+            except self.sdl2.error:
+                # No GPU so use SDL's software renderer
+                self.renderer = self.video.Renderer(self.window, accelerated=0)
+                self.accelerated = False
+        else:
+            self.window.size = size
+            self.window.resizable = bool(flags & pygame.RESIZABLE)
+            self.window.borderless = bool(flags & pygame.NOFRAME)
+        self.flags = flags
+        # The old textures can be reused but not the old target
+        self.target = self.video.Texture(self.renderer, size, target=True)
+        self.renderer.target = self.target
+        self.size = size
+        self.clip = pygame.Rect(0, 0, *size)
+
+    def resize(self, size:(int, int)) -> None:
+        # `create` already reuses the window
+        self.create(size, self.flags)
+
+    def get_size(self) -> (int, int):
+        return self.size
+
+    def get_window_handle(self) -> int:
+        # Only `pygame.display`'s window has a handle
+        return pygame.display.get_wm_info().get("window", None)
+
+    def get_position(self) -> (int, int):
+        # Our window isn't `pygame.display`'s so use SDL instead of the winapi
+        return tuple(self.window.position)
+
+    def set_position(self, x:int, y:int) -> None:
+        self.window.position = (x, y)
+
+    def get_clip(self) -> pygame.Rect:
+        return self.clip.copy()
+
+    def set_clip(self, rect:pygame.Rect) -> None:
+        if rect is None:
+            rect = (0, 0, *self.size)
+        self.clip = pygame.Rect(rect).clip((0, 0, *self.size))
+        self.renderer.set_viewport(self.clip)
+
+    def fill_rect(self, colour:tuple, rect:tuple) -> None:
+        self.renderer.draw_color = pygame.Color(colour)
+        self.renderer.fill_rect(pygame.Rect(rect).move(-self.clip.x,
+                                                       -self.clip.y))
+
+    def draw_rect(self, colour:tuple, rect:tuple, width:int) -> None:
+        if width <= 0:
+            return self.fill_rect(colour, rect)
+        x, y, w, h = rect
+        width = min(width, w, h)
+        # Same as `pygame.draw.rect`: the border is inside of `rect`
+        self.fill_rect(colour, (x, y, w, width))
+        self.fill_rect(colour, (x, y + h - width, w, width))
+        self.fill_rect(colour, (x, y, width, h))
+        self.fill_rect(colour, (x + w - width, y, width, h))
+
+    def draw_line(self, colour:tuple, start:(int, int), end:(int, int),
+                  width:int=1) -> None:
+        self.renderer.draw_color = pygame.Color(colour)
+        dx, dy = -self.clip.x, -self.clip.y
+        # Thick lines are drawn as many lines next to each other
+        horizontal = abs(end[0] - start[0]) >= abs(end[1] - start[1])
+        for i in range(-(width//2), width - width//2):
+            if horizontal:
+                self.renderer.draw_line((start[0]+dx, start[1]+dy+i),
+                                        (end[0]+dx, end[1]+dy+i))
+            else:
+                self.renderer.draw_line((start[0]+dx+i, start[1]+dy),
+                                        (end[0]+dx+i, end[1]+dy))
+
+    def draw_lines(self, colour:tuple, points:[(int, int), ...],
+                   width:int=1, antialias:bool=False) -> None:
+        for start, end in zip(points, points[1:]):
+            self.draw_line(colour, start, end, width)
+
+    def blit(self, surface:pygame.Surface, position:(int, int),
+             area:tuple=None) -> None:
+        texture = self.textures.get(surface, None)
+        if texture is None:
+            texture = self.video.Texture.from_surface(self.renderer, surface)
+            self.textures[surface] = texture
+        width, height = surface.get_size()
+        area = pygame.Rect(0, 0, width, height) if area is None else \
+               pygame.Rect(area).clip((0, 0, width, height))
+        if (area.width == 0) or (area.height == 0):
+            return None
+        x, y = position[0] - self.clip.x, position[1] - self.clip.y
+        texture.draw(srcrect=area, dstrect=(x, y, area.width, area.height))
+
+    def convert(self, surface:pygame.Surface) -> pygame.Surface:
+        # The texture is in the renderer's format anyway
+        return surface
+
+    def invalidate(self, surface:pygame.Surface) -> None:
+        texture = self.textures.get(surface, None)
+        if texture is not None:
+            texture.update(surface)
+
+    def scroll(self, rect:pygame.Rect, dy:int) -> bool:
+        return False
+
+    def present(self) -> None:
+        self.renderer.target = None
+        self.renderer.set_viewport(None)
+        self.target.draw()
+        self.renderer.present()
+        self.renderer.target = self.target
+        self.renderer.set_viewport(self.clip)
+
+
+class NullBackend:
+    """
+    Draws nothing. Used while many changes are applied together (look at
+    `animation.AnimationHandler`) so the widgets don't draw states that
+    are about to be redrawn anyway. The empty clip area means that most
+    widgets return before drawing anything.
+    """
+    name = "null"
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def create(self, size:(int, int), flags:int) -> None:
+        self.backend.create(size, flags)
+
+    def resize(self, size:(int, int)) -> None:
+        self.backend.resize(size)
+
+    def get_size(self) -> (int, int):
+        return self.backend.get_size()
+
+    def get_window_handle(self) -> int:
+        return self.backend.get_window_handle()
+
+    def get_position(self) -> (int, int):
+        return self.backend.get_position()
+
+    def set_position(self, x:int, y:int) -> None:
+        self.backend.set_position(x, y)
+
+    def get_clip(self) -> pygame.Rect:
+        return pygame.Rect(0, 0, 0, 0)
+
+    def set_clip(self, rect:pygame.Rect) -> None:
+        return None
+
+    def fill_rect(self, colour:tuple, rect:tuple) -> None:
+        return None
+
+    def draw_rect(self, colour:tuple, rect:tuple, width:int) -> None:
+        return None
+
+    def draw_line(self, colour:tuple, start:(int, int), end:(int, int),
+                  width:int=1) -> None:
+        return None
+
+    def draw_lines(self, colour:tuple, points:[(int, int), ...],
+                   width:int=1, antialias:bool=False) -> None:
+        return None
+
+    def blit(self, surface:pygame.Surface, position:(int, int),
+             area:tuple=None) -> None:
+        return None
+
+    def convert(self, surface:pygame.Surface) -> pygame.Surface:
+        return self.backend.convert(surface)
+
+    def invalidate(self, surface:pygame.Surface) -> None:
+        self.backend.invalidate(surface)
+
+    def scroll(self, rect:pygame.Rect, dy:int) -> bool:
+        # Everything gets redrawn at the end anyway
+        return True
+
+    def present(self) -> None:
+        self.backend.present()
+
+
+BACKENDS = {"surface": SurfaceBackend, "renderer": RendererBackend}
+
+
+def create_backend(name:str, vsync:bool=True):
+    """
+    Returns the backend called `name`. If the "renderer" backend can't be
+    used (old pygame without `pygame._sdl2`), it falls back to "surface".
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend: \"{name}\"")
+    try:
+        return BACKENDS[name](vsync=vsync)
+    except ImportError:
+        stderr.write(f"[Warning]: Can't use the \"{name}\" backend. " \
+                     "Using \"surface\" instead.\n")
+        return SurfaceBackend(vsync=vsync)
@@ -1,10 +1,76 @@
 from __future__ import annotations
+from itemstore import ItemStore, CanvasItem, parse_rectangle
+from bisect import bisect_left
 from widget import Widget
 import constants
 
 import pygame
 
 
+# The pixel formats that `pygame.image.frombuffer` understands:
+STREAM_FORMATS = ("P", "RGB", "BGR", "RGBX", "RGBA", "ARGB", "BGRA")
+
+
+def transform_line(xs, ys, scale:(float, float),
+                   offset:(float, float)) -> (list, list):
+    # Data coordinates => pixels (relative to the canvas)
+    if hasattr(xs, "dtype"):
+        return xs*scale[0] + offset[0], ys*scale[1] + offset[1]
+    return ([x*scale[0] + offset[0] for x in xs],
+            [y*scale[1] + offset[1] for y in ys])
+
+
+def decimate_line(xs, ys, width:int) -> [(float, float), ...]:
+    """
+    Only keeps the smallest and biggest `y` of each pixel column so that a
+    line with more points than pixels ends up with at most 2 points per
+    column. `xs` must be sorted and both `xs` and `ys` must be in pixels.
+    The points just outside of `0 <= x <= width` are kept so the line still
+    goes to the edges.
+    """
+    if hasattr(xs, "dtype"):
+        return decimate_line_numpy(xs, ys, width)
+    low = max(0, bisect_left(xs, 0) - 1)
+    high = min(len(xs), bisect_left(xs, width+1) + 1)
+    if high - low <= 2*(width+2):
+        return list(zip(xs[low:high], ys[low:high]))
+
+    output = []
+    column = None
+    for x, y in zip(xs[low:high], ys[low:high]):
+        if int(x//1) != column:
+            if column is not None:
+                output.append((column, min_y))
+                output.append((column, max_y))
+            column = int(x//1)
+            min_y = max_y = y
+        elif y < min_y:
+            min_y = y
+        elif y > max_y:
+            max_y = y
+    output.append((column, min_y))
+    output.append((column, max_y))
+    return output
+
+
+def decimate_line_numpy(xs, ys, width:int) -> [(float, float), ...]:
+    import numpy
+    low = max(0, int(numpy.searchsorted(xs, 0)) - 1)
+    high = min(len(xs), int(numpy.searchsorted(xs, width+1)) + 1)
+    xs, ys = xs[low:high], ys[low:high]
+    if len(xs) <= 2*(width+2):
+        return numpy.stack((xs, ys), axis=1).tolist()
+
+    columns = numpy.floor(xs).astype(numpy.int64)
+    starts = numpy.flatnonzero(numpy.diff(columns)) + 1
+    starts = numpy.concatenate(([0], starts))
+    output = numpy.empty((2*len(starts), 2))
+    output[0::2, 0] = output[1::2, 0] = columns[starts]
+    output[0::2, 1] = numpy.minimum.reduceat(ys, starts)
+    output[1::2, 1] = numpy.maximum.reduceat(ys, starts)
+    return output.tolist()
+
+
 class CanvasObject:
     def __init__(self, canvas:Canvas, type:str, *args, **kwargs):
         self.last_kwargs = kwargs
@@ -12,42 +78,108 @@ class CanvasObject:
         self.canvas = canvas
         self.deleted = False
         self.type = type
+        # The last image given to us and its converted copy:
+        self.image_source = None
+        self.image = None
+        # Lines: The last points given to us and the cached decimated line
+        self.points_source = None
+        self.points_version = 0
+        self.points_bounds = None # (min x, min y, max x, max y) of the data
+        self.line_cache = None
+        self.line_cache_key = None
+        # Set by the canvas when the object is added to it
+        self.id = None
+        self.tags = set()
         self.config(*args, **kwargs)
 
     def __str__(self) -> str:
         return f"{self.__class__.__name__}({str(id(self))[-4:]})"
 
     def parse_args_rectangle(self, *args:tuple, **kwargs:dict) -> None:
-        if len(args) != 4:
-            raise ValueError(f"Invalid coords: {repr(args)}")
-
-        # Get rid of all of the negatives:
-        args = (max(0, args[0]), max(0, args[1]), args[2], args[3])
-        # Check if `x2` and `y2` are > than `x1` and `y1`:
-        if args[2] < args[0]:
-            raise ValueError("The `x2` provided is smaller than `x1`")
-        if args[3] < args[1]:
-            raise ValueError("The `y2` provided is smaller than `y1`")
-
-        self.position = args
-        self.fill = constants.parse_colour(kwargs.pop("fill", ""))
-        self.outline = constants.parse_colour(kwargs.pop("outline", ""))
-        self.border = kwargs.pop("border", 0)
-        if not isinstance(self.border, int):
-            raise ValueError(f"Invalid border width: {repr(self.border)}")
-        self.border = min(0, self.border)
-        if self.border > 0:
-            if self.outline is None:
-                raise ValueError("Invalid colour: None")
+        self.position, self.fill, self.outline, self.border = \
+                                              parse_rectangle(*args, **kwargs)
+
+    def parse_args_image(self, *args:tuple, **kwargs:dict) -> None:
+        image = kwargs.pop("image", None)
+        # Only convert the image when it changes
+        if image is not self.image_source:
+            self.image_source = image
+            self.image = self.convert_image(image)
+
+        self.parse_position(*args)
         if len(kwargs) != 0:
             raise ValueError(f"Unhandled kwargs: {kwargs}")
 
-    def parse_args_image(self, *args:tuple, **kwargs:dict) -> None:
-        self.image = kwargs.pop("image", None)
-        if self.image is not None:
-            if not isinstance(self.image, pygame.Surface):
-                self.image = pygame.surfarray.make_surface(self.image)
+    def parse_args_stream(self, *args:tuple, **kwargs:dict) -> None:
+        size = tuple(kwargs.pop("size"))
+        format = kwargs.pop("format", "RGB")
+        if format not in STREAM_FORMATS:
+            raise ValueError(f"Unknown pixel format: {repr(format)}")
+        if (self.image is None) or (size != self.image.get_size()) or \
+           (format != self.format):
+            self.format = format
+            self.pending_frame = None
+            self.frames_shown = self.frames_dropped = 0
+            # The only surface that this stream will ever write to
+            if format in ("RGBA", "ARGB", "BGRA"):
+                self.image = pygame.Surface(size, pygame.SRCALPHA)
+            else:
+                self.image = pygame.Surface(size)
+            self.image = self.canvas._root._backend.convert(self.image)
+        self.parse_position(*args)
+        if len(kwargs) != 0:
+            raise ValueError(f"Unhandled kwargs: {kwargs}")
 
+    def parse_args_line(self, *args:tuple, **kwargs:dict) -> None:
+        points = kwargs.pop("points", None)
+        if points is None:
+            points = args
+            changed = not (isinstance(self.points_source, tuple) and
+                           (args == self.points_source))
+        else:
+            changed = points is not self.points_source
+        if changed:
+            if points is args:
+                if (len(args) < 4) or (len(args) % 2 != 0):
+                    raise ValueError(f"Invalid coords: {repr(args)}")
+                self.xs, self.ys = list(args[0::2]), list(args[1::2])
+            elif hasattr(points, "shape"):
+                self.xs, self.ys = points[:, 0], points[:, 1]
+            else:
+                self.xs = [x for x, y in points]
+                self.ys = [y for x, y in points]
+            if len(self.xs) < 2:
+                raise ValueError("A line needs at least 2 points")
+            self.points_source = points
+            self.points_changed()
+
+        self.fill = constants.parse_colour(kwargs.pop("fill", "black"))
+        self.width = kwargs.pop("width", 1)
+        self.antialias = kwargs.pop("antialias", False)
+        self.scale = tuple(kwargs.pop("scale", (1, 1)))
+        self.offset = tuple(kwargs.pop("offset", (0, 0)))
+        if self.fill is None:
+            raise ValueError("Invalid colour: None")
+        if len(kwargs) != 0:
+            raise ValueError(f"Unhandled kwargs: {kwargs}")
+
+        if self.points_bounds is None:
+            # Only recomputed when the points change (not on `move`)
+            self.points_bounds = (min(self.xs), min(self.ys), max(self.xs),
+                                  max(self.ys))
+        x1, y1, x2, y2 = self.points_bounds
+        xs, ys = transform_line((x1, x2), (y1, y2), self.scale, self.offset)
+        self.position = (int(min(xs)), int(min(ys)),
+                         int(max(xs)) + 1, int(max(ys)) + 1)
+
+    def points_changed(self) -> None:
+        """
+        Call this if you changed the points of the line in place.
+        """
+        self.points_version += 1
+        self.points_bounds = None
+
+    def parse_position(self, *args:tuple) -> None:
         if len(args) == 0:
             self.position = (0, 0)
         elif len(args) == 2:
@@ -58,31 +190,115 @@ class CanvasObject:
             raise ValueError("The `x` position is < 0. That isn't allowed.")
         if self.position[1] < 0:
             raise ValueError("The `y` position is < 0. That isn't allowed.")
-        if len(kwargs) != 0:
-            raise ValueError(f"Unhandled kwargs: {kwargs}")
+
+    def convert_image(self, image) -> pygame.Surface:
+        # Convert to the display's pixel format so blitting it is fast
+        if image is None:
+            return None
+        if not isinstance(image, pygame.Surface):
+            image = pygame.surfarray.make_surface(image)
+        return self.canvas._root._backend.convert(image)
+
+    def update_pixels(self, array, x:int=0, y:int=0,
+                      redraw:bool=True) -> None:
+        """
+        Copies the numpy `array` into the image at (x, y) without creating
+        a new surface. The array's shape must be (width, height, 3) for
+        RGB values or (width, height) for mapped colours. Only the area that
+        changed is redrawn.
+        """
+        if self.deleted:
+            raise RuntimeError("Can't `.update_pixels` dead objects.")
+        if self.type != "image":
+            raise ValueError("Only images have pixels")
+        width, height = array.shape[:2]
+        if array.ndim == 3:
+            pixels = pygame.surfarray.pixels3d(self.image)
+        else:
+            pixels = pygame.surfarray.pixels2d(self.image)
+        pixels[x:x+width, y:y+height] = array
+        # Unlock the surface
+        del pixels
+        self.canvas._root._backend.invalidate(self.image)
+        if redraw:
+            x += self.position[0]
+            y += self.position[1]
+            self.canvas.redraw_region(x, y, x+width, y+height)
+
+    def push_frame(self, frame) -> None:
+        """
+        Gives the stream a new frame. `frame` can be `bytes`, a `memoryview`
+        or a numpy array with the pixels in the stream's `format`. It isn't
+        copied until it's shown so don't change it until then. If a frame
+        is still waiting to be shown, it's dropped.
+        """
+        if self.deleted:
+            raise RuntimeError("Can't `.push_frame` to dead objects.")
+        if self.pending_frame is not None:
+            self.frames_dropped += 1
+        self.pending_frame = frame
+
+    def show_pending_frame(self) -> bool:
+        if self.pending_frame is None:
+            return False
+        frame = pygame.image.frombuffer(self.pending_frame,
+                                        self.image.get_size(), self.format)
+        self.pending_frame = None
+        # Copy it into our surface (converting it to the display's format)
+        self.image.blit(frame, (0, 0))
+        self.canvas._root._backend.invalidate(self.image)
+        self.frames_shown += 1
+        return True
+
+    def stream_stats(self) -> dict:
+        return {"shown": self.frames_shown, "dropped": self.frames_dropped}
 
     def redraw(self) -> (int, int, int, int):
         if self.deleted:
             return (0, 0, 0, 0)
-        if self.type == "image":
-            return self.redraw_image()
+        # Objects can't draw outside of the canvas
+        old_clip = self.canvas._clip_to_self()
+        if old_clip is None:
+            return (0, 0, 0, 0)
+        if self.type in ("image", "stream"):
+            positions = self.redraw_image()
+        elif self.type == "line":
+            positions = self.redraw_line()
         elif self.type == "rectangle":
-            return self.redraw_rectangle()
+            positions = self.redraw_rectangle()
+        self.canvas._root._backend.set_clip(old_clip)
+        return positions
 
     def redraw_rectangle(self) -> (int, int, int, int):
         x1, y1, x2, y2 = self.position
-        max_width = self.canvas.winfo_width() - x1
-        max_height = self.canvas.winfo_height() - y1
-        positions = (x1 + self.canvas.winfo_x(),
-                     y1 + self.canvas.winfo_y(),
-                     min(max_width, x2 - x1),
-                     min(max_height, y2 - y1))
+        positions = (x1 + self.canvas.winfo_x(), y1 + self.canvas.winfo_y(),
+                     x2 - x1, y2 - y1)
+        backend = self.canvas._root._backend
         if self.fill is not None:
-            pygame.draw.rect(self.canvas._root._display, self.fill, positions,
-                             0)
+            backend.fill_rect(self.fill, positions)
         if self.border != 0:
-            pygame.draw.rect(self.canvas._root._display, self.outline,
-                             positions, self.border)
+            backend.draw_rect(self.outline, positions, self.border)
+        return positions
+
+    def get_line_points(self) -> [(float, float), ...]:
+        x, y = self.canvas._get_abs_position()
+        width = self.canvas.winfo_width()
+        key = (self.points_version, self.scale, self.offset, x, y, width)
+        if key != self.line_cache_key:
+            xs, ys = transform_line(self.xs, self.ys, self.scale, self.offset)
+            self.line_cache = [(px + x, py + y)
+                               for px, py in decimate_line(xs, ys, width)]
+            self.line_cache_key = key
+        return self.line_cache
+
+    def redraw_line(self) -> (int, int, int, int):
+        points = self.get_line_points()
+        positions = (*self.canvas._get_abs_position(),
+                     self.canvas.winfo_width(), self.canvas.winfo_height())
+        if len(points) < 2:
+            return positions
+        self.canvas._root._backend.draw_lines(self.fill, points, self.width,
+                                              self.antialias)
         return positions
 
     def redraw_image(self) -> (int, int, int, int):
@@ -90,84 +306,564 @@ class CanvasObject:
             return (0, 0, 0, 0)
 
         x, y = self.position
-        width, height = self.image.get_size()
-        width = min(width, self.canvas.winfo_width() - x)
-        height = min(height, self.canvas.winfo_height() - y)
-
-        positions = (x + self.canvas.winfo_x(),
-                     y + self.canvas.winfo_y(),
-                     width, height)
-        if self.image is not None:
-            self.canvas._root._display.blit(self.image, positions)
+        self.canvas._root._backend.blit(self.image, (x + self.canvas.winfo_x(),
+                                                     y + self.canvas.winfo_y()))
         return self.position
 
+    def bbox(self) -> (int, int, int, int):
+        if self.type in ("rectangle", "line"):
+            return self.position
+        x, y = self.position
+        if self.image is None:
+            return (x, y, x, y)
+        width, height = self.image.get_size()
+        return (x, y, x+width, y+height)
+
+    def move(self, dx:int, dy:int, redraw_canvas:bool=True) -> None:
+        if self.type == "line":
+            x, y = self.offset
+            return self.config(offset=(x+dx, y+dy), redraw_canvas=redraw_canvas)
+        if self.type == "rectangle":
+            x1, y1, x2, y2 = self.position
+            args = (x1+dx, y1+dy, x2+dx, y2+dy)
+        else:
+            x, y = self.position
+            args = (x+dx, y+dy)
+        self.config(*args, redraw_canvas=redraw_canvas)
+
+    def parse_args(self, *args) -> None:
+        if self.id is not None:
+            old_bbox = self.bbox()
+        self.last_args = args
+        if self.type == "image":
+            self.parse_args_image(*args, **self.last_kwargs)
+        elif self.type == "stream":
+            self.parse_args_stream(*args, **self.last_kwargs)
+        elif self.type == "rectangle":
+            self.parse_args_rectangle(*args, **self.last_kwargs)
+        elif self.type == "line":
+            self.parse_args_line(*args, **self.last_kwargs)
+        else:
+            raise ValueError(f"Invalid shape: {repr(self.type)}")
+        if self.id is not None:
+            self.canvas._spatial_index.update(self.id, old_bbox, self.bbox())
+
     def config(self, *args, redraw_canvas:bool=True, **kwargs) -> None:
+        """
+        `redraw_canvas` can be `True` (redraw the whole canvas), `False`
+        (only draw this object) or `None` (don't draw anything).
+        """
         if self.deleted:
             raise RuntimeError("Can't `.config` dead objects.")
         if len(args) == 0:
             args = self.last_args
         self.last_kwargs.update(kwargs)
-        if self.type == "image":
-            self.parse_args_image(*args, **self.last_kwargs)
-        elif self.type == "rectangle":
-            self.parse_args_rectangle(*args, **self.last_kwargs)
-        else:
-            raise ValueError(f"Invalid shape: {repr(type)}")
+        self.parse_args(*args)
         if redraw_canvas:
             self.canvas.redraw()
-        else:
+        elif redraw_canvas is not None:
             self.redraw()
 
 
+class SpatialIndex:
+    """
+    A uniform grid of `cell_size`x`cell_size` cells. Each cell knows which
+    items overlap it so area queries only have to look at nearby items.
+    The bounding boxes aren't copied. `get_bbox(id)` is used to get them
+    so callers must pass in the old bounding box when an item changes.
+    `bounds` is the range of cells that can be occupied. It only grows
+    (until the index is empty) so removing items stays cheap.
+    Items that would cover more than `max_cells` cells (like long lines)
+    are kept in `large` instead and always checked, so moving them doesn't
+    touch thousands of cells.
+    """
+    def __init__(self, get_bbox, cell_size:int=64, max_cells:int=64):
+        self.get_bbox = get_bbox
+        self.cell_size = cell_size
+        self.max_cells = max_cells
+        self.cells = {} # {(column, row): {id, ...}}
+        self.bounds = None # (column1, row1, column2, row2)
+        self.large = set()
+
+    def get_cell_range(self, x1:int, y1:int, x2:int,
+                       y2:int) -> (int, int, int, int):
+        size = self.cell_size
+        return (int(x1//size), int(y1//size), int(x2//size), int(y2//size))
+
+    def iter_cells(self, cell_range:(int, int, int, int)):
+        column1, row1, column2, row2 = cell_range
+        for column in range(column1, column2+1):
+            for row in range(row1, row2+1):
+                yield (column, row)
+
+    def is_large(self, cell_range:(int, int, int, int)) -> bool:
+        column1, row1, column2, row2 = cell_range
+        return (column2-column1+1)*(row2-row1+1) > self.max_cells
+
+    def insert(self, id:int, bbox:(int, int, int, int)) -> None:
+        cell_range = self.get_cell_range(*bbox)
+        if self.is_large(cell_range):
+            self.large.add(id)
+            return None
+        for cell in self.iter_cells(cell_range):
+            if cell in self.cells:
+                self.cells[cell].add(id)
+            else:
+                self.cells[cell] = {id}
+        if self.bounds is None:
+            self.bounds = cell_range
+        else:
+            column1, row1, column2, row2 = self.bounds
+            self.bounds = (min(column1, cell_range[0]),
+                           min(row1, cell_range[1]),
+                           max(column2, cell_range[2]),
+                           max(row2, cell_range[3]))
+
+    def remove(self, id:int, bbox:(int, int, int, int)) -> None:
+        cell_range = self.get_cell_range(*bbox)
+        if self.is_large(cell_range):
+            self.large.discard(id)
+            return None
+        for cell in self.iter_cells(cell_range):
+            self.cells[cell].discard(id)
+            if len(self.cells[cell]) == 0:
+                self.cells.pop(cell)
+        if len(self.cells) == 0:
+            self.bounds = None
+
+    def update(self, id:int, old_bbox:(int, int, int, int),
+               new_bbox:(int, int, int, int)) -> None:
+        old_range = self.get_cell_range(*old_bbox)
+        new_range = self.get_cell_range(*new_bbox)
+        if (old_range == new_range) or \
+           (self.is_large(old_range) and self.is_large(new_range)):
+            return None
+        self.remove(id, old_bbox)
+        self.insert(id, new_bbox)
+
+    def query(self, x1:int, y1:int, x2:int, y2:int) -> {int, ...}:
+        # Returns the ids of all of the items that overlap the area
+        output = set()
+        cells = self.iter_cells(self.get_cell_range(x1, y1, x2, y2))
+        for ids in (self.large, *(self.cells.get(cell, ()) for cell in cells)):
+            for id in ids:
+                if id in output:
+                    continue
+                ix1, iy1, ix2, iy2 = self.get_bbox(id)
+                if (ix1 <= x2) and (x1 <= ix2) and (iy1 <= y2) and (y1 <= iy2):
+                    output.add(id)
+        return output
+
+    def closest(self, x:int, y:int) -> int:
+        # Look at the rings of cells around (x, y) until we know that no
+        # other item can be closer. Ties go to the top most item.
+        best_id = None
+        best_distance = float("inf")
+        for id in self.large:
+            distance = self.distance(id, x, y)
+            if (distance < best_distance) or \
+               ((distance == best_distance) and (id > best_id)):
+                best_id, best_distance = id, distance
+        if len(self.cells) == 0:
+            return best_id
+        size = self.cell_size
+        column, row = int(x//size), int(y//size)
+        # The rings after `max_radius` are outside of `self.bounds`
+        column1, row1, column2, row2 = self.bounds
+        max_radius = max(column - column1, column2 - column, row - row1,
+                         row2 - row, 0)
+        for radius in range(max_radius+1):
+            for cell in self.iter_ring(column, row, radius):
+                for id in self.cells.get(cell, ()):
+                    distance = self.distance(id, x, y)
+                    if (distance < best_distance) or \
+                       ((distance == best_distance) and (id > best_id)):
+                        best_id, best_distance = id, distance
+            if best_distance <= radius*size:
+                break
+        return best_id
+
+    def iter_ring(self, column:int, row:int, radius:int):
+        if radius == 0:
+            yield (column, row)
+            return None
+        for c in range(column-radius, column+radius+1):
+            yield (c, row-radius)
+            yield (c, row+radius)
+        for r in range(row-radius+1, row+radius):
+            yield (column-radius, r)
+            yield (column+radius, r)
+
+    def distance(self, id:int, x:int, y:int) -> float:
+        x1, y1, x2, y2 = self.get_bbox(id)
+        dx = max(x1 - x, 0, x - x2)
+        dy = max(y1 - y, 0, y - y2)
+        return (dx*dx + dy*dy) ** 0.5
+
+
+
+
 class Canvas(Widget):
+    __slots__ = ("objects", "streams", "_items", "_item_tags", "_tags",
+                 "_spatial_index", "_next_id")
+
     def __init__(self, master, width:int=400, height:int=400, **kwargs):
         super().__init__(master, width=width, height=height, **kwargs)
-        self.objects = []
+        self.objects = {} # {id: CanvasObject} (in drawing order)
+        self.streams = []
+        # Rectangles are stored in columns. Look at `ItemStore`
+        self._items = ItemStore()
+        self._item_tags = {} # {id: {tag, ...}} (only for `self._items`)
+        self._tags = {} # {tag: {id, ...}}
+        self._spatial_index = SpatialIndex(self._get_bbox)
+        self._next_id = 1
+
+    def update(self) -> None:
+        # Streams only show their newest frame once per frame
+        for stream in self.streams:
+            if stream.show_pending_frame():
+                x, y = stream.position
+                width, height = stream.image.get_size()
+                self.redraw_region(x, y, x+width, y+height)
 
     def redraw(self) -> (int, int, int, int):
+        old_clip = self._clip_to_self()
+        if old_clip is None:
+            return None
         last_changed = None
+        backend = self._root._backend
 
         if self._bg is not None:
-            args = (self._x, self._y, self._width, self._height)
-            pygame.draw.rect(self._root._display, self._bg, args, 0)
+            args = tuple(self._get_rect())
+            backend.fill_rect(self._bg, args)
             last_changed = args
 
-        for object in self.objects:
+        # Draw the rows of `self._items` and `self.objects` in id order
+        x, y = self._get_abs_position()
+        row = 0
+        for object in self.objects.values():
+            next_row = bisect_left(self._items.ids, object.id)
+            self._items.redraw(backend, x, y, row, next_row)
+            row = next_row
             last_changed = object.redraw()
+        self._items.redraw(backend, x, y, row)
+        backend.set_clip(old_clip)
         return last_changed
 
-    def create_image(self, *args, custom:bool=False, **kwargs) -> CanvasObject:
+    def create_image(self, *args, custom:bool=False, tags:tuple=(),
+                     **kwargs) -> CanvasObject:
         object = CanvasObject(self, "image", *args, **kwargs)
         if not custom:
-            self.objects.append(object)
+            self._add_object(object, tags)
         object.redraw()
         return object
 
-    def create_rectangle(self, *args, custom:bool=False, **kwargs) -> CanvasObject:
-        object = CanvasObject(self, "rectangle", *args, **kwargs)
-        if not custom:
-            self.objects.append(object)
+    def create_rectangle(self, *args, custom:bool=False, tags:tuple=(),
+                         **kwargs) -> CanvasItem:
+        # Only custom rectangles get a full `CanvasObject`
+        if custom:
+            object = CanvasObject(self, "rectangle", *args, **kwargs)
+            object.redraw()
+            return object
+        coords, fill, outline, border = parse_rectangle(*args, **kwargs)
+        item = CanvasItem(self, self._next_id)
+        self._next_id += 1
+        self._items.append(item.id, coords, fill, outline, border)
+        # The store rounds float coords
+        self._spatial_index.insert(item.id, item.position)
+        self._add_tags(item, tags)
+        item.redraw()
+        return item
+
+    def create_line(self, *args, tags:tuple=(), **kwargs) -> CanvasObject:
+        """
+        Creates a line. The points can be passed in as `x1, y1, x2, y2, ...`
+        or as `points=` (a list of `(x, y)` or a numpy array of shape
+        (n, 2)). The points must be sorted by `x`. Other options:
+            fill, width, antialias
+            scale:  (x_scale, y_scale) pixels per unit
+            offset: (x, y) where the point (0, 0) is drawn
+        Lines with more points than pixels are decimated so drawing them
+        only depends on the canvas's width.
+        """
+        object = CanvasObject(self, "line", *args, **kwargs)
+        self._add_object(object, tags)
+        object.redraw()
+        return object
+
+    def create_stream(self, *args, size:(int, int), format:str="RGB",
+                      tags:tuple=(), **kwargs) -> CanvasObject:
+        """
+        Creates an image that is fed frames using `<CanvasObject>.push_frame`.
+        `format` is the pixel format of the frames (look at `STREAM_FORMATS`)
+        """
+        object = CanvasObject(self, "stream", *args, size=size,
+                              format=format, **kwargs)
+        self._add_object(object, tags)
+        self.streams.append(object)
         object.redraw()
         return object
 
-    def add_custom(self, object:CanvasObject) -> None:
-        self.objects.append(object)
+    def add_custom(self, object:CanvasObject, tags:tuple=()) -> None:
+        self._add_object(object, tags)
         object.redraw()
 
-    def delete(self, object:CanvasObject, redraw:bool=True) -> None:
-        if object == "all":
-            for object in self.objects:
+    def _add_object(self, object:CanvasObject, tags:tuple) -> None:
+        object.id = self._next_id
+        self._next_id += 1
+        self.objects[object.id] = object
+        self._spatial_index.insert(object.id, object.bbox())
+        self._add_tags(object, tags)
+
+    def _add_tags(self, object:CanvasObject, tags:tuple) -> None:
+        if isinstance(tags, str):
+            tags = (tags, )
+        for tag in tags:
+            self._add_tag(object, tag)
+
+    def _get_bbox(self, id:int) -> (int, int, int, int):
+        if id in self.objects:
+            return self.objects[id].bbox()
+        return self._items.get_coords(id)
+
+    def _get_object(self, id:int) -> CanvasObject:
+        if id in self.objects:
+            return self.objects[id]
+        if id in self._items:
+            return CanvasItem(self, id)
+        return None
+
+    def _add_tag(self, object:CanvasObject, tag:str) -> None:
+        object.tags.add(tag)
+        if tag in self._tags:
+            self._tags[tag].add(object.id)
+        else:
+            self._tags[tag] = {object.id}
+
+    def _remove_tag(self, object:CanvasObject, tag:str) -> None:
+        object.tags.discard(tag)
+        if tag in self._tags:
+            self._tags[tag].discard(object.id)
+            if len(self._tags[tag]) == 0:
+                self._tags.pop(tag)
+
+    def _find_objects(self, tag_or_id) -> [CanvasObject, ...]:
+        # `tag_or_id` can be a `CanvasObject`, an id, a tag or "all"
+        if isinstance(tag_or_id, (CanvasObject, CanvasItem)):
+            return [tag_or_id]
+        if isinstance(tag_or_id, int):
+            object = self._get_object(tag_or_id)
+            if object is None:
+                return []
+            return [object]
+        if tag_or_id == "all":
+            ids = sorted((*self.objects, *self._items.iter_ids()))
+        else:
+            ids = sorted(self._tags.get(tag_or_id, ()))
+        return [self._get_object(id) for id in ids]
+
+    def find_withtag(self, tag_or_id) -> (int, ...):
+        return tuple(object.id for object in self._find_objects(tag_or_id))
+
+    def find_overlapping(self, x1:int, y1:int, x2:int, y2:int) -> (int, ...):
+        return tuple(sorted(self._spatial_index.query(x1, y1, x2, y2)))
+
+    def find_enclosed(self, x1:int, y1:int, x2:int, y2:int) -> (int, ...):
+        output = []
+        for id in self._spatial_index.query(x1, y1, x2, y2):
+            ix1, iy1, ix2, iy2 = self._get_bbox(id)
+            if (x1 <= ix1) and (y1 <= iy1) and (ix2 <= x2) and (iy2 <= y2):
+                output.append(id)
+        return tuple(sorted(output))
+
+    def find_closest(self, x:int, y:int) -> (int, ):
+        id = self._spatial_index.closest(x, y)
+        if id is None:
+            return ()
+        return (id, )
+
+    def addtag_withtag(self, new_tag:str, tag_or_id) -> None:
+        for object in self._find_objects(tag_or_id):
+            self._add_tag(object, new_tag)
+
+    def dtag(self, tag_or_id, tag:str=None) -> None:
+        if tag is None:
+            tag = tag_or_id
+        for object in self._find_objects(tag_or_id):
+            self._remove_tag(object, tag)
+
+    def gettags(self, tag_or_id) -> (str, ...):
+        objects = self._find_objects(tag_or_id)
+        if len(objects) == 0:
+            return ()
+        return tuple(sorted(objects[0].tags))
+
+    def move(self, tag_or_id, dx:int, dy:int, redraw:bool=True) -> None:
+        for object in self._find_objects(tag_or_id):
+            object.move(dx, dy, redraw_canvas=None)
+        if redraw:
+            self.redraw()
+
+    def delete(self, tag_or_id, redraw:bool=True) -> None:
+        if tag_or_id == "all":
+            for object in self.objects.values():
                 object.deleted = True
             self.objects.clear()
+            self.streams.clear()
+            self._items.clear()
+            self._item_tags.clear()
+            self._tags.clear()
+            self._spatial_index = SpatialIndex(self._get_bbox)
         else:
-            self.objects.remove(object)
-            object.deleted = True
+            for object in self._find_objects(tag_or_id):
+                self._delete_object(object)
         if redraw:
             self.redraw()
 
-    def itemconfig(self, object, *args, redraw:bool=True, **kwargs) -> None:
-        object.config(*args, **kwargs)
+    def _delete_object(self, object:CanvasObject) -> None:
+        if object.deleted or (object.id is None):
+            return None
+        self._spatial_index.remove(object.id, object.bbox())
+        for tag in tuple(object.tags):
+            self._remove_tag(object, tag)
+        if isinstance(object, CanvasItem):
+            self._items.remove(object.id)
+            self._item_tags.pop(object.id, None)
+            return None
+        self.objects.pop(object.id)
+        if object.type == "stream":
+            self.streams.remove(object)
+        object.deleted = True
+
+    def itemconfig(self, tag_or_id, *args, redraw:bool=True,
+                   **kwargs) -> None:
+        objects = self._find_objects(tag_or_id)
+        for object in objects:
+            object.config(*args, redraw_canvas=None, **kwargs)
         if redraw:
             self.redraw()
         else:
-            object.redraw()
+            for object in objects:
+                object.redraw()
+
+
+
+#################################### Tests #####################################
+def test_spatial_index_query(add_breakpoint:bool=False):
+    # Tests if `SpatialIndex.query` finds the items that overlap an area
+    bboxes = {1: (0, 0, 5, 5), 2: (8, 8, 25, 12), 3: (100, 100, 110, 110)}
+    index = SpatialIndex(bboxes.get, cell_size=10)
+    for id, bbox in bboxes.items():
+        index.insert(id, bbox)
+
+    if add_breakpoint:
+        breakpoint()
+
+    msg = "Failed! <SpatialIndex> doesn't find the overlapping items."
+    assert index.query(4, 4, 9, 9) == {1, 2}, msg
+    assert index.query(20, 0, 30, 30) == {2}, msg
+    assert index.query(50, 50, 60, 60) == set(), msg
+
+    index.update(2, bboxes[2], (102, 102, 104, 104))
+    bboxes[2] = (102, 102, 104, 104)
+    index.remove(1, bboxes.pop(1))
+    msg = "Failed! <SpatialIndex> doesn't update/remove items correctly."
+    assert index.query(0, 0, 30, 30) == set(), msg
+    assert index.query(103, 103, 103, 103) == {2, 3}, msg
+
+    # Big items aren't put in every cell
+    bboxes[4] = (0, 0, 1000, 50)
+    index.insert(4, bboxes[4])
+    msg = "Failed! <SpatialIndex> doesn't handle big items correctly."
+    assert (index.large == {4}) and (4 not in index.cells.get((50, 0), ())), msg
+    assert index.query(500, 40, 510, 60) == {4}, msg
+    assert index.query(500, 60, 510, 70) == set(), msg
+    assert index.closest(500, 100) == 4, msg
+    index.update(4, bboxes[4], (0, 200, 1000, 250))
+    bboxes[4] = (0, 200, 1000, 250)
+    assert index.query(500, 40, 510, 60) == set(), msg
+    index.remove(4, bboxes.pop(4))
+    assert len(index.large) == 0, msg
+
+
+def test_spatial_index_closest(add_breakpoint:bool=False):
+    # Tests if `SpatialIndex.closest` finds the closest/top most item
+    bboxes = {1: (0, 0, 5, 5), 2: (200, 0, 205, 5), 3: (0, 0, 5, 5)}
+    index = SpatialIndex(bboxes.get, cell_size=10)
+    for id, bbox in bboxes.items():
+        index.insert(id, bbox)
+
+    if add_breakpoint:
+        breakpoint()
+
+    msg = "Failed! <SpatialIndex> doesn't find the closest item."
+    assert index.closest(150, 3) == 2, msg
+    assert index.closest(60, 60) == 3, msg
+    assert SpatialIndex(bboxes.get).closest(0, 0) is None, msg
+    index.remove(2, bboxes[2])
+    assert index.closest(1000, -1000) == 3, msg
+    msg = "Failed! <SpatialIndex> has the wrong bounds."
+    assert index.bounds == (0, 0, 20, 0), msg
+    for id in (1, 3):
+        index.remove(id, bboxes[id])
+    assert (index.bounds is None) and (index.closest(0, 0) is None), msg
+
+
+def test_decimate_line(add_breakpoint:bool=False):
+    # Tests if `decimate_line` keeps the min/max of each pixel column
+    xs = [i/10 for i in range(100)]
+    ys = [(i % 10) * (-1)**(i//10) for i in range(100)]
+    output = decimate_line(xs, ys, width=3)
+
+    if add_breakpoint:
+        breakpoint()
+
+    msg = "Failed! `decimate_line` doesn't keep the min/max of each column."
+    assert output[:4] == [(0, 0), (0, 9), (1, -9), (1, 0)], msg
+    assert len(output) == 2*5, msg
+
+    msg = "Failed! `decimate_line` shouldn't change short lines."
+    assert decimate_line([0, 1, 2], [5, 6, 7], 100) == \
+                                                [(0, 5), (1, 6), (2, 7)], msg
+
+
+def test_item_store_float_coords(add_breakpoint:bool=False):
+    # Tests if `ItemStore` rounds floats and never adds half of a row
+    items = ItemStore()
+    items.append(1, (0.4, 1.6, 10.5, 20.0), (255, 0, 0), None, 0)
+
+    if add_breakpoint:
+        breakpoint()
+
+    msg = "Failed! <ItemStore> doesn't round float coords."
+    assert items.get_coords(1) == (0, 2, 10, 20), msg
+    msg = "Failed! <ItemStore> added part of an invalid row."
+    for coords in ((0, 0, "a", 5), (0, 0, 5)):
+        try:
+            items.append(2, coords, None, None, 0)
+        except (TypeError, ValueError):
+            pass
+        else:
+            raise AssertionError(msg)
+    columns = (items.ids, items.x1s, items.y1s, items.x2s, items.y2s,
+               items.fills, items.outlines, items.borders, items.flags)
+    assert len(set(map(len, columns))) == 1, msg
+    items.append(2, (1.5, 0, 3, 3), None, (0, 0, 0), 1)
+    items.set(2, (2.2, 2, 4.7, 4), None, (0, 0, 0), 1)
+    msg = "Failed! <ItemStore> doesn't round float coords."
+    assert items.get_coords(2) == (2, 2, 5, 4), msg
+
+
+def test():
+    from sys import stderr
+    tests = (test_spatial_index_query, test_spatial_index_closest,
+             test_decimate_line, test_item_store_float_coords)
+    for _test in tests:
+        stderr.write(f"[Debug]: Testing {_test.__name__}:\n")
+        _test()
+        stderr.write(f"[Debug]: Test passed.\n")
+    stderr.write(f"[Debug]: All tests passed.\n")
+
+
+if __name__ == "__main__":
+    test()
@@ -2,9 +2,13 @@ import pygame
 
 
 def parse_cursor(cursor:str) -> int:
-    if cursor not in CURSORS:
+    # Custom cursors are tuples of the args for `pygame.cursors.Cursor`
+    if isinstance(cursor, tuple):
+        return cursor
+    cursors = _get_table("CURSORS")
+    if cursor not in cursors:
         raise ValueError(f"Unknown cursor: \"{cursor}\"")
-    return CURSORS[cursor]
+    return cursors[cursor]
 
 def parse_colour(colour) -> (int, int, int):
     if colour == "":
@@ -16,10 +20,26 @@ def parse_colour(colour) -> (int, int, int):
             raise ValueError(f"Unknown colour: \"{colour}\"")
         if colour[0] == "#":
             return hex_to_ints(colour)
-        if colour.upper() in COLOURS:
-            return COLOURS[colour.upper()]
+        name = colour.upper()
+        if name not in _FOUND_COLOURS:
+            _FOUND_COLOURS[name] = _find_colour(name)
+        if _FOUND_COLOURS[name] is not None:
+            return _FOUND_COLOURS[name]
     raise ValueError(f"Unknown colour: \"{colour}\"")
 
+def parse_font(font) -> pygame.font.Font:
+    # Fonts are cached because `pygame.font.SysFont` is really slow
+    if isinstance(font, pygame.font.Font):
+        return font
+    font = tuple(font)
+    if not pygame.font.get_init():
+        # The fonts from before `pygame.quit` can't be used anymore
+        pygame.font.init()
+        FONTS.clear()
+    if font not in FONTS:
+        FONTS[font] = pygame.font.SysFont(*font)
+    return FONTS[font]
+
 def hex_to_ints(hex_colour:str) -> (int, int, int):
     colour = []
     if not ((len(hex_colour) == 7) and (hex_colour[0] == "#")):
@@ -30,6 +50,51 @@ def hex_to_ints(hex_colour:str) -> (int, int, int):
             int(hex_colour[2:4], 16),
             int(hex_colour[4:], 16))
 
-COLOURS = {"ALICE BLUE": (240, 248, 255), "ALICEBLUE": (240, 248, 255), "ANTIQUE WHITE": (250, 235, 215), "ANTIQUEWHITE": (250, 235, 215), "ANTIQUEWHITE1": (255, 239, 219), "ANTIQUEWHITE2": (238, 223, 204), "ANTIQUEWHITE3": (205, 192, 176), "ANTIQUEWHITE4": (139, 131, 120), "AQUAMARINE": (127, 255, 212), "AQUAMARINE1": (127, 255, 212), "AQUAMARINE2": (118, 238, 198), "AQUAMARINE3": (102, 205, 170), "AQUAMARINE4": (69, 139, 116), "AZURE": (240, 255, 255), "AZURE1": (240, 255, 255), "AZURE2": (224, 238, 238), "AZURE3": (193, 205, 205), "AZURE4": (131, 139, 139), "BEIGE": (245, 245, 220), "BISQUE": (255, 228, 196), "BISQUE1": (255, 228, 196), "BISQUE2": (238, 213, 183), "BISQUE3": (205, 183, 158), "BISQUE4": (139, 125, 107), "BLACK": (0, 0, 0), "BLANCHED ALMOND": (255, 235, 205), "BLANCHEDALMOND": (255, 235, 205), "BLUE": (0, 0, 255), "BLUE VIOLET": (138, 43, 226), "BLUE1": (0, 0, 255), "BLUE2": (0, 0, 238), "BLUE3": (0, 0, 205), "BLUE4": (0, 0, 139), "BLUEVIOLET": (138, 43, 226), "BROWN": (165, 42, 42), "BROWN1": (255, 64, 64), "BROWN2": (238, 59, 59), "BROWN3": (205, 51, 51), "BROWN4": (139, 35, 35), "BURLYWOOD": (222, 184, 135), "BURLYWOOD1": (255, 211, 155), "BURLYWOOD2": (238, 197, 145), "BURLYWOOD3": (205, 170, 125), "BURLYWOOD4": (139, 115, 85), "CADET BLUE": (95, 158, 160), "CADETBLUE": (95, 158, 160), "CADETBLUE1": (152, 245, 255), "CADETBLUE2": (142, 229, 238), "CADETBLUE3": (122, 197, 205), "CADETBLUE4": (83, 134, 139), "CHARTREUSE": (127, 255, 0), "CHARTREUSE1": (127, 255, 0), "CHARTREUSE2": (118, 238, 0), "CHARTREUSE3": (102, 205, 0), "CHARTREUSE4": (69, 139, 0), "CHOCOLATE": (210, 105, 30), "CHOCOLATE1": (255, 127, 36), "CHOCOLATE2": (238, 118, 33), "CHOCOLATE3": (205, 102, 29), "CHOCOLATE4": (139, 69, 19), "CORAL": (255, 127, 80), "CORAL1": (255, 114, 86), "CORAL2": (238, 106, 80), "CORAL3": (205, 91, 69), "CORAL4": (139, 62, 47), "CORNFLOWER BLUE": (100, 149, 237), "CORNFLOWERBLUE": (100, 149, 237), "CORNSILK": (255, 248, 220), "CORNSILK1": (255, 248, 220), "CORNSILK2": (238, 232, 205), "CORNSILK3": (205, 200, 177), "CORNSILK4": (139, 136, 120), "CYAN": (0, 255, 255), "CYAN1": (0, 255, 255), "CYAN2": (0, 238, 238), "CYAN3": (0, 205, 205), "CYAN4": (0, 139, 139), "DARK BLUE": (0, 0, 139), "DARK CYAN": (0, 139, 139), "DARK GOLDENROD": (184, 134, 11), "DARK GRAY": (169, 169, 169), "DARK GREEN": (0, 100, 0), "DARK GREY": (169, 169, 169), "DARK KHAKI": (189, 183, 107), "DARK MAGENTA": (139, 0, 139), "DARK OLIVE GREEN": (85, 107, 47), "DARK ORANGE": (255, 140, 0), "DARK ORCHID": (153, 50, 204), "DARK RED": (139, 0, 0), "DARK SALMON": (233, 150, 122), "DARK SEA GREEN": (143, 188, 143), "DARK SLATE BLUE": (72, 61, 139), "DARK SLATE GRAY": (47, 79, 79), "DARK SLATE GREY": (47, 79, 79), "DARK TURQUOISE": (0, 206, 209), "DARK VIOLET": (148, 0, 211), "DARKBLUE": (0, 0, 139), "DARKCYAN": (0, 139, 139), "DARKGOLDENROD": (184, 134, 11), "DARKGOLDENROD1": (255, 185, 15), "DARKGOLDENROD2": (238, 173, 14), "DARKGOLDENROD3": (205, 149, 12), "DARKGOLDENROD4": (139, 101, 8), "DARKGRAY": (169, 169, 169), "DARKGREEN": (0, 100, 0), "DARKGREY": (169, 169, 169), "DARKKHAKI": (189, 183, 107), "DARKMAGENTA": (139, 0, 139), "DARKOLIVEGREEN": (85, 107, 47), "DARKOLIVEGREEN1": (202, 255, 112), "DARKOLIVEGREEN2": (188, 238, 104), "DARKOLIVEGREEN3": (162, 205, 90), "DARKOLIVEGREEN4": (110, 139, 61), "DARKORANGE": (255, 140, 0), "DARKORANGE1": (255, 127, 0), "DARKORANGE2": (238, 118, 0), "DARKORANGE3": (205, 102, 0), "DARKORANGE4": (139, 69, 0), "DARKORCHID": (153, 50, 204), "DARKORCHID1": (191, 62, 255), "DARKORCHID2": (178, 58, 238), "DARKORCHID3": (154, 50, 205), "DARKORCHID4": (104, 34, 139), "DARKRED": (139, 0, 0), "DARKSALMON": (233, 150, 122), "DARKSEAGREEN": (143, 188, 143), "DARKSEAGREEN1": (193, 255, 193), "DARKSEAGREEN2": (180, 238, 180), "DARKSEAGREEN3": (155, 205, 155), "DARKSEAGREEN4": (105, 139, 105), "DARKSLATEBLUE": (72, 61, 139), "DARKSLATEGRAY": (47, 79, 79), "DARKSLATEGRAY1": (151, 255, 255), "DARKSLATEGRAY2": (141, 238, 238), "DARKSLATEGRAY3": (121, 205, 205), "DARKSLATEGRAY4": (82, 139, 139), "DARKSLATEGREY": (47, 79, 79), "DARKTURQUOISE": (0, 206, 209), "DARKVIOLET": (148, 0, 211), "DEEP PINK": (255, 20, 147), "DEEP SKY BLUE": (0, 191, 255), "DEEPPINK": (255, 20, 147), "DEEPPINK1": (255, 20, 147), "DEEPPINK2": (238, 18, 137), "DEEPPINK3": (205, 16, 118), "DEEPPINK4": (139, 10, 80), "DEEPSKYBLUE": (0, 191, 255), "DEEPSKYBLUE1": (0, 191, 255), "DEEPSKYBLUE2": (0, 178, 238), "DEEPSKYBLUE3": (0, 154, 205), "DEEPSKYBLUE4": (0, 104, 139), "DIM GRAY": (105, 105, 105), "DIM GREY": (105, 105, 105), "DIMGRAY": (105, 105, 105), "DIMGREY": (105, 105, 105), "DODGER BLUE": (30, 144, 255), "DODGERBLUE": (30, 144, 255), "DODGERBLUE1": (30, 144, 255), "DODGERBLUE2": (28, 134, 238), "DODGERBLUE3": (24, 116, 205), "DODGERBLUE4": (16, 78, 139), "FIREBRICK": (178, 34, 34), "FIREBRICK1": (255, 48, 48), "FIREBRICK2": (238, 44, 44), "FIREBRICK3": (205, 38, 38), "FIREBRICK4": (139, 26, 26), "FLORAL WHITE": (255, 250, 240), "FLORALWHITE": (255, 250, 240), "FOREST GREEN": (34, 139, 34), "FORESTGREEN": (34, 139, 34), "FUCHSIA": (255, 0, 255), "GAINSBORO": (220, 220, 220), "GHOST WHITE": (248, 248, 255), "GHOSTWHITE": (248, 248, 255), "GOLD": (255, 215, 0), "GOLD1": (255, 215, 0), "GOLD2": (238, 201, 0), "GOLD3": (205, 173, 0), "GOLD4": (139, 117, 0), "GOLDENROD": (218, 165, 32), "GOLDENROD1": (255, 193, 37), "GOLDENROD2": (238, 180, 34), "GOLDENROD3": (205, 155, 29), "GOLDENROD4": (139, 105, 20), "GRAY": (128, 128, 128), "GREEN": (0, 128, 0), "GREEN YELLOW": (173, 255, 47), "GREEN1": (0, 255, 0), "GREEN2": (0, 238, 0), "GREEN3": (0, 205, 0), "GREEN4": (0, 139, 0), "GREENYELLOW": (173, 255, 47), "GREY": (128, 128, 128), "HONEYDEW": (240, 255, 240), "HONEYDEW1": (240, 255, 240), "HONEYDEW2": (224, 238, 224), "HONEYDEW3": (193, 205, 193), "HONEYDEW4": (131, 139, 131), "HOT PINK": (255, 105, 180), "HOTPINK": (255, 105, 180), "HOTPINK1": (255, 110, 180), "HOTPINK2": (238, 106, 167), "HOTPINK3": (205, 96, 144), "HOTPINK4": (139, 58, 98), "INDIAN RED": (205, 92, 92), "INDIANRED": (205, 92, 92), "INDIANRED1": (255, 106, 106), "INDIANRED2": (238, 99, 99), "INDIANRED3": (205, 85, 85), "INDIANRED4": (139, 58, 58), "INDIGO": (75, 0, 130), "IVORY": (255, 255, 240), "IVORY1": (255, 255, 240), "IVORY2": (238, 238, 224), "IVORY3": (205, 205, 193), "IVORY4": (139, 139, 131), "KHAKI": (240, 230, 140), "KHAKI1": (255, 246, 143), "KHAKI2": (238, 230, 133), "KHAKI3": (205, 198, 115), "KHAKI4": (139, 134, 78), "LAVENDER": (230, 230, 250), "LAVENDER BLUSH": (255, 240, 245), "LAVENDERBLUSH": (255, 240, 245), "LAVENDERBLUSH1": (255, 240, 245), "LAVENDERBLUSH2": (238, 224, 229), "LAVENDERBLUSH3": (205, 193, 197), "LAVENDERBLUSH4": (139, 131, 134), "LAWN GREEN": (124, 252, 0), "LAWNGREEN": (124, 252, 0), "LEMON CHIFFON": (255, 250, 205), "LEMONCHIFFON": (255, 250, 205), "LEMONCHIFFON1": (255, 250, 205), "LEMONCHIFFON2": (238, 233, 191), "LEMONCHIFFON3": (205, 201, 165), "LEMONCHIFFON4": (139, 137, 112), "LIGHT BLUE": (173, 216, 230), "LIGHT CORAL": (240, 128, 128), "LIGHT CYAN": (224, 255, 255), "LIGHT GOLDENROD": (238, 221, 130), "LIGHT GOLDENROD YELLOW": (250, 250, 210), "LIGHT GRAY": (211, 211, 211), "LIGHT GREEN": (144, 238, 144), "LIGHT GREY": (211, 211, 211), "LIGHT PINK": (255, 182, 193), "LIGHT SALMON": (255, 160, 122), "LIGHT SEA GREEN": (32, 178, 170), "LIGHT SKY BLUE": (135, 206, 250), "LIGHT SLATE BLUE": (132, 112, 255), "LIGHT SLATE GRAY": (119, 136, 153), "LIGHT SLATE GREY": (119, 136, 153), "LIGHT STEEL BLUE": (176, 196, 222), "LIGHT YELLOW": (255, 255, 224), "LIGHTBLUE": (173, 216, 230), "LIGHTBLUE1": (191, 239, 255), "LIGHTBLUE2": (178, 223, 238), "LIGHTBLUE3": (154, 192, 205), "LIGHTBLUE4": (104, 131, 139), "LIGHTCORAL": (240, 128, 128), "LIGHTCYAN": (224, 255, 255), "LIGHTCYAN1": (224, 255, 255), "LIGHTCYAN2": (209, 238, 238), "LIGHTCYAN3": (180, 205, 205), "LIGHTCYAN4": (122, 139, 139), "LIGHTGOLDENROD": (238, 221, 130), "LIGHTGOLDENROD1": (255, 236, 139), "LIGHTGOLDENROD2": (238, 220, 130), "LIGHTGOLDENROD3": (205, 190, 112), "LIGHTGOLDENROD4": (139, 129, 76), "LIGHTGOLDENRODYELLOW": (250, 250, 210), "LIGHTGRAY": (211, 211, 211), "LIGHTGREEN": (144, 238, 144), "LIGHTGREY": (211, 211, 211), "LIGHTPINK": (255, 182, 193), "LIGHTPINK1": (255, 174, 185), "LIGHTPINK2": (238, 162, 173), "LIGHTPINK3": (205, 140, 149), "LIGHTPINK4": (139, 95, 101), "LIGHTSALMON": (255, 160, 122), "LIGHTSALMON1": (255, 160, 122), "LIGHTSALMON2": (238, 149, 114), "LIGHTSALMON3": (205, 129, 98), "LIGHTSALMON4": (139, 87, 66), "LIGHTSEAGREEN": (32, 178, 170), "LIGHTSKYBLUE": (135, 206, 250), "LIGHTSKYBLUE1": (176, 226, 255), "LIGHTSKYBLUE2": (164, 211, 238), "LIGHTSKYBLUE3": (141, 182, 205), "LIGHTSKYBLUE4": (96, 123, 139), "LIGHTSLATEBLUE": (132, 112, 255), "LIGHTSLATEGRAY": (119, 136, 153), "LIGHTSLATEGREY": (119, 136, 153), "LIGHTSTEELBLUE": (176, 196, 222), "LIGHTSTEELBLUE1": (202, 225, 255), "LIGHTSTEELBLUE2": (188, 210, 238), "LIGHTSTEELBLUE3": (162, 181, 205), "LIGHTSTEELBLUE4": (110, 123, 139), "LIGHTYELLOW": (255, 255, 224), "LIGHTYELLOW1": (255, 255, 224), "LIGHTYELLOW2": (238, 238, 209), "LIGHTYELLOW3": (205, 205, 180), "LIGHTYELLOW4": (139, 139, 122), "LIME": (0, 255, 0), "LIME GREEN": (50, 205, 50), "LIMEGREEN": (50, 205, 50), "LINEN": (250, 240, 230), "MAGENTA": (255, 0, 255), "MAGENTA1": (255, 0, 255), "MAGENTA2": (238, 0, 238), "MAGENTA3": (205, 0, 205), "MAGENTA4": (139, 0, 139), "MAROON": (128, 0, 0), "MAROON1": (255, 52, 179), "MAROON2": (238, 48, 167), "MAROON3": (205, 41, 144), "MAROON4": (139, 28, 98), "MEDIUM AQUAMARINE": (102, 205, 170), "MEDIUM BLUE": (0, 0, 205), "MEDIUM ORCHID": (186, 85, 211), "MEDIUM PURPLE": (147, 112, 219), "MEDIUM SEA GREEN": (60, 179, 113), "MEDIUM SLATE BLUE": (123, 104, 238), "MEDIUM SPRING GREEN": (0, 250, 154), "MEDIUM TURQUOISE": (72, 209, 204), "MEDIUM VIOLET RED": (199, 21, 133), "MEDIUMAQUAMARINE": (102, 205, 170), "MEDIUMBLUE": (0, 0, 205), "MEDIUMORCHID": (186, 85, 211), "MEDIUMORCHID1": (224, 102, 255), "MEDIUMORCHID2": (209, 95, 238), "MEDIUMORCHID3": (180, 82, 205), "MEDIUMORCHID4": (122, 55, 139), "MEDIUMPURPLE": (147, 112, 219), "MEDIUMPURPLE1": (171, 130, 255), "MEDIUMPURPLE2": (159, 121, 238), "MEDIUMPURPLE3": (137, 104, 205), "MEDIUMPURPLE4": (93, 71, 139), "MEDIUMSEAGREEN": (60, 179, 113), "MEDIUMSLATEBLUE": (123, 104, 238), "MEDIUMSPRINGGREEN": (0, 250, 154), "MEDIUMTURQUOISE": (72, 209, 204), "MEDIUMVIOLETRED": (199, 21, 133), "MIDNIGHT BLUE": (25, 25, 112), "MIDNIGHTBLUE": (25, 25, 112), "MINT CREAM": (245, 255, 250), "MINTCREAM": (245, 255, 250), "MISTY ROSE": (255, 228, 225), "MISTYROSE": (255, 228, 225), "MISTYROSE1": (255, 228, 225), "MISTYROSE2": (238, 213, 210), "MISTYROSE3": (205, 183, 181), "MISTYROSE4": (139, 125, 123), "MOCCASIN": (255, 228, 181), "NAVAJO WHITE": (255, 222, 173), "NAVAJOWHITE": (255, 222, 173), "NAVAJOWHITE1": (255, 222, 173), "NAVAJOWHITE2": (238, 207, 161), "NAVAJOWHITE3": (205, 179, 139), "NAVAJOWHITE4": (139, 121, 94), "NAVY": (0, 0, 128), "NAVY BLUE": (0, 0, 128), "NAVYBLUE": (0, 0, 128), "OLD LACE": (253, 245, 230), "OLDLACE": (253, 245, 230), "OLIVE": (128, 128, 0), "OLIVE DRAB": (107, 142, 35), "OLIVEDRAB": (107, 142, 35), "OLIVEDRAB1": (192, 255, 62), "OLIVEDRAB2": (179, 238, 58), "OLIVEDRAB3": (154, 205, 50), "OLIVEDRAB4": (105, 139, 34), "ORANGE": (255, 165, 0), "ORANGE RED": (255, 69, 0), "ORANGE1": (255, 165, 0), "ORANGE2": (238, 154, 0), "ORANGE3": (205, 133, 0), "ORANGE4": (139, 90, 0), "ORANGERED": (255, 69, 0), "ORANGERED1": (255, 69, 0), "ORANGERED2": (238, 64, 0), "ORANGERED3": (205, 55, 0), "ORANGERED4": (139, 37, 0), "ORCHID": (218, 112, 214), "ORCHID1": (255, 131, 250), "ORCHID2": (238, 122, 233), "ORCHID3": (205, 105, 201), "ORCHID4": (139, 71, 137), "PALE GOLDENROD": (238, 232, 170), "PALE GREEN": (152, 251, 152), "PALE TURQUOISE": (175, 238, 238), "PALE VIOLET RED": (219, 112, 147), "PALEGOLDENROD": (238, 232, 170), "PALEGREEN": (152, 251, 152), "PALEGREEN1": (154, 255, 154), "PALEGREEN2": (144, 238, 144), "PALEGREEN3": (124, 205, 124), "PALEGREEN4": (84, 139, 84), "PALETURQUOISE": (175, 238, 238), "PALETURQUOISE1": (187, 255, 255), "PALETURQUOISE2": (174, 238, 238), "PALETURQUOISE3": (150, 205, 205), "PALETURQUOISE4": (102, 139, 139), "PALEVIOLETRED": (219, 112, 147), "PALEVIOLETRED1": (255, 130, 171), "PALEVIOLETRED2": (238, 121, 159), "PALEVIOLETRED3": (205, 104, 137), "PALEVIOLETRED4": (139, 71, 93), "PAPAYA WHIP": (255, 239, 213), "PAPAYAWHIP": (255, 239, 213), "PEACH PUFF": (255, 218, 185), "PEACHPUFF": (255, 218, 185), "PEACHPUFF1": (255, 218, 185), "PEACHPUFF2": (238, 203, 173), "PEACHPUFF3": (205, 175, 149), "PEACHPUFF4": (139, 119, 101), "PERU": (205, 133, 63), "PINK": (255, 192, 203), "PINK1": (255, 181, 197), "PINK2": (238, 169, 184), "PINK3": (205, 145, 158), "PINK4": (139, 99, 108), "PLUM": (221, 160, 221), "PLUM1": (255, 187, 255), "PLUM2": (238, 174, 238), "PLUM3": (205, 150, 205), "PLUM4": (139, 102, 139), "POWDER BLUE": (176, 224, 230), "POWDERBLUE": (176, 224, 230), "PURPLE": (128, 0, 128), "PURPLE1": (155, 48, 255), "PURPLE2": (145, 44, 238), "PURPLE3": (125, 38, 205), "PURPLE4": (85, 26, 139), "RED": (255, 0, 0), "RED1": (255, 0, 0), "RED2": (238, 0, 0), "RED3": (205, 0, 0), "RED4": (139, 0, 0), "ROSY BROWN": (188, 143, 143), "ROSYBROWN": (188, 143, 143), "ROSYBROWN1": (255, 193, 193), "ROSYBROWN2": (238, 180, 180), "ROSYBROWN3": (205, 155, 155), "ROSYBROWN4": (139, 105, 105), "ROYAL BLUE": (65, 105, 225), "ROYALBLUE": (65, 105, 225), "ROYALBLUE1": (72, 118, 255), "ROYALBLUE2": (67, 110, 238), "ROYALBLUE3": (58, 95, 205), "ROYALBLUE4": (39, 64, 139), "SADDLE BROWN": (139, 69, 19), "SADDLEBROWN": (139, 69, 19), "SALMON": (250, 128, 114), "SALMON1": (255, 140, 105), "SALMON2": (238, 130, 98), "SALMON3": (205, 112, 84), "SALMON4": (139, 76, 57), "SANDY BROWN": (244, 164, 96), "SANDYBROWN": (244, 164, 96), "SEA GREEN": (46, 139, 87), "SEAGREEN": (46, 139, 87), "SEAGREEN1": (84, 255, 159), "SEAGREEN2": (78, 238, 148), "SEAGREEN3": (67, 205, 128), "SEAGREEN4": (46, 139, 87), "SEASHELL": (255, 245, 238), "SEASHELL1": (255, 245, 238), "SEASHELL2": (238, 229, 222), "SEASHELL3": (205, 197, 191), "SEASHELL4": (139, 134, 130), "SIENNA": (160, 82, 45), "SIENNA1": (255, 130, 71), "SIENNA2": (238, 121, 66), "SIENNA3": (205, 104, 57), "SIENNA4": (139, 71, 38), "SILVER": (192, 192, 192), "SKY BLUE": (135, 206, 235), "SKYBLUE": (135, 206, 235), "SKYBLUE1": (135, 206, 255), "SKYBLUE2": (126, 192, 238), "SKYBLUE3": (108, 166, 205), "SKYBLUE4": (74, 112, 139), "SLATE BLUE": (106, 90, 205), "SLATE GRAY": (112, 128, 144), "SLATE GREY": (112, 128, 144), "SLATEBLUE": (106, 90, 205), "SLATEBLUE1": (131, 111, 255), "SLATEBLUE2": (122, 103, 238), "SLATEBLUE3": (105, 89, 205), "SLATEBLUE4": (71, 60, 139), "SLATEGRAY": (112, 128, 144), "SLATEGRAY1": (198, 226, 255), "SLATEGRAY2": (185, 211, 238), "SLATEGRAY3": (159, 182, 205), "SLATEGRAY4": (108, 123, 139), "SLATEGREY": (112, 128, 144), "SNOW": (255, 250, 250), "SNOW1": (255, 250, 250), "SNOW2": (238, 233, 233), "SNOW3": (205, 201, 201), "SNOW4": (139, 137, 137), "SPRING GREEN": (0, 255, 127), "SPRINGGREEN": (0, 255, 127), "SPRINGGREEN1": (0, 255, 127), "SPRINGGREEN2": (0, 238, 118), "SPRINGGREEN3": (0, 205, 102), "SPRINGGREEN4": (0, 139, 69), "STEEL BLUE": (70, 130, 180), "STEELBLUE": (70, 130, 180), "STEELBLUE1": (99, 184, 255), "STEELBLUE2": (92, 172, 238), "STEELBLUE3": (79, 148, 205), "STEELBLUE4": (54, 100, 139), "TAN": (210, 180, 140), "TAN1": (255, 165, 79), "TAN2": (238, 154, 73), "TAN3": (205, 133, 63), "TAN4": (139, 90, 43), "TEAL": (0, 128, 128), "THISTLE": (216, 191, 216), "THISTLE1": (255, 225, 255), "THISTLE2": (238, 210, 238), "THISTLE3": (205, 181, 205), "THISTLE4": (139, 123, 139), "TOMATO": (255, 99, 71), "TOMATO1": (255, 99, 71), "TOMATO2": (238, 92, 66), "TOMATO3": (205, 79, 57), "TOMATO4": (139, 54, 38), "TURQUOISE": (64, 224, 208), "TURQUOISE1": (0, 245, 255), "TURQUOISE2": (0, 229, 238), "TURQUOISE3": (0, 197, 205), "TURQUOISE4": (0, 134, 139), "VIOLET": (238, 130, 238), "VIOLET RED": (208, 32, 144), "VIOLETRED": (208, 32, 144), "VIOLETRED1": (255, 62, 150), "VIOLETRED2": (238, 58, 140), "VIOLETRED3": (205, 50, 120), "VIOLETRED4": (139, 34, 82), "WHEAT": (245, 222, 179), "WHEAT1": (255, 231, 186), "WHEAT2": (238, 216, 174), "WHEAT3": (205, 186, 150), "WHEAT4": (139, 126, 102), "WHITE": (255, 255, 255), "WHITE SMOKE": (245, 245, 245), "WHITESMOKE": (245, 245, 245), "YELLOW": (255, 255, 0), "YELLOW GREEN": (154, 205, 50), "YELLOW1": (255, 255, 0), "YELLOW2": (238, 238, 0), "YELLOW3": (205, 205, 0), "YELLOW4": (139, 139, 0), "YELLOWGREEN": (154, 205, 50)}
-CURSORS = {"": pygame.SYSTEM_CURSOR_ARROW, "arrow": pygame.SYSTEM_CURSOR_ARROW, "i_beam": pygame.SYSTEM_CURSOR_IBEAM, "wait": pygame.SYSTEM_CURSOR_WAIT, "crosshair": pygame.SYSTEM_CURSOR_CROSSHAIR, "small_wait": pygame.SYSTEM_CURSOR_WAITARROW, "size_nw_se": pygame.SYSTEM_CURSOR_SIZENWSE, "size_ne_sw": pygame.SYSTEM_CURSOR_SIZENESW, "size_e_w": pygame.SYSTEM_CURSOR_SIZEWE, "size_n_s": pygame.SYSTEM_CURSOR_SIZENS, "size_all": pygame.SYSTEM_CURSOR_SIZEALL, "no": pygame.SYSTEM_CURSOR_NO, "hand": pygame.SYSTEM_CURSOR_HAND}
-EVENT_MODS = {pygame.KMOD_LSHIFT: ("Shift", "L_Shift"), pygame.KMOD_RSHIFT: ("Shift", "R_Shift"), pygame.KMOD_SHIFT: ("Shift", ), pygame.KMOD_CAPS: ("CapsLock", ), pygame.KMOD_LCTRL: ("Control", "L_Control"), pygame.KMOD_RCTRL: ("Control", "R_Control"), pygame.KMOD_CTRL: ("Control", ), pygame.KMOD_LALT: ("Alt", ), pygame.KMOD_RALT: ("Alt", ), pygame.KMOD_ALT: ("Alt", ), pygame.KMOD_NUM: ("NumLock", )}
+FONTS = {} # {(name, size, ...): pygame.font.Font}
+_FOUND_COLOURS = {} # {name: (r, g, b) or None} (the names used so far)
+
+
+# The big tables (`COLOURS`, `CURSORS` and `EVENT_MODS`) are only built the
+# first time that they are needed. After that they are normal globals.
+# `parse_colour` doesn't need `COLOURS` (look at `_find_colour`)
+def _get_table(name:str) -> dict:
+    table = globals().get(name, None)
+    if table is None:
+        table = globals()[name] = _TABLE_BUILDERS[name]()
+    return table
+
+def __getattr__(name:str):
+    if name in _TABLE_BUILDERS:
+        return _get_table(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# "NAME:r,g,b" for each colour. Kept as one string so importing doesn't
+# build a big dict. Look at `_find_colour`
+_COLOUR_DATA = ";ALICE BLUE:240,248,255;ALICEBLUE:240,248,255;ANTIQUE WHITE:250,235,215;ANTIQUEWHITE:250,235,215;ANTIQUEWHITE1:255,239,219;ANTIQUEWHITE2:238,223,204;ANTIQUEWHITE3:205,192,176;ANTIQUEWHITE4:139,131,120;AQUAMARINE:127,255,212;AQUAMARINE1:127,255,212;AQUAMARINE2:118,238,198;AQUAMARINE3:102,205,170;AQUAMARINE4:69,139,116;AZURE:240,255,255;AZURE1:240,255,255;AZURE2:224,238,238;AZURE3:193,205,205;AZURE4:131,139,139;BEIGE:245,245,220;BISQUE:255,228,196;BISQUE1:255,228,196;BISQUE2:238,213,183;BISQUE3:205,183,158;BISQUE4:139,125,107;BLACK:0,0,0;BLANCHED ALMOND:255,235,205;BLANCHEDALMOND:255,235,205;BLUE:0,0,255;BLUE VIOLET:138,43,226;BLUE1:0,0,255;BLUE2:0,0,238;BLUE3:0,0,205;BLUE4:0,0,139;BLUEVIOLET:138,43,226;BROWN:165,42,42;BROWN1:255,64,64;BROWN2:238,59,59;BROWN3:205,51,51;BROWN4:139,35,35;BURLYWOOD:222,184,135;BURLYWOOD1:255,211,155;BURLYWOOD2:238,197,145;BURLYWOOD3:205,170,125;BURLYWOOD4:139,115,85;CADET BLUE:95,158,160;CADETBLUE:95,158,160;CADETBLUE1:152,245,255;CADETBLUE2:142,229,238;CADETBLUE3:122,197,205;CADETBLUE4:83,134,139;CHARTREUSE:127,255,0;CHARTREUSE1:127,255,0;CHARTREUSE2:118,238,0;CHARTREUSE3:102,205,0;CHARTREUSE4:69,139,0;CHOCOLATE:210,105,30;CHOCOLATE1:255,127,36;CHOCOLATE2:238,118,33;CHOCOLATE3:205,102,29;CHOCOLATE4:139,69,19;CORAL:255,127,80;CORAL1:255,114,86;CORAL2:238,106,80;CORAL3:205,91,69;CORAL4:139,62,47;CORNFLOWER BLUE:100,149,237;CORNFLOWERBLUE:100,149,237;CORNSILK:255,248,220;CORNSILK1:255,248,220;CORNSILK2:238,232,205;CORNSILK3:205,200,177;CORNSILK4:139,136,120;CYAN:0,255,255;CYAN1:0,255,255;CYAN2:0,238,238;CYAN3:0,205,205;CYAN4:0,139,139;DARK BLUE:0,0,139;DARK CYAN:0,139,139;DARK GOLDENROD:184,134,11;DARK GRAY:169,169,169;DARK GREEN:0,100,0;DARK GREY:169,169,169;DARK KHAKI:189,183,107;DARK MAGENTA:139,0,139;DARK OLIVE GREEN:85,107,47;DARK ORANGE:255,140,0;DARK ORCHID:153,50,204;DARK RED:139,0,0;DARK SALMON:233,150,122;DARK SEA GREEN:143,188,143;DARK SLATE BLUE:72,61,139;DARK SLATE GRAY:47,79,79;DARK SLATE GREY:47,79,79;DARK TURQUOISE:0,206,209;DARK VIOLET:148,0,211;DARKBLUE:0,0,139;DARKCYAN:0,139,139;DARKGOLDENROD:184,134,11;DARKGOLDENROD1:255,185,15;DARKGOLDENROD2:238,173,14;DARKGOLDENROD3:205,149,12;DARKGOLDENROD4:139,101,8;DARKGRAY:169,169,169;DARKGREEN:0,100,0;DARKGREY:169,169,169;DARKKHAKI:189,183,107;DARKMAGENTA:139,0,139;DARKOLIVEGREEN:85,107,47;DARKOLIVEGREEN1:202,255,112;DARKOLIVEGREEN2:188,238,104;DARKOLIVEGREEN3:162,205,90;DARKOLIVEGREEN4:110,139,61;DARKORANGE:255,140,0;DARKORANGE1:255,127,0;DARKORANGE2:238,118,0;DARKORANGE3:205,102,0;DARKORANGE4:139,69,0;DARKORCHID:153,50,204;DARKORCHID1:191,62,255;DARKORCHID2:178,58,238;DARKORCHID3:154,50,205;DARKORCHID4:104,34,139;DARKRED:139,0,0;DARKSALMON:233,150,122;DARKSEAGREEN:143,188,143;DARKSEAGREEN1:193,255,193;DARKSEAGREEN2:180,238,180;DARKSEAGREEN3:155,205,155;DARKSEAGREEN4:105,139,105;DARKSLATEBLUE:72,61,139;DARKSLATEGRAY:47,79,79;DARKSLATEGRAY1:151,255,255;DARKSLATEGRAY2:141,238,238;DARKSLATEGRAY3:121,205,205;DARKSLATEGRAY4:82,139,139;DARKSLATEGREY:47,79,79;DARKTURQUOISE:0,206,209;DARKVIOLET:148,0,211;DEEP PINK:255,20,147;DEEP SKY BLUE:0,191,255;DEEPPINK:255,20,147;DEEPPINK1:255,20,147;DEEPPINK2:238,18,137;DEEPPINK3:205,16,118;DEEPPINK4:139,10,80;DEEPSKYBLUE:0,191,255;DEEPSKYBLUE1:0,191,255;DEEPSKYBLUE2:0,178,238;DEEPSKYBLUE3:0,154,205;DEEPSKYBLUE4:0,104,139;DIM GRAY:105,105,105;DIM GREY:105,105,105;DIMGRAY:105,105,105;DIMGREY:105,105,105;DODGER BLUE:30,144,255;DODGERBLUE:30,144,255;DODGERBLUE1:30,144,255;DODGERBLUE2:28,134,238;DODGERBLUE3:24,116,205;DODGERBLUE4:16,78,139;FIREBRICK:178,34,34;FIREBRICK1:255,48,48;FIREBRICK2:238,44,44;FIREBRICK3:205,38,38;FIREBRICK4:139,26,26;FLORAL WHITE:255,250,240;FLORALWHITE:255,250,240;FOREST GREEN:34,139,34;FORESTGREEN:34,139,34;FUCHSIA:255,0,255;GAINSBORO:220,220,220;GHOST WHITE:248,248,255;GHOSTWHITE:248,248,255;GOLD:255,215,0;GOLD1:255,215,0;GOLD2:238,201,0;GOLD3:205,173,0;GOLD4:139,117,0;GOLDENROD:218,165,32;GOLDENROD1:255,193,37;GOLDENROD2:238,180,34;GOLDENROD3:205,155,29;GOLDENROD4:139,105,20;GRAY:128,128,128;GREEN:0,128,0;GREEN YELLOW:173,255,47;GREEN1:0,255,0;GREEN2:0,238,0;GREEN3:0,205,0;GREEN4:0,139,0;GREENYELLOW:173,255,47;GREY:128,128,128;HONEYDEW:240,255,240;HONEYDEW1:240,255,240;HONEYDEW2:224,238,224;HONEYDEW3:193,205,193;HONEYDEW4:131,139,131;HOT PINK:255,105,180;HOTPINK:255,105,180;HOTPINK1:255,110,180;HOTPINK2:238,106,167;HOTPINK3:205,96,144;HOTPINK4:139,58,98;INDIAN RED:205,92,92;INDIANRED:205,92,92;INDIANRED1:255,106,106;INDIANRED2:238,99,99;INDIANRED3:205,85,85;INDIANRED4:139,58,58;INDIGO:75,0,130;IVORY:255,255,240;IVORY1:255,255,240;IVORY2:238,238,224;IVORY3:205,205,193;IVORY4:139,139,131;KHAKI:240,230,140;KHAKI1:255,246,143;KHAKI2:238,230,133;KHAKI3:205,198,115;KHAKI4:139,134,78;LAVENDER:230,230,250;LAVENDER BLUSH:255,240,245;LAVENDERBLUSH:255,240,245;LAVENDERBLUSH1:255,240,245;LAVENDERBLUSH2:238,224,229;LAVENDERBLUSH3:205,193,197;LAVENDERBLUSH4:139,131,134;LAWN GREEN:124,252,0;LAWNGREEN:124,252,0;LEMON CHIFFON:255,250,205;LEMONCHIFFON:255,250,205;LEMONCHIFFON1:255,250,205;LEMONCHIFFON2:238,233,191;LEMONCHIFFON3:205,201,165;LEMONCHIFFON4:139,137,112;LIGHT BLUE:173,216,230;LIGHT CORAL:240,128,128;LIGHT CYAN:224,255,255;LIGHT GOLDENROD:238,221,130;LIGHT GOLDENROD YELLOW:250,250,210;LIGHT GRAY:211,211,211;LIGHT GREEN:144,238,144;LIGHT GREY:211,211,211;LIGHT PINK:255,182,193;LIGHT SALMON:255,160,122;LIGHT SEA GREEN:32,178,170;LIGHT SKY BLUE:135,206,250;LIGHT SLATE BLUE:132,112,255;LIGHT SLATE GRAY:119,136,153;LIGHT SLATE GREY:119,136,153;LIGHT STEEL BLUE:176,196,222;LIGHT YELLOW:255,255,224;LIGHTBLUE:173,216,230;LIGHTBLUE1:191,239,255;LIGHTBLUE2:178,223,238;LIGHTBLUE3:154,192,205;LIGHTBLUE4:104,131,139;LIGHTCORAL:240,128,128;LIGHTCYAN:224,255,255;LIGHTCYAN1:224,255,255;LIGHTCYAN2:209,238,238;LIGHTCYAN3:180,205,205;LIGHTCYAN4:122,139,139;LIGHTGOLDENROD:238,221,130;LIGHTGOLDENROD1:255,236,139;LIGHTGOLDENROD2:238,220,130;LIGHTGOLDENROD3:205,190,112;LIGHTGOLDENROD4:139,129,76;LIGHTGOLDENRODYELLOW:250,250,210;LIGHTGRAY:211,211,211;LIGHTGREEN:144,238,144;LIGHTGREY:211,211,211;LIGHTPINK:255,182,193;LIGHTPINK1:255,174,185;LIGHTPINK2:238,162,173;LIGHTPINK3:205,140,149;LIGHTPINK4:139,95,101;LIGHTSALMON:255,160,122;LIGHTSALMON1:255,160,122;LIGHTSALMON2:238,149,114;LIGHTSALMON3:205,129,98;LIGHTSALMON4:139,87,66;LIGHTSEAGREEN:32,178,170;LIGHTSKYBLUE:135,206,250;LIGHTSKYBLUE1:176,226,255;LIGHTSKYBLUE2:164,211,238;LIGHTSKYBLUE3:141,182,205;LIGHTSKYBLUE4:96,123,139;LIGHTSLATEBLUE:132,112,255;LIGHTSLATEGRAY:119,136,153;LIGHTSLATEGREY:119,136,153;LIGHTSTEELBLUE:176,196,222;LIGHTSTEELBLUE1:202,225,255;LIGHTSTEELBLUE2:188,210,238;LIGHTSTEELBLUE3:162,181,205;LIGHTSTEELBLUE4:110,123,139;LIGHTYELLOW:255,255,224;LIGHTYELLOW1:255,255,224;LIGHTYELLOW2:238,238,209;LIGHTYELLOW3:205,205,180;LIGHTYELLOW4:139,139,122;LIME:0,255,0;LIME GREEN:50,205,50;LIMEGREEN:50,205,50;LINEN:250,240,230;MAGENTA:255,0,255;MAGENTA1:255,0,255;MAGENTA2:238,0,238;MAGENTA3:205,0,205;MAGENTA4:139,0,139;MAROON:128,0,0;MAROON1:255,52,179;MAROON2:238,48,167;MAROON3:205,41,144;MAROON4:139,28,98;MEDIUM AQUAMARINE:102,205,170;MEDIUM BLUE:0,0,205;MEDIUM ORCHID:186,85,211;MEDIUM PURPLE:147,112,219;MEDIUM SEA GREEN:60,179,113;MEDIUM SLATE BLUE:123,104,238;MEDIUM SPRING GREEN:0,250,154;MEDIUM TURQUOISE:72,209,204;MEDIUM VIOLET RED:199,21,133;MEDIUMAQUAMARINE:102,205,170;MEDIUMBLUE:0,0,205;MEDIUMORCHID:186,85,211;MEDIUMORCHID1:224,102,255;MEDIUMORCHID2:209,95,238;MEDIUMORCHID3:180,82,205;MEDIUMORCHID4:122,55,139;MEDIUMPURPLE:147,112,219;MEDIUMPURPLE1:171,130,255;MEDIUMPURPLE2:159,121,238;MEDIUMPURPLE3:137,104,205;MEDIUMPURPLE4:93,71,139;MEDIUMSEAGREEN:60,179,113;MEDIUMSLATEBLUE:123,104,238;MEDIUMSPRINGGREEN:0,250,154;MEDIUMTURQUOISE:72,209,204;MEDIUMVIOLETRED:199,21,133;MIDNIGHT BLUE:25,25,112;MIDNIGHTBLUE:25,25,112;MINT CREAM:245,255,250;MINTCREAM:245,255,250;MISTY ROSE:255,228,225;MISTYROSE:255,228,225;MISTYROSE1:255,228,225;MISTYROSE2:238,213,210;MISTYROSE3:205,183,181;MISTYROSE4:139,125,123;MOCCASIN:255,228,181;NAVAJO WHITE:255,222,173;NAVAJOWHITE:255,222,173;NAVAJOWHITE1:255,222,173;NAVAJOWHITE2:238,207,161;NAVAJOWHITE3:205,179,139;NAVAJOWHITE4:139,121,94;NAVY:0,0,128;NAVY BLUE:0,0,128;NAVYBLUE:0,0,128;OLD LACE:253,245,230;OLDLACE:253,245,230;OLIVE:128,128,0;OLIVE DRAB:107,142,35;OLIVEDRAB:107,142,35;OLIVEDRAB1:192,255,62;OLIVEDRAB2:179,238,58;OLIVEDRAB3:154,205,50;OLIVEDRAB4:105,139,34;ORANGE:255,165,0;ORANGE RED:255,69,0;ORANGE1:255,165,0;ORANGE2:238,154,0;ORANGE3:205,133,0;ORANGE4:139,90,0;ORANGERED:255,69,0;ORANGERED1:255,69,0;ORANGERED2:238,64,0;ORANGERED3:205,55,0;ORANGERED4:139,37,0;ORCHID:218,112,214;ORCHID1:255,131,250;ORCHID2:238,122,233;ORCHID3:205,105,201;ORCHID4:139,71,137;PALE GOLDENROD:238,232,170;PALE GREEN:152,251,152;PALE TURQUOISE:175,238,238;PALE VIOLET RED:219,112,147;PALEGOLDENROD:238,232,170;PALEGREEN:152,251,152;PALEGREEN1:154,255,154;PALEGREEN2:144,238,144;PALEGREEN3:124,205,124;PALEGREEN4:84,139,84;PALETURQUOISE:175,238,238;PALETURQUOISE1:187,255,255;PALETURQUOISE2:174,238,238;PALETURQUOISE3:150,205,205;PALETURQUOISE4:102,139,139;PALEVIOLETRED:219,112,147;PALEVIOLETRED1:255,130,171;PALEVIOLETRED2:238,121,159;PALEVIOLETRED3:205,104,137;PALEVIOLETRED4:139,71,93;PAPAYA WHIP:255,239,213;PAPAYAWHIP:255,239,213;PEACH PUFF:255,218,185;PEACHPUFF:255,218,185;PEACHPUFF1:255,218,185;PEACHPUFF2:238,203,173;PEACHPUFF3:205,175,149;PEACHPUFF4:139,119,101;PERU:205,133,63;PINK:255,192,203;PINK1:255,181,197;PINK2:238,169,184;PINK3:205,145,158;PINK4:139,99,108;PLUM:221,160,221;PLUM1:255,187,255;PLUM2:238,174,238;PLUM3:205,150,205;PLUM4:139,102,139;POWDER BLUE:176,224,230;POWDERBLUE:176,224,230;PURPLE:128,0,128;PURPLE1:155,48,255;PURPLE2:145,44,238;PURPLE3:125,38,205;PURPLE4:85,26,139;RED:255,0,0;RED1:255,0,0;RED2:238,0,0;RED3:205,0,0;RED4:139,0,0;ROSY BROWN:188,143,143;ROSYBROWN:188,143,143;ROSYBROWN1:255,193,193;ROSYBROWN2:238,180,180;ROSYBROWN3:205,155,155;ROSYBROWN4:139,105,105;ROYAL BLUE:65,105,225;ROYALBLUE:65,105,225;ROYALBLUE1:72,118,255;ROYALBLUE2:67,110,238;ROYALBLUE3:58,95,205;ROYALBLUE4:39,64,139;SADDLE BROWN:139,69,19;SADDLEBROWN:139,69,19;SALMON:250,128,114;SALMON1:255,140,105;SALMON2:238,130,98;SALMON3:205,112,84;SALMON4:139,76,57;SANDY BROWN:244,164,96;SANDYBROWN:244,164,96;SEA GREEN:46,139,87;SEAGREEN:46,139,87;SEAGREEN1:84,255,159;SEAGREEN2:78,238,148;SEAGREEN3:67,205,128;SEAGREEN4:46,139,87;SEASHELL:255,245,238;SEASHELL1:255,245,238;SEASHELL2:238,229,222;SEASHELL3:205,197,191;SEASHELL4:139,134,130;SIENNA:160,82,45;SIENNA1:255,130,71;SIENNA2:238,121,66;SIENNA3:205,104,57;SIENNA4:139,71,38;SILVER:192,192,192;SKY BLUE:135,206,235;SKYBLUE:135,206,235;SKYBLUE1:135,206,255;SKYBLUE2:126,192,238;SKYBLUE3:108,166,205;SKYBLUE4:74,112,139;SLATE BLUE:106,90,205;SLATE GRAY:112,128,144;SLATE GREY:112,128,144;SLATEBLUE:106,90,205;SLATEBLUE1:131,111,255;SLATEBLUE2:122,103,238;SLATEBLUE3:105,89,205;SLATEBLUE4:71,60,139;SLATEGRAY:112,128,144;SLATEGRAY1:198,226,255;SLATEGRAY2:185,211,238;SLATEGRAY3:159,182,205;SLATEGRAY4:108,123,139;SLATEGREY:112,128,144;SNOW:255,250,250;SNOW1:255,250,250;SNOW2:238,233,233;SNOW3:205,201,201;SNOW4:139,137,137;SPRING GREEN:0,255,127;SPRINGGREEN:0,255,127;SPRINGGREEN1:0,255,127;SPRINGGREEN2:0,238,118;SPRINGGREEN3:0,205,102;SPRINGGREEN4:0,139,69;STEEL BLUE:70,130,180;STEELBLUE:70,130,180;STEELBLUE1:99,184,255;STEELBLUE2:92,172,238;STEELBLUE3:79,148,205;STEELBLUE4:54,100,139;TAN:210,180,140;TAN1:255,165,79;TAN2:238,154,73;TAN3:205,133,63;TAN4:139,90,43;TEAL:0,128,128;THISTLE:216,191,216;THISTLE1:255,225,255;THISTLE2:238,210,238;THISTLE3:205,181,205;THISTLE4:139,123,139;TOMATO:255,99,71;TOMATO1:255,99,71;TOMATO2:238,92,66;TOMATO3:205,79,57;TOMATO4:139,54,38;TURQUOISE:64,224,208;TURQUOISE1:0,245,255;TURQUOISE2:0,229,238;TURQUOISE3:0,197,205;TURQUOISE4:0,134,139;VIOLET:238,130,238;VIOLET RED:208,32,144;VIOLETRED:208,32,144;VIOLETRED1:255,62,150;VIOLETRED2:238,58,140;VIOLETRED3:205,50,120;VIOLETRED4:139,34,82;WHEAT:245,222,179;WHEAT1:255,231,186;WHEAT2:238,216,174;WHEAT3:205,186,150;WHEAT4:139,126,102;WHITE:255,255,255;WHITE SMOKE:245,245,245;WHITESMOKE:245,245,245;YELLOW:255,255,0;YELLOW GREEN:154,205,50;YELLOW1:255,255,0;YELLOW2:238,238,0;YELLOW3:205,205,0;YELLOW4:139,139,0;YELLOWGREEN:154,205,50;"
+
+def _find_colour(name:str) -> (int, int, int):
+    # Only parses the colour that is needed (`name` must be upper case)
+    start = _COLOUR_DATA.find(f";{name}:")
+    if start == -1:
+        return None
+    start += len(name) + 2
+    end = _COLOUR_DATA.index(";", start)
+    return tuple(map(int, _COLOUR_DATA[start:end].split(",")))
+
+def _build_colours() -> dict:
+    # Only used for `constants.COLOURS`
+    output = {}
+    for item in _COLOUR_DATA.strip(";").split(";"):
+        name, values = item.split(":")
+        output[name] = tuple(map(int, values.split(",")))
+    return output
+
+def _build_cursors() -> dict:
+    return {"": pygame.SYSTEM_CURSOR_ARROW, "arrow": pygame.SYSTEM_CURSOR_ARROW, "i_beam": pygame.SYSTEM_CURSOR_IBEAM, "wait": pygame.SYSTEM_CURSOR_WAIT, "crosshair": pygame.SYSTEM_CURSOR_CROSSHAIR, "small_wait": pygame.SYSTEM_CURSOR_WAITARROW, "size_nw_se": pygame.SYSTEM_CURSOR_SIZENWSE, "size_ne_sw": pygame.SYSTEM_CURSOR_SIZENESW, "size_e_w": pygame.SYSTEM_CURSOR_SIZEWE, "size_n_s": pygame.SYSTEM_CURSOR_SIZENS, "size_all": pygame.SYSTEM_CURSOR_SIZEALL, "no": pygame.SYSTEM_CURSOR_NO, "hand": pygame.SYSTEM_CURSOR_HAND}
+
+def _build_event_mods() -> dict:
+    return {pygame.KMOD_LSHIFT: ("Shift", "L_Shift"), pygame.KMOD_RSHIFT: ("Shift", "R_Shift"), pygame.KMOD_SHIFT: ("Shift", ), pygame.KMOD_CAPS: ("CapsLock", ), pygame.KMOD_LCTRL: ("Control", "L_Control"), pygame.KMOD_RCTRL: ("Control", "R_Control"), pygame.KMOD_CTRL: ("Control", ), pygame.KMOD_LALT: ("Alt", ), pygame.KMOD_RALT: ("Alt", ), pygame.KMOD_ALT: ("Alt", ), pygame.KMOD_NUM: ("NumLock", )}
+
+_TABLE_BUILDERS = {"COLOURS": _build_colours, "CURSORS": _build_cursors,
+                   "EVENT_MODS": _build_event_mods}
@@ -13,7 +13,8 @@ class PyGameEventSubstitute:
 class Event:
     def __init__(self, event, widget):
         self.num = 0
-        self.x, self.y = pygame.mouse.get_pos()
+        # Replayed events must use their own position (not the mouse's)
+        self.x, self.y = getattr(event, "pos", None) or pygame.mouse.get_pos()
         self.char = None
         self.widget = widget
 
@@ -56,7 +57,7 @@ class Event:
     def get_char_from_event(self, event:pygame.event.Event) -> (str, str):
         self.mods = event.mod
         if event.key == pygame.K_DELETE:
-            return "Delete", "<Delete>"
+            return "Delete", ("<Delete>", )
         if event.key == pygame.K_KP0:
             return "0", None
         if event.key == pygame.K_KP1:
@@ -85,6 +86,10 @@ class Event:
             return "Left", ("<Left>", )
         if event.key == pygame.K_RIGHT:
             return "Right", ("<Right>", )
+        if event.key == pygame.K_HOME:
+            return "Home", ("<Home>", )
+        if event.key == pygame.K_END:
+            return "End", ("<End>", )
 
         char = event.unicode
         if char == "\x1b":
@@ -94,7 +99,8 @@ class Event:
         if char == "\t":
             return char, ("<Tab>", )
         if char == "\r":
-            return char, ("<Enter>", )
+            # Not "<Enter>" because that's when the mouse enters a widget
+            return char, ("<Return>", )
         if char == " ":
             return char, ("<space>", )
         if (len(char) > 0) and (1 <= ord(char) <= 26):
@@ -1,3 +1,4 @@
+from __future__ import annotations
 import pygame
 
 
@@ -20,6 +21,40 @@ def pretty_print_table(table:[(str, str, ...), (str, str, ...), ...]) -> str:
     return output.rstrip("\n")
 
 
+class PositionGeneration:
+    """
+    Widgets store their `_x` and `_y` relative to their master. Absolute
+    positions are derived from those and cached inside every widget along
+    with the value of this counter. Moving any widget bumps the counter,
+    which invalidates every cached absolute position at once.
+    """
+    value = 0
+
+    @classmethod
+    def bump(cls) -> None:
+        cls.value += 1
+
+
+class LayoutFreeze:
+    """
+    Use like this:
+        with LayoutFreeze(root):
+            # No `Grid` of `root` computes its layout in here
+    Only the `Grid`s of `root` are frozen and the freezes can be nested.
+    Used by `layout.LayoutSnapshot` while the widgets are being created.
+    """
+    def __init__(self, root):
+        self.root = root
+
+    def __enter__(self) -> LayoutFreeze:
+        self.root._layout_frozen += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.root._layout_frozen -= 1
+        return False
+
+
 class Grid:
     """
     Functions defined:
@@ -32,6 +67,7 @@ class Grid:
         config(width:int=None, height:int=None) -> None
         _update_x(dx:int) -> None
         _update_y(dy:int) -> None
+        _get_abs_position() -> (int, int)
         _wants_self_expand() -> None
 
 
@@ -44,6 +80,7 @@ class Grid:
         # Helper (tested)
         _get_widget_from_xy(x:int, y:int) -> BaseWidget
         _widget_destroyed(self, widget:BaseWidget) -> None
+        _compact() -> None
         _add_widget(widget:BaseWidget, row:int, column:int) -> None
 
         _get_rows(row1:int, row2:int) # row2 can be None
@@ -64,6 +101,12 @@ class Grid:
         _update_h(redraw:bool=True) -> None
         _update_v(redraw:bool=True) -> None
     """
+    __slots__ = ("master", "_root", "_dictate_own_size", "_widgets",
+                 "_children", "_req_width", "_req_height", "_x", "_y",
+                 "_abs_position", "_abs_generation", "_width", "_height",
+                 "_expandable_rows", "_expandable_columns", "_grid_propagate",
+                 "_layout_suspended", "__weakref__")
+
     def __init__(self, master=None, root=None, dictate_own_size=True):
         self._dictate_own_size = dictate_own_size
         self.master = master
@@ -71,8 +114,11 @@ class Grid:
         self._children = []
         self._req_width = 0
         self._req_height = 0
+        # Relative to `master`. Use `_get_abs_position` for screen coords
         self._x = 0
         self._y = 0
+        self._abs_position = (0, 0)
+        self._abs_generation = -1
         if master is None:
             self._width = float("inf")
             self._height = float("inf")
@@ -85,6 +131,8 @@ class Grid:
         self._expandable_rows = []
         self._expandable_columns = []
         self._grid_propagate = True
+        # While `True`, adding/changing widgets doesn't run the layout
+        self._layout_suspended = False
 
     # Standard:
     def _update_width(self, new_width:int) -> None:
@@ -106,11 +154,14 @@ class Grid:
             child.update()
 
     def destroy(self) -> None:
-        for child in self._children:
+        # Detach the children first so they don't update/redraw us one by one
+        children = self._children
+        self._children = []
+        self._widgets = [[]]
+        for child in children:
             child.destroy()
         if self.master is not None:
             self.master._widget_destroyed(self)
-            self.master.redraw()
 
     def config(self, width:int=None, height:int=None) -> None:
         if width is not None:
@@ -131,16 +182,25 @@ class Grid:
             self.redraw()
 
     def _update_x(self, dx:int) -> None:
-        self._x += dx
-        for widget in self._children:
-            widget._update_x(dx)
-        self.redraw()
+        # The children are relative to us so they don't need to be touched
+        if dx != 0:
+            self._x += dx
+            PositionGeneration.bump()
 
     def _update_y(self, dy:int) -> None:
-        self._y += dy
-        for widget in self._children:
-            widget._update_y(dy)
-        self.redraw()
+        if dy != 0:
+            self._y += dy
+            PositionGeneration.bump()
+
+    def _get_abs_position(self) -> (int, int):
+        if self._abs_generation != PositionGeneration.value:
+            if self.master is None:
+                self._abs_position = (self._x, self._y)
+            else:
+                x, y = self.master._get_abs_position()
+                self._abs_position = (x + self._x, y + self._y)
+            self._abs_generation = PositionGeneration.value
+        return self._abs_position
 
     def _wants_self_expand(self) -> None:
         if self._dictate_own_size:
@@ -188,24 +248,41 @@ class Grid:
 
     # Helper functions/tested
     def _get_widget_from_xy(self, x:int, y:int):
+        # `x` and `y` are relative to `self`
         for widget in self._children:
             if widget._x <= x <= widget._x + widget._width:
                 if widget._y <= y <= widget._y + widget._height:
                     if isinstance(widget, Grid):
-                        return widget._get_widget_from_xy(x, y)
+                        return widget._get_widget_from_xy(x - widget._x,
+                                                          y - widget._y)
                     else:
                         return widget
         return self
 
     def _widget_destroyed(self, widget) -> None:
+        if widget not in self._children:
+            # We are being destroyed as well (look at `destroy`)
+            return None
         self._children.remove(widget)
         for row, row_of_widgets in enumerate(self._widgets):
             if widget in row_of_widgets:
                 column = row_of_widgets.index(widget)
                 row_of_widgets[column] = None
+        self._compact()
         self._update()
         self.redraw()
 
+    def _compact(self) -> None:
+        # Removes the empty rows/columns at the end of `_widgets`
+        widgets = self._widgets
+        while (len(widgets) > 1) and (widgets[-1].count(None) ==
+                                      len(widgets[-1])):
+            widgets.pop()
+        while (len(widgets[0]) > 0) and all(row_of_widgets[-1] is None
+                                            for row_of_widgets in widgets):
+            for row_of_widgets in widgets:
+                row_of_widgets.pop()
+
     def _add_widget(self, widget, row:int, column:int) -> None:
         if widget in self._children:
             raise RuntimeError("Widget \"{widget}\" already my slave.")
@@ -217,7 +294,8 @@ class Grid:
             for row_of_widgets in self._widgets:
                 row_of_widgets.append(None)
         self._widgets[row][column] = widget
-        self._update()
+        if not self._layout_suspended:
+            self._update()
 
     def _get_rows(self, row1:int, row2:int):
         if row1 is None:
@@ -257,7 +335,8 @@ class Grid:
                     if widget is None:
                         item = "None"
                     else:
-                        item = str([widget._x, widget._y])
+                        x, y = self._get_abs_position()
+                        item = str([x + widget._x, y + widget._y])
                 else:
                     raise ValueError(f"Unknown value for `what`: \"{what}\"")
                 new_row.append(item)
@@ -270,9 +349,16 @@ class Grid:
         return output
 
     # Other
+    def _is_layout_frozen(self) -> bool:
+        # Look at `LayoutFreeze`. Grids without a root are never frozen
+        root = getattr(self, "_root", None)
+        return getattr(root, "_layout_frozen", 0) != 0
+
     def _widget_changed_width(self, widget) -> None:
         assert not isinstance(widget, int), "You should pass in the widget "\
                                             "not the new width."
+        if self._layout_suspended:
+            return None
         for row_of_widgets in self._widgets:
             if widget in row_of_widgets:
                 column = row_of_widgets.index(widget)
@@ -281,11 +367,15 @@ class Grid:
     def _widget_changed_height(self, widget) -> None:
         assert not isinstance(widget, int), "You should pass in the widget "\
                                             "not the new height."
+        if self._layout_suspended:
+            return None
         for row, row_of_widgets in enumerate(self._widgets):
             if widget in row_of_widgets:
                 return self._update_v()
 
     def _update(self, height:bool=True, width:bool=True) -> None:
+        if self._is_layout_frozen():
+            return None
         if width:
             self._update_h(redraw=False)
         if height:
@@ -293,7 +383,9 @@ class Grid:
         self.redraw()
 
     def _update_h(self, redraw:bool=True) -> None:
-        base_x = self._x
+        if self._is_layout_frozen():
+            return None
+        base_x = 0
         expandable_columns = [*self._expandable_columns]
         widths = []
 
@@ -347,7 +439,9 @@ class Grid:
             self.redraw()
 
     def _update_v(self, redraw:bool=True) -> None:
-        base_y = self._y
+        if self._is_layout_frozen():
+            return None
+        base_y = 0
         expandable_rows = [*self._expandable_rows]
         heights = []
 
@@ -902,13 +996,80 @@ def test_grid_columnconfigure_rowconfigure(add_breakpoint:bool=False):
 
 
 
+################################### Test 7 ####################################
+def test_grid_nested_move(add_breakpoint:bool=False):
+    # Tests if moving a <Grid> leaves its children alone and only changes
+    # their derived absolute positions.
+
+    class Widget:
+        def __init__(self, master, name:str, width:int, height:int):
+            self.master = master
+            self.name = name
+            self._req_width = width
+            self._req_height = height
+            self._width = self._height = 0
+            self._x = self._y = 0
+            self.moves = 0
+
+        def _update_height(self, new_height:int) -> None:
+            self._height = new_height
+
+        def _update_width(self, new_width:int) -> None:
+            self._width = new_width
+
+        def _update_x(self, dx:int) -> None:
+            self._x += dx
+            self.moves += 1
+
+        def _update_y(self, dy:int) -> None:
+            self._y += dy
+            self.moves += 1
+
+        def __str__(self) -> str:
+            return f"Widget({self.name})"
+        __repr__ = __str__
+        def redraw(self) -> None: ...
+        def update(self) -> None: ...
+        def destroy(self) -> None: ...
+        def grid(self) -> None: ...
+
+
+    outer = Grid(dictate_own_size=False)
+    outer._width = outer._height = 100
+    outer._root = None
+    inner = Grid(master=outer)
+    widget1 = Widget(master=inner, name="widget1", width=5, height=10)
+    widget2 = Widget(master=inner, name="widget2", width=7, height=10)
+    inner._add_widget(widget1, row=0, column=0)
+    inner._add_widget(widget2, row=0, column=1)
+    outer._add_widget(inner, row=0, column=0)
+    moves = widget1.moves + widget2.moves
+
+    outer._update_x(1000)
+    outer._update_y(3000)
+    inner._update_x(20)
+
+    if add_breakpoint:
+        breakpoint()
+
+    msg = "Failed! Moving a <Grid> shouldn't touch its children."
+    assert widget1.moves + widget2.moves == moves, msg
+    assert (widget2._x, widget2._y) == (5, 0), msg
+
+    msg = "Failed! <Grid> doesn't derive the correct absolute positions."
+    assert inner._get_abs_position() == (1020, 3000), msg
+    x, y = inner._get_abs_position()
+    assert (x + widget2._x, y + widget2._y) == (1025, 3000), msg
+
+
+
 ############################## Combine all tests ##############################
 def test():
     from sys import stderr
     tests = (test_grid_widgets, test_grid_sizes_and_positions,
              test_grid_change_width_height,
              test_grid_change_grid_height_width_x_y, test_grid_destroy,
-             test_grid_columnconfigure_rowconfigure)
+             test_grid_columnconfigure_rowconfigure, test_grid_nested_move)
     for _test in tests:
         stderr.write(f"[Debug]: Testing {_test.__name__}:\n")
         _test()
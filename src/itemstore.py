@@ -0,0 +1,253 @@
+from __future__ import annotations
+from bisect import bisect_left
+from array import array
+import constants
+
+
+ALIVE = 1
+
+
+def parse_rectangle(*args:tuple, fill="", outline="", border:int=0,
+                    **kwargs:dict) -> ((int, int, int, int), tuple, tuple, int):
+    # Returns `(coords, fill, outline, border)`
+    if len(args) != 4:
+        raise ValueError(f"Invalid coords: {repr(args)}")
+
+    # Get rid of all of the negatives:
+    args = (max(0, args[0]), max(0, args[1]), args[2], args[3])
+    # Check if `x2` and `y2` are > than `x1` and `y1`:
+    if args[2] < args[0]:
+        raise ValueError("The `x2` provided is smaller than `x1`")
+    if args[3] < args[1]:
+        raise ValueError("The `y2` provided is smaller than `y1`")
+
+    fill = constants.parse_colour(fill)
+    outline = constants.parse_colour(outline)
+    if not isinstance(border, int):
+        raise ValueError(f"Invalid border width: {repr(border)}")
+    border = max(0, border)
+    if border > 0:
+        if outline is None:
+            raise ValueError("Invalid colour: None")
+    if len(kwargs) != 0:
+        raise ValueError(f"Unhandled kwargs: {kwargs}")
+    return args, fill, outline, border
+
+
+def parse_coords(coords:tuple) -> array:
+    # Floats are rounded. Raises before anything is changed if a value
+    # can't be stored in the columns
+    if len(coords) != 4:
+        raise ValueError(f"Invalid coords: {repr(coords)}")
+    return array("l", [round(value) for value in coords])
+
+
+class ItemStore:
+    """
+    Stores rectangles in columns (one typed array per property) instead of
+    having one python object per rectangle. The rows are sorted by id so
+    finding an item's row is a binary search. Deleted rows are only marked
+    as dead until more than half of the rows are dead.
+    """
+    def __init__(self):
+        self.ids = array("l")
+        self.x1s = array("l")
+        self.y1s = array("l")
+        self.x2s = array("l")
+        self.y2s = array("l")
+        # Colours are indices into `palette` (0 means no colour)
+        self.fills = array("I")
+        self.outlines = array("I")
+        self.borders = array("H")
+        self.flags = array("B")
+        self.palette = [None]
+        self.palette_ids = {None: 0}
+        self.dead = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, id:int) -> bool:
+        return self.get_row(id) is not None
+
+    def get_row(self, id:int) -> int:
+        row = bisect_left(self.ids, id)
+        if (row < len(self.ids)) and (self.ids[row] == id):
+            if self.flags[row] & ALIVE:
+                return row
+        return None
+
+    def get_colour_id(self, colour:tuple) -> int:
+        if colour not in self.palette_ids:
+            self.palette_ids[colour] = len(self.palette)
+            self.palette.append(colour)
+        return self.palette_ids[colour]
+
+    def append(self, id:int, coords:(int, int, int, int), fill:tuple,
+               outline:tuple, border:int) -> None:
+        if (len(self.ids) != 0) and (id <= self.ids[-1]):
+            raise ValueError("Ids must be added in increasing order")
+        # Check everything first so all of the columns stay the same length
+        x1, y1, x2, y2 = parse_coords(coords)
+        border = array("H", (border, ))[0]
+        id = array("l", (id, ))[0]
+        fill = self.get_colour_id(fill)
+        outline = self.get_colour_id(outline)
+        self.ids.append(id)
+        self.x1s.append(x1)
+        self.y1s.append(y1)
+        self.x2s.append(x2)
+        self.y2s.append(y2)
+        self.fills.append(fill)
+        self.outlines.append(outline)
+        self.borders.append(border)
+        self.flags.append(ALIVE)
+
+    def set(self, id:int, coords:(int, int, int, int), fill:tuple,
+            outline:tuple, border:int) -> None:
+        row = self.get_row(id)
+        coords = parse_coords(coords)
+        border = array("H", (border, ))[0]
+        self.x1s[row], self.y1s[row], self.x2s[row], self.y2s[row] = coords
+        self.fills[row] = self.get_colour_id(fill)
+        self.outlines[row] = self.get_colour_id(outline)
+        self.borders[row] = border
+
+    def get(self, id:int) -> ((int, int, int, int), tuple, tuple, int):
+        # Returns `(coords, fill, outline, border)`
+        row = self.get_row(id)
+        coords = (self.x1s[row], self.y1s[row], self.x2s[row], self.y2s[row])
+        return (coords, self.palette[self.fills[row]],
+                self.palette[self.outlines[row]], self.borders[row])
+
+    def get_coords(self, id:int) -> (int, int, int, int):
+        row = self.get_row(id)
+        return (self.x1s[row], self.y1s[row], self.x2s[row], self.y2s[row])
+
+    def iter_ids(self):
+        for id, flag in zip(self.ids, self.flags):
+            if flag & ALIVE:
+                yield id
+
+    def remove(self, id:int) -> None:
+        self.flags[self.get_row(id)] = 0
+        self.dead += 1
+        if self.dead*2 > len(self.ids):
+            self.compact()
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def compact(self) -> None:
+        alive = [row for row, flag in enumerate(self.flags) if flag & ALIVE]
+        for name in ("ids", "x1s", "y1s", "x2s", "y2s", "fills", "outlines",
+                     "borders", "flags"):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode,
+                                      [column[row] for row in alive]))
+        self.dead = 0
+
+    def redraw(self, backend, x:int, y:int, row1:int=0,
+               row2:int=None) -> None:
+        """
+        Draws the rows from `row1` to `row2` (not included) with `backend`.
+        `(x, y)` is the canvas's position in the window. The caller should
+        clip `backend` to the canvas.
+        """
+        if row2 is None:
+            row2 = len(self.ids)
+        fill_rect, draw_rect = backend.fill_rect, backend.draw_rect
+        palette = self.palette
+        x1s, y1s, x2s, y2s = self.x1s, self.y1s, self.x2s, self.y2s
+        fills, outlines, borders = self.fills, self.outlines, self.borders
+        flags = self.flags
+        for row in range(row1, row2):
+            if not (flags[row] & ALIVE):
+                continue
+            x1, y1 = x1s[row], y1s[row]
+            rect = (x + x1, y + y1, x2s[row] - x1, y2s[row] - y1)
+            if fills[row] != 0:
+                fill_rect(palette[fills[row]], rect)
+            if borders[row] != 0:
+                draw_rect(palette[outlines[row]], rect, borders[row])
+
+
+class CanvasItem:
+    """
+    A light weight handle to a rectangle stored in a canvas's `ItemStore`.
+    Handles are created when needed so many handles can refer to the same
+    item.
+    """
+    __slots__ = ("canvas", "id")
+    type = "rectangle"
+
+    def __init__(self, canvas:Canvas, id:int):
+        self.canvas = canvas
+        self.id = id
+
+    def __eq__(self, other:CanvasItem) -> bool:
+        if not isinstance(other, CanvasItem):
+            return False
+        return (self.canvas is other.canvas) and (self.id == other.id)
+
+    def __hash__(self) -> int:
+        return hash((id(self.canvas), self.id))
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}({self.id})"
+    __repr__ = __str__
+
+    @property
+    def deleted(self) -> bool:
+        return self.id not in self.canvas._items
+
+    @property
+    def tags(self) -> {str, ...}:
+        tags = self.canvas._item_tags
+        if self.id not in tags:
+            tags[self.id] = set()
+        return tags[self.id]
+
+    @property
+    def position(self) -> (int, int, int, int):
+        return self.canvas._items.get_coords(self.id)
+
+    def bbox(self) -> (int, int, int, int):
+        return self.position
+
+    def move(self, dx:int, dy:int, redraw_canvas:bool=True) -> None:
+        x1, y1, x2, y2 = self.position
+        self.config(x1+dx, y1+dy, x2+dx, y2+dy, redraw_canvas=redraw_canvas)
+
+    def config(self, *args, redraw_canvas:bool=True, **kwargs) -> None:
+        """
+        `redraw_canvas` can be `True` (redraw the whole canvas), `False`
+        (only draw this object) or `None` (don't draw anything).
+        """
+        if self.deleted:
+            raise RuntimeError("Can't `.config` dead objects.")
+        old_coords, fill, outline, border = self.canvas._items.get(self.id)
+        if len(args) == 0:
+            args = old_coords
+        kwargs.setdefault("fill", "" if fill is None else fill)
+        kwargs.setdefault("outline", "" if outline is None else outline)
+        kwargs.setdefault("border", border)
+        coords, fill, outline, border = parse_rectangle(*args, **kwargs)
+        self.canvas._items.set(self.id, coords, fill, outline, border)
+        self.canvas._spatial_index.update(self.id, old_coords, self.position)
+        if redraw_canvas:
+            self.canvas.redraw()
+        elif redraw_canvas is not None:
+            self.redraw()
+
+    def redraw(self) -> None:
+        if self.deleted:
+            return None
+        old_clip = self.canvas._clip_to_self()
+        if old_clip is None:
+            return None
+        row = self.canvas._items.get_row(self.id)
+        backend = self.canvas._root._backend
+        self.canvas._items.redraw(backend, *self.canvas._get_abs_position(),
+                                  row, row+1)
+        backend.set_clip(old_clip)
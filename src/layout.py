@@ -0,0 +1,216 @@
+from __future__ import annotations
+from grid import Grid, LayoutFreeze, PositionGeneration
+from backend import NullBackend
+from hashlib import sha1
+from array import array
+from sys import stderr
+import traceback
+import struct
+
+
+MAGIC = b"TKPGLAY1"
+# (structural hash, window width, window height, number of values). The
+# values are the root's requested size and then (x, y, width, height,
+# req_width, req_height) for each widget
+HEADER = struct.Struct("<20sIII")
+
+
+def _uses_grid_layout(widget) -> bool:
+    # `ListView` (for example) places its children itself
+    return isinstance(widget, Grid) and \
+           (type(widget)._update_width is Grid._update_width)
+
+
+def _get_cells(grid:Grid):
+    # Yields (row, column, widget) for every widget in the grid
+    for row, row_of_widgets in enumerate(grid._widgets):
+        for column, widget in enumerate(row_of_widgets):
+            if widget is not None:
+                yield row, column, widget
+
+
+def _describe(grid:Grid) -> tuple:
+    # Everything that the layout of `grid` depends on
+    children = []
+    for row, column, widget in _get_cells(grid):
+        if _uses_grid_layout(widget):
+            size = None
+            if not widget._grid_propagate:
+                size = (widget._req_width, widget._req_height)
+            children.append((row, column, widget.__class__.__name__,
+                             widget._sticky, size, _describe(widget)))
+        else:
+            children.append((row, column, widget.__class__.__name__,
+                             widget._sticky, widget._req_width,
+                             widget._req_height))
+    return (tuple(sorted(grid._expandable_rows)),
+            tuple(sorted(grid._expandable_columns)), grid._grid_propagate,
+            tuple(children))
+
+
+def structural_hash(grid:Grid) -> bytes:
+    return sha1(repr(_describe(grid)).encode()).digest()
+
+
+def run_layout(grid:Grid) -> None:
+    """
+    Computes the layout of `grid` and everything inside of it once. The
+    grids inside go first so they know the sizes that they want before
+    their master uses them.
+    """
+    grid._layout_suspended = True
+    for row, column, widget in _get_cells(grid):
+        if _uses_grid_layout(widget):
+            run_layout(widget)
+    grid._layout_suspended = False
+    grid._update_h(redraw=False)
+    grid._update_v(redraw=False)
+
+
+def _config(widget, options:dict) -> None:
+    widget.config(**options)
+
+
+def apply_changes(root, changes:dict, function=_config) -> list:
+    """
+    Calls `function(widget, options)` (by default `widget.config(**options)`)
+    for each {widget: options} in `changes` while the layout is frozen and
+    nothing is drawn. Then the layout runs once (only if a requested size
+    changed) and each widget is redrawn once. Returns the widgets for which
+    `function` raised an exception.
+    """
+    backend = root._backend
+    root._backend = NullBackend(backend)
+    layout_changed = False
+    failed = []
+    with LayoutFreeze(root):
+        for widget, options in changes.items():
+            if widget._destroyed:
+                continue
+            old_size = (widget._req_width, widget._req_height)
+            try:
+                function(widget, options)
+            except Exception as error:
+                stderr.write("An exception occured while changing " \
+                             f"{options} of {widget}\n")
+                traceback.print_exc()
+                failed.append(widget)
+            if old_size != (widget._req_width, widget._req_height):
+                layout_changed = True
+    try:
+        if layout_changed:
+            run_layout(root)
+    finally:
+        root._backend = backend
+
+    if layout_changed:
+        root.redraw()
+        return failed
+    # Redrawing a widget also redraws the widgets inside of it
+    for widget in changes:
+        if widget._destroyed:
+            continue
+        master = widget.master
+        while (master is not None) and (master not in changes):
+            master = master.master
+        if master is None:
+            widget.redraw()
+    return failed
+
+
+def _get_geometry(grid:Grid, output:array) -> None:
+    for row, column, widget in _get_cells(grid):
+        output.extend((widget._x, widget._y, widget._width, widget._height,
+                       widget._req_width, widget._req_height))
+        if _uses_grid_layout(widget):
+            _get_geometry(widget, output)
+
+
+def _set_geometry(grid:Grid, values:array, index:int) -> int:
+    # Returns the index of the next widget's values
+    for row, column, widget in _get_cells(grid):
+        x, y, width, height, req_width, req_height = values[index:index+6]
+        index += 6
+        widget._x, widget._y = x, y
+        widget._req_width, widget._req_height = req_width, req_height
+        if _uses_grid_layout(widget):
+            # Setting the size directly so the layout doesn't run again
+            widget._width, widget._height = width, height
+            index = _set_geometry(widget, values, index)
+        else:
+            # Other widgets might need to know about the change
+            if widget._width != width:
+                widget._update_width(width)
+            if widget._height != height:
+                widget._update_height(height)
+    return index
+
+
+class LayoutSnapshot:
+    """
+    A context manager (look at `Tk.layout_snapshot`). No layout runs while
+    the widgets are created inside of the `with` block. At the end, if the
+    file was saved for the same structure (`structural_hash`) and window
+    size, the saved geometry is used. Otherwise the layout runs once and
+    the result is saved for next time.
+
+    `hit` is `True` if the saved geometry was used.
+    """
+    def __init__(self, root, filename:str):
+        self.root = root
+        self.filename = filename
+        self.hit = False
+        # Only freezes `root` and only until the end of the `with` block
+        self.freeze = LayoutFreeze(root)
+
+    def __enter__(self) -> LayoutSnapshot:
+        self.freeze.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.freeze.__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            run_layout(self.root)
+            self.root.redraw()
+            return False
+        key = structural_hash(self.root)
+        size = (self.root._width, self.root._height)
+        values = self.load(key, size)
+        if values is None:
+            run_layout(self.root)
+            self.save(key, size)
+        else:
+            self.root._req_width, self.root._req_height = values[:2]
+            _set_geometry(self.root, values, 2)
+            PositionGeneration.bump()
+            self.hit = True
+        self.root.redraw()
+        return False
+
+    def load(self, key:bytes, size:(int, int)) -> array:
+        # Returns `None` if there isn't a snapshot for `key` and `size`
+        try:
+            with open(self.filename, "rb") as file:
+                if file.read(len(MAGIC)) != MAGIC:
+                    return None
+                header = file.read(HEADER.size)
+                if len(header) != HEADER.size:
+                    return None
+                file_key, width, height, length = HEADER.unpack(header)
+                if (file_key != key) or ((width, height) != size):
+                    return None
+                values = array("q")
+                values.frombytes(file.read(length*values.itemsize))
+        except (OSError, ValueError):
+            return None
+        if len(values) != length:
+            return None
+        return values
+
+    def save(self, key:bytes, size:(int, int)) -> None:
+        values = array("q", (self.root._req_width, self.root._req_height))
+        _get_geometry(self.root, values)
+        with open(self.filename, "wb") as file:
+            file.write(MAGIC)
+            file.write(HEADER.pack(key, *size, len(values)))
+            file.write(values.tobytes())
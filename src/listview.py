@@ -0,0 +1,178 @@
+from __future__ import annotations
+from widgets import Frame, Label
+from event import Event
+
+
+class ListView(Frame):
+    """
+    A frame that shows `len(data)` rows that are `row_height` pixels tall
+    but only has widgets for the rows that can be seen (plus `overscan`
+    rows above and below them). The widgets are reused while scrolling:
+        create_row(master:ListView) -> BaseWidget
+        update_row(widget:BaseWidget, data, index:int) -> None
+    By default each row is a `Label` that shows `str(data[index])`.
+
+    When scrolling by less than the height of the list, the pixels that are
+    still visible are moved with `Surface.scroll` and only the rows in the
+    newly exposed strip are redrawn.
+    """
+    __slots__ = ("_data", "_row_height", "_overscan", "_create_row",
+                 "_update_row", "_rows", "_spare_rows", "_offset")
+    _class_bindings = {"<Button-4>": ("_scroll_up", ),
+                       "<Button-5>": ("_scroll_down", )}
+
+    def __init__(self, master, data=(), row_height:int=30, width:int=200,
+                 height:int=200, create_row=None, update_row=None,
+                 overscan:int=2, **kwargs):
+        super().__init__(master, **kwargs)
+        super().grid_propagate(False)
+        self._data = data
+        self._row_height = row_height
+        self._overscan = overscan
+        if create_row is None:
+            create_row = self._default_create_row
+        if update_row is None:
+            update_row = self._default_update_row
+        self._create_row = create_row
+        self._update_row = update_row
+
+        self._offset = 0 # In pixels from the top of the first row
+        self._rows = {} # {index: widget} (only the rows that are placed)
+        self._spare_rows = []
+        super().config(width=width, height=height)
+
+    def _default_create_row(self, master:ListView) -> Label:
+        return Label(master, fg="white", bg="", pady=0)
+
+    def _default_update_row(self, widget:Label, data, index:int) -> None:
+        widget.config(text=str(data[index]))
+
+    def _scroll_up(self, event:Event) -> str:
+        self.yview_scroll(-1, "units")
+        return "break"
+
+    def _scroll_down(self, event:Event) -> str:
+        self.yview_scroll(1, "units")
+        return "break"
+
+    # Standard:
+    def _update_width(self, new_width:int) -> None:
+        self._width = new_width
+        self._layout_rows()
+        self.redraw()
+
+    def _update_height(self, new_height:int) -> None:
+        self._height = new_height
+        self._layout_rows()
+        self.redraw()
+
+    def _drop_caches(self) -> None:
+        # The placed rows are our children so they are destroyed with us
+        self._spare_rows.clear()
+
+    # Use can call these:
+    def set_data(self, data) -> None:
+        self._data = data
+        self._recycle_rows(0, 0)
+        self._offset = min(self._offset, self._get_max_offset())
+        self._layout_rows()
+        self.redraw()
+
+    def refresh(self) -> None:
+        """
+        Call this after changing the items inside `data`.
+        """
+        for index, widget in self._rows.items():
+            self._update_row(widget, self._data, index)
+        self.redraw()
+
+    def yview_scroll(self, number:int, what:str="units") -> None:
+        if what == "units":
+            number *= self._row_height
+        elif what != "pixels":
+            raise ValueError(f"Unknown value for `what`: \"{what}\"")
+        self._set_offset(self._offset + number)
+
+    def yview_moveto(self, fraction:float) -> None:
+        self._set_offset(int(fraction*len(self._data)*self._row_height))
+
+    def yview(self) -> (float, float):
+        total = len(self._data)*self._row_height
+        if total == 0:
+            return (0.0, 1.0)
+        return (self._offset/total,
+                min(1.0, (self._offset + self._height)/total))
+
+    # Helpers:
+    def _get_max_offset(self) -> int:
+        return max(0, len(self._data)*self._row_height - self._height)
+
+    def _get_index_range(self) -> (int, int):
+        first = self._offset // self._row_height - self._overscan
+        last = (self._offset + self._height) // self._row_height + 1
+        last += self._overscan
+        return max(0, first), min(len(self._data), last)
+
+    def _get_max_rows(self) -> int:
+        # The most rows that `_get_index_range` can give
+        return self._height//self._row_height + 2 + 2*self._overscan
+
+    def _recycle_rows(self, first:int, last:int) -> None:
+        # Remove the rows outside of `first <= index < last`
+        for index in tuple(self._rows):
+            if not (first <= index < last):
+                widget = self._rows.pop(index)
+                self._children.remove(widget)
+                self._spare_rows.append(widget)
+        # Don't keep more spare rows than can be shown (the list can shrink)
+        while len(self._spare_rows) > self._get_max_rows():
+            self._spare_rows.pop().destroy()
+
+    def _layout_rows(self) -> None:
+        first, last = self._get_index_range()
+        self._recycle_rows(first, last)
+        for index in range(first, last):
+            widget = self._rows.get(index, None)
+            if widget is None:
+                if len(self._spare_rows) == 0:
+                    widget = self._create_row(self)
+                    widget._sticky = "news"
+                else:
+                    widget = self._spare_rows.pop()
+                self._update_row(widget, self._data, index)
+                self._children.append(widget)
+                self._rows[index] = widget
+            self._place_row(widget, index)
+
+    def _place_row(self, widget, index:int) -> None:
+        widget._update_x(-widget._x)
+        widget._update_y(index*self._row_height - self._offset - widget._y)
+        if widget._width != self._width:
+            widget._update_width(self._width)
+        if widget._height != self._row_height:
+            widget._update_height(self._row_height)
+
+    def _set_offset(self, offset:int) -> None:
+        offset = max(0, min(offset, self._get_max_offset()))
+        dy = self._offset - offset
+        if dy == 0:
+            return None
+        self._offset = offset
+        self._layout_rows()
+        # Our masters can cut us off so don't move or draw over their pixels
+        rect = self._get_visible_rect()
+        backend = self._root._backend
+        old_clip = backend.get_clip()
+        clip = old_clip.clip(rect)
+        backend.set_clip(clip)
+        # Move the pixels that are still visible and only draw the new strip
+        if (abs(dy) >= rect.height) or (not backend.scroll(rect, dy)):
+            self.redraw()
+        else:
+            if dy < 0:
+                strip = (rect.x, rect.bottom + dy, rect.width, -dy)
+            else:
+                strip = (rect.x, rect.y, rect.width, dy)
+            backend.set_clip(clip.clip(strip))
+            Frame.redraw(self)
+        backend.set_clip(old_clip)
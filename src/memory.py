@@ -0,0 +1,104 @@
+from __future__ import annotations
+from time import perf_counter
+from collections import deque
+import tracemalloc
+import gc
+from widget import BaseWidget
+from grid import Grid
+
+import pygame
+
+
+# How deep to look inside of attributes for surfaces
+MAX_DEPTH = 4
+
+
+def get_attributes(value) -> list:
+    # The values of the attributes of `value` (from `__dict__` and slots)
+    values = list(getattr(value, "__dict__", {}).values())
+    for cls in type(value).__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            if name in ("__dict__", "__weakref__"):
+                continue
+            if hasattr(value, name):
+                values.append(getattr(value, name))
+    return values
+
+
+def surface_bytes(value, seen:set, depth:int=MAX_DEPTH) -> int:
+    """
+    Returns the number of bytes used by the surfaces inside of `value`
+    (looking inside of containers and objects, but not other widgets).
+    Surfaces inside of `seen` (a set of ids) aren't counted again.
+    """
+    if id(value) in seen:
+        return 0
+    if isinstance(value, pygame.Surface):
+        seen.add(id(value))
+        return value.get_pitch() * value.get_height()
+    # Widgets are counted on their own
+    if (depth == 0) or isinstance(value, (str, bytes, int, float, Grid,
+                                          BaseWidget)):
+        return 0
+    seen.add(id(value))
+    if isinstance(value, dict):
+        values = value.values()
+    elif isinstance(value, (list, tuple, deque, set, frozenset)):
+        values = value
+    else:
+        values = get_attributes(value)
+    return sum(surface_bytes(item, seen, depth-1) for item in values)
+
+
+def widget_surface_bytes(widget, seen:set) -> int:
+    seen.add(id(widget))
+    return sum(surface_bytes(value, seen) for value in get_attributes(widget))
+
+
+def count_bindings(widget) -> int:
+    # The bindings in `_class_bindings` are shared so they aren't counted
+    output = 0
+    for bindings in (widget._event_bindings, widget._my_event_bindings):
+        if bindings is not None:
+            output += sum(map(len, bindings.values()))
+    return output
+
+
+def memory_report(widgets) -> dict:
+    """
+    Returns {widget type: {"live": int, "destroyed": int, "bindings": int,
+                           "surface_bytes": int}}
+    Destroyed widgets that are still alive are leaks (something still has
+    a reference to them).
+    """
+    report = {}
+    seen = set()
+    for widget in widgets:
+        name = widget.__class__.__name__
+        if name not in report:
+            report[name] = {"live": 0, "destroyed": 0, "bindings": 0,
+                            "surface_bytes": 0}
+        entry = report[name]
+        if widget._destroyed:
+            entry["destroyed"] += 1
+        else:
+            entry["live"] += 1
+        entry["bindings"] += count_bindings(widget)
+        entry["surface_bytes"] += widget_surface_bytes(widget, seen)
+    return report
+
+
+def measure_widget_overhead(factory, count:int=1000) -> (float, float):
+    """
+    Calls `factory()` `count` times and returns the memory (in bytes, from
+    `tracemalloc`) and the time (in seconds) used by each widget.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = perf_counter()
+    widgets = [factory() for i in range(count)]
+    time = perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del widgets
+    return size/count, time/count
@@ -0,0 +1,173 @@
+from __future__ import annotations
+from time import perf_counter
+from event import Event
+from sys import stderr
+import marshal
+import struct
+
+import pygame
+
+
+MAGIC = b"TKPGREC1"
+# (frame, seconds since the start, kind, length of the payload)
+RECORD = struct.Struct("<IdBI")
+PYGAME_EVENT = 0
+SYNTHETIC_EVENT = 1
+
+
+def _dumpable(value) -> bool:
+    # Only values that `marshal` can save are recorded (not `Window`s)
+    try:
+        marshal.dumps(value)
+        return True
+    except ValueError:
+        return False
+
+
+def _get_widget_path(widget) -> (int, ...):
+    # The indices (in `_children`) from the root to `widget`
+    path = []
+    while widget.master is not None:
+        if widget not in widget.master._children:
+            return None
+        path.append(widget.master._children.index(widget))
+        widget = widget.master
+    return tuple(reversed(path))
+
+
+def _get_widget_from_path(root, path:(int, ...)):
+    widget = root
+    for index in path:
+        if index >= len(widget._children):
+            return None
+        widget = widget._children[index]
+    return widget
+
+
+class InputRecorder:
+    """
+    Writes every event that the root handles to a binary file. Each frame's
+    raw pygame events and synthetic events (from `event_queue`) are saved
+    with the frame number and a timestamp so `InputReplayer` can feed them
+    back in the same order.
+    """
+    def __init__(self, root, filename:str):
+        self.root = root
+        self.file = open(filename, "wb")
+        self.file.write(MAGIC)
+        self.frame = 0
+        self.start = perf_counter()
+
+    def write_frame(self, events:tuple, other_events:tuple) -> None:
+        time = perf_counter() - self.start
+        for event in events:
+            attrs = {key: value for key, value in event.dict.items()
+                     if _dumpable(value)}
+            self._write(time, PYGAME_EVENT, (event.type, attrs))
+        for event in other_events:
+            path = _get_widget_path(event.widget)
+            if path is None:
+                continue
+            attrs = {key: value for key, value in event.__dict__.items()
+                     if (key != "widget") and _dumpable(value)}
+            self._write(time, SYNTHETIC_EVENT, (path, attrs))
+        self.frame += 1
+
+    def _write(self, time:float, kind:int, data:tuple) -> None:
+        payload = marshal.dumps(data)
+        self.file.write(RECORD.pack(self.frame, time, kind, len(payload)))
+        self.file.write(payload)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class InputReplayer:
+    """
+    Feeds the events saved by `InputRecorder` back into the root instead of
+    the real input. With `realtime=True` the events are replayed at the
+    same times as they were recorded. Otherwise each recorded frame is
+    replayed as one loop of `mainloop` (as fast as possible).
+
+    If `synthetic` is `False`, the synthetic events are left to the widgets
+    to generate again (they should if the program is deterministic).
+    """
+    def __init__(self, root, filename:str, realtime:bool=True,
+                 synthetic:bool=False, quit_at_end:bool=False):
+        self.root = root
+        self.file = open(filename, "rb")
+        if self.file.read(len(MAGIC)) != MAGIC:
+            self.file.close()
+            raise ValueError(f"Not an input recording: {filename}")
+        self.realtime = realtime
+        self.synthetic = synthetic
+        self.quit_at_end = quit_at_end
+        self.frame = 0
+        self.frame_times = []
+        self.start = perf_counter()
+        self.next_record = self._read()
+
+    def next_frame(self, events:tuple, other_events:tuple) -> (tuple, tuple):
+        """
+        Takes the real events of this frame and returns the events that
+        should be handled instead.
+        """
+        self.frame_times.append(perf_counter())
+        # The user can still close the window
+        quit_events = tuple(event for event in events
+                            if event.type == pygame.QUIT)
+        if self.next_record is None:
+            self.finish()
+            if self.quit_at_end:
+                quit_events += (pygame.event.Event(pygame.QUIT), )
+            return quit_events, other_events
+
+        replayed_events, replayed_other_events = [], []
+        time = perf_counter() - self.start
+        while self.next_record is not None:
+            frame, record_time, kind, data = self.next_record
+            if self.realtime and (record_time > time):
+                break
+            if (not self.realtime) and (frame > self.frame):
+                break
+            if kind == PYGAME_EVENT:
+                type, attrs = data
+                replayed_events.append(pygame.event.Event(type, attrs))
+            else:
+                path, attrs = data
+                widget = _get_widget_from_path(self.root, path)
+                if widget is not None:
+                    names = attrs.pop("names")
+                    event = Event.from_name(names, widget=widget, **attrs)
+                    replayed_other_events.append(event)
+            self.next_record = self._read()
+        self.frame += 1
+
+        if self.synthetic:
+            other_events = tuple(replayed_other_events)
+        return quit_events + tuple(replayed_events), other_events
+
+    def stats(self) -> dict:
+        # How long the replay took (in seconds)
+        times = self.frame_times
+        lengths = [end - start for start, end in zip(times, times[1:])]
+        return {"frames": len(times),
+                "total": times[-1] - times[0] if len(times) > 1 else 0,
+                "mean_frame": sum(lengths)/len(lengths) if lengths else 0,
+                "max_frame": max(lengths, default=0)}
+
+    def finish(self) -> None:
+        self.file.close()
+        self.root._replayer = None
+        stats = self.stats()
+        stderr.write(f"[Replay]: {stats['frames']} frames in " \
+                     f"{stats['total']:.3f}s (mean frame " \
+                     f"{stats['mean_frame']*1000:.2f}ms, max frame " \
+                     f"{stats['max_frame']*1000:.2f}ms)\n")
+
+    def _read(self) -> (int, float, int, tuple):
+        header = self.file.read(RECORD.size)
+        if len(header) < RECORD.size:
+            return None
+        frame, time, kind, length = RECORD.unpack(header)
+        return frame, time, kind, marshal.loads(self.file.read(length))
@@ -0,0 +1,67 @@
+from weakref import WeakSet
+import constants
+
+
+def _apply_style(widget, options:dict) -> None:
+    widget._apply_style(options)
+
+
+class Style:
+    """
+    A set of already parsed options that can be shared between widgets.
+    Pass it in as `style=` when creating/configuring a widget. Options
+    passed explicitly in the same call take priority over the style's.
+
+    Options:
+        bg, fg, cursor, font, padx, pady
+
+    Calling `<Style>.config` restyles every widget that uses the style and
+    then runs the layout only once (look at `layout.apply_changes`).
+    """
+    def __init__(self, **kwargs):
+        self._users = WeakSet()
+        self._options = {}
+        self._parse(**kwargs)
+
+    def _parse(self, bg:str=None, fg:str=None, cursor:str=None,
+               font:tuple=None, padx:int=None, pady:int=None) -> None:
+        if bg is not None:
+            self._options["bg"] = constants.parse_colour(bg)
+        if fg is not None:
+            self._options["fg"] = constants.parse_colour(fg)
+        if cursor is not None:
+            if cursor == "none":
+                self._options["cursor"] = cursor
+            else:
+                self._options["cursor"] = constants.parse_cursor(cursor)
+        if font is not None:
+            self._options["font"] = constants.parse_font(font)
+        if padx is not None:
+            if isinstance(padx, int):
+                padx = (padx, padx)
+            self._options["padx"] = tuple(padx)
+        if pady is not None:
+            if isinstance(pady, int):
+                pady = (pady, pady)
+            self._options["pady"] = tuple(pady)
+
+    def _add_user(self, widget) -> None:
+        self._users.add(widget)
+
+    def _remove_user(self, widget) -> None:
+        self._users.discard(widget)
+
+    def cget(self, key:str):
+        return self._options.get(key, None)
+
+    def config(self, **kwargs) -> None:
+        from layout import apply_changes # Not needed until a restyle
+        self._parse(**kwargs)
+
+        # Only one layout pass (and redraw) for each root
+        roots = {} # {root: {widget: options}}
+        for widget in tuple(self._users):
+            if not widget._destroyed:
+                roots.setdefault(widget._root, {})[widget] = self._options
+        for root, changes in roots.items():
+            apply_changes(root, changes, _apply_style)
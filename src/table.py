@@ -0,0 +1,325 @@
+from __future__ import annotations
+from widget import Widget
+from event import Event
+from array import array
+import constants
+
+import pygame
+
+
+def build_view_index(length:int, filter_column=None, predicate=None,
+                     sort_column=None, reverse:bool=False) -> array:
+    """
+    Returns the model rows that should be shown (in order). `filter_column`
+    and `sort_column` are the model's columns (lists or numpy arrays).
+    """
+    if predicate is None:
+        rows = range(length)
+    else:
+        rows = [row for row in range(length) if predicate(filter_column[row])]
+    if sort_column is not None:
+        rows = sorted(rows, key=sort_column.__getitem__, reverse=reverse)
+    return array("l", rows)
+
+
+class Table(Widget):
+    """
+    Draws cells straight from a columnar model instead of having a widget
+    for each cell. `data` is a sequence of columns (lists or numpy arrays)
+    in the same order as `columns` (the headings).
+
+    Rendered cells are cached so only the cells changed by `update_cells`
+    are rendered and drawn again. Sorting and filtering only rebuild the
+    view index (the order in which the model's rows are shown).
+    """
+    __slots__ = ("_headings", "_data", "_font", "_row_height", "_heading_bg",
+                 "_formats", "_fixed_column_widths", "_column_widths",
+                 "_column_xs", "_heading_surfaces", "_cells", "_length",
+                 "_filter", "_sort", "_view", "_offset")
+    _class_bindings = {"<Button-4>": ("_scroll_up", ),
+                       "<Button-5>": ("_scroll_down", )}
+
+    def __init__(self, master, columns:[str, ...], data=None,
+                 column_widths:[int, ...]=None, formats:[str, ...]=None,
+                 row_height:int=30, width:int=400, height:int=400,
+                 font:tuple=None, fg:str="white", bg:str="black",
+                 heading_bg:str="grey", **kwargs):
+        super().__init__(master, width=width, height=height, fg=fg, bg=bg,
+                         **kwargs)
+        if font is None:
+            font = ("", 20)
+        self._font = constants.parse_font(font)
+        self._heading_bg = constants.parse_colour(heading_bg)
+        self._headings = tuple(columns)
+        if formats is None:
+            formats = ("{}", )*len(self._headings)
+        self._formats = tuple(formats)
+        self._row_height = row_height
+        self._fixed_column_widths = column_widths
+
+        self._sort = None # (column, reverse)
+        self._filter = None # (column, predicate)
+        self._offset = 0 # In view rows
+        self._cells = {} # {(model_row, column): pygame.Surface}
+        self._heading_surfaces = [self._font.render(heading, False, self._fg)
+                                  for heading in self._headings]
+        if data is None:
+            data = [[] for heading in self._headings]
+        self.set_data(data, redraw=False)
+
+    def _scroll_up(self, event:Event) -> str:
+        self.yview_scroll(-1)
+        return "break"
+
+    def _scroll_down(self, event:Event) -> str:
+        self.yview_scroll(1)
+        return "break"
+
+    # Standard:
+    def _update_height(self, new_height:int) -> None:
+        super()._update_height(new_height)
+        self._offset = min(self._offset, self._get_max_offset())
+
+    def _drop_caches(self) -> None:
+        self._cells.clear()
+
+    def redraw(self) -> (int, int, int, int):
+        rect = self._get_rect()
+        old_clip = self._clip_to_self()
+        if old_clip is None:
+            return tuple(rect)
+        backend = self._root._backend
+
+        if self._bg is not None:
+            backend.fill_rect(self._bg, rect)
+        if self._heading_bg is not None:
+            backend.fill_rect(self._heading_bg,
+                              (rect.x, rect.y, rect.width, self._row_height))
+        for column, surface in enumerate(self._heading_surfaces):
+            self._blit_cell(surface, column, rect.x, rect.y)
+
+        first, last = self._get_view_range()
+        y = rect.y + self._row_height
+        for view_row in range(first, last):
+            model_row = self._view[view_row]
+            for column in range(len(self._headings)):
+                surface = self._get_cell_surface(model_row, column)
+                self._blit_cell(surface, column, rect.x, y)
+            y += self._row_height
+
+        backend.set_clip(old_clip)
+        return tuple(rect)
+
+    # User can call these:
+    def set_data(self, data, redraw:bool=True) -> None:
+        if len(data) != len(self._headings):
+            raise ValueError("`data` must have one column for each heading")
+        self._data = list(data)
+        self._length = min(map(len, self._data), default=0)
+        self._cells.clear()
+        self._compute_column_widths()
+        self._rebuild_view(redraw=redraw)
+
+    def get(self, row:int, column:int):
+        # `row` is the row in the model (not in the view)
+        return self._data[column][row]
+
+    def update_cells(self, rows, columns, values) -> None:
+        """
+        Sets `data[columns[i]][rows[i]] = values[i]` and only redraws the
+        changed cells that can be seen. `rows` are rows in the model.
+        """
+        if isinstance(rows, int):
+            rows, columns, values = (rows, ), (columns, ), (values, )
+        if not (len(rows) == len(columns) == len(values)):
+            raise ValueError("`rows`, `columns` and `values` must have the " \
+                             "same length")
+
+        first, last = self._get_view_range()
+        visible = {self._view[view_row]: view_row
+                   for view_row in range(first, last)}
+        changed = []
+        for row, column, value in zip(rows, columns, values):
+            self._data[column][row] = value
+            self._cells.pop((row, column), None)
+            if row in visible:
+                changed.append((visible[row], column))
+
+        if (self._sort is not None) and (self._sort[0] in columns):
+            # The order might have changed
+            return self._rebuild_view()
+        if (self._filter is not None) and (self._filter[0] in columns):
+            return self._rebuild_view()
+        for view_row, column in changed:
+            self._redraw_cell(view_row, column)
+
+    def sort(self, column:int=None, reverse:bool=False) -> None:
+        # Pass in `None` to show the rows in the model's order
+        if column is None:
+            self._sort = None
+        else:
+            self._sort = (column, reverse)
+        self._rebuild_view()
+
+    def filter(self, column:int=None, predicate=None) -> None:
+        """
+        Only shows the rows where `predicate(data[column][row])` is true.
+        Call it without arguments to remove the filter.
+        """
+        if predicate is None:
+            self._filter = None
+        else:
+            self._filter = (column, predicate)
+        self._rebuild_view()
+
+    def identify(self, x:int, y:int) -> (int, int):
+        """
+        Returns the `(model_row, column)` of the cell at `(x, y)` (relative
+        to the table) or `None`. The headings are row `-1`.
+        """
+        column = self._get_column_from_x(x)
+        if (column is None) or not (0 <= y < self._height):
+            return None
+        if y < self._row_height:
+            return (-1, column)
+        view_row = self._offset + y//self._row_height - 1
+        if view_row >= len(self._view):
+            return None
+        return (self._view[view_row], column)
+
+    def yview_scroll(self, number:int, what:str="units") -> None:
+        if what == "pixels":
+            number //= self._row_height
+        elif what != "units":
+            raise ValueError(f"Unknown value for `what`: \"{what}\"")
+        self._set_offset(self._offset + number)
+
+    def yview_moveto(self, fraction:float) -> None:
+        self._set_offset(int(fraction*len(self._view)))
+
+    # Helpers:
+    def _get_shown_rows(self) -> int:
+        # The number of rows that fit under the headings
+        return max(0, self._height//self._row_height - 1)
+
+    def _get_max_offset(self) -> int:
+        return max(0, len(self._view) - self._get_shown_rows())
+
+    def _get_view_range(self) -> (int, int):
+        last = self._offset + self._get_shown_rows() + 1
+        return self._offset, min(len(self._view), last)
+
+    def _get_column_from_x(self, x:int) -> int:
+        for column, column_x in enumerate(self._column_xs):
+            if column_x <= x < column_x + self._column_widths[column]:
+                return column
+        return None
+
+    def _compute_column_widths(self, sample:int=100) -> None:
+        # Only looks at the first `sample` rows so it doesn't have to render
+        # the whole model. Pass in `column_widths` for exact widths.
+        if self._fixed_column_widths is not None:
+            self._column_widths = tuple(self._fixed_column_widths)
+        else:
+            widths = []
+            for column, heading in enumerate(self._heading_surfaces):
+                width = heading.get_width()
+                for row in range(min(sample, self._length)):
+                    surface = self._get_cell_surface(row, column)
+                    width = max(width, surface.get_width())
+                widths.append(width + 10)
+            self._column_widths = tuple(widths)
+        self._column_xs = []
+        x = 0
+        for width in self._column_widths:
+            self._column_xs.append(x)
+            x += width
+
+    def _get_cell_surface(self, row:int, column:int) -> pygame.Surface:
+        key = (row, column)
+        if key not in self._cells:
+            # Only keep the cells that have been drawn recently
+            if len(self._cells) > 4*len(self._headings)*(self._get_shown_rows()
+                                                         + 100):
+                self._cells.clear()
+            text = self._formats[column].format(self._data[column][row])
+            self._cells[key] = self._font.render(text, False, self._fg)
+        return self._cells[key]
+
+    def _blit_cell(self, surface:pygame.Surface, column:int, x:int,
+                   y:int) -> None:
+        x += self._column_xs[column] + 5
+        y += (self._row_height - surface.get_height())//2
+        area = (0, 0, self._column_widths[column] - 10, self._row_height)
+        self._root._backend.blit(surface, (x, y), area)
+
+    def _redraw_cell(self, view_row:int, column:int) -> None:
+        rect = self._get_rect()
+        y = rect.y + (view_row - self._offset + 1)*self._row_height
+        cell = pygame.Rect(rect.x + self._column_xs[column], y,
+                           self._column_widths[column], self._row_height)
+        backend = self._root._backend
+        old_clip = backend.get_clip()
+        backend.set_clip(cell.clip(rect).clip(old_clip))
+        if self._bg is not None:
+            backend.fill_rect(self._bg, cell)
+        model_row = self._view[view_row]
+        self._blit_cell(self._get_cell_surface(model_row, column), column,
+                        rect.x, y)
+        backend.set_clip(old_clip)
+
+    def _rebuild_view(self, redraw:bool=True) -> None:
+        filter_column = predicate = sort_column = None
+        reverse = False
+        if self._filter is not None:
+            column, predicate = self._filter
+            filter_column = self._data[column]
+        if self._sort is not None:
+            column, reverse = self._sort
+            sort_column = self._data[column]
+        self._view = build_view_index(self._length, filter_column, predicate,
+                                      sort_column, reverse)
+        self._offset = min(self._offset, self._get_max_offset())
+        if redraw:
+            self.redraw()
+
+    def _set_offset(self, offset:int) -> None:
+        offset = max(0, min(offset, self._get_max_offset()))
+        if offset != self._offset:
+            self._offset = offset
+            self.redraw()
+
+
+#################################### Tests #####################################
+def test_build_view_index(add_breakpoint:bool=False):
+    # Tests if `build_view_index` filters and sorts without moving the data
+    names = ["c", "a", "d", "b"]
+    values = [3, 1, 4, 2]
+
+    if add_breakpoint:
+        breakpoint()
+
+    msg = "Failed! `build_view_index` doesn't keep the model's order."
+    assert list(build_view_index(4)) == [0, 1, 2, 3], msg
+    msg = "Failed! `build_view_index` doesn't sort correctly."
+    assert list(build_view_index(4, sort_column=names)) == [1, 3, 0, 2], msg
+    assert list(build_view_index(4, sort_column=values,
+                                 reverse=True)) == [2, 0, 3, 1], msg
+    msg = "Failed! `build_view_index` doesn't filter correctly."
+    view = build_view_index(4, values, lambda value: value > 1, names)
+    assert list(view) == [3, 0, 2], msg
+    assert names == ["c", "a", "d", "b"], msg
+
+
+def test():
+    from sys import stderr
+    tests = (test_build_view_index, )
+    for _test in tests:
+        stderr.write(f"[Debug]: Testing {_test.__name__}:\n")
+        _test()
+        stderr.write(f"[Debug]: Test passed.\n")
+    stderr.write(f"[Debug]: All tests passed.\n")
+
+
+if __name__ == "__main__":
+    test()
@@ -0,0 +1,310 @@
+from __future__ import annotations
+from textbuffer import PieceTable
+from widget import Widget
+from event import Event
+import constants
+
+import pygame
+
+
+class Text(Widget):
+    """
+    An editable multi-line text widget. The text is kept in a `PieceTable`
+    so a key press costs O(log(number of edits)) and not O(document).
+    Only the lines that can be seen are ever rendered. The surfaces are
+    cached by their text so a key press only renders the line it changed.
+
+    Indices can be offsets (`int`), "line.column" (lines start from 1 like
+    in tkinter), "insert" or "end".
+    """
+    __slots__ = ("_buffer", "_font", "_line_height", "_padx", "_pady",
+                 "_insert", "_surfaces", "_offset")
+    _class_bindings = {"<KeyPress>": ("_handle_key", ),
+                       "<ButtonPress-1>": ("_handle_click", ),
+                       "<Button-4>": ("_scroll_up", ),
+                       "<Button-5>": ("_scroll_down", ),
+                       "<FocusIn>": ("_handle_focus_change", ),
+                       "<FocusOut>": ("_handle_focus_change", )}
+
+    def __init__(self, master, text:str="", font:tuple=None, width:int=400,
+                 height:int=200, padx:int=5, pady:int=5, fg:str="white",
+                 bg:str="black", **kwargs):
+        super().__init__(master, width=width, height=height, fg=fg, bg=bg,
+                         **kwargs)
+        if font is None:
+            font = ("", 20)
+        self._font = constants.parse_font(font)
+        self._line_height = self._font.get_linesize()
+        self._padx = padx
+        self._pady = pady
+
+        self._buffer = PieceTable(text)
+        self._insert = 0 # The offset of the insert cursor
+        self._offset = 0 # The first line that can be seen
+        self._surfaces = {} # {line's text: pygame.Surface}
+
+    # Standard:
+    def _update_height(self, new_height:int) -> None:
+        super()._update_height(new_height)
+        self._offset = max(0, min(self._offset, self._get_max_offset()))
+
+    def _drop_caches(self) -> None:
+        self._surfaces.clear()
+
+    def redraw(self) -> (int, int, int, int):
+        rect = self._get_rect()
+        old_clip = self._clip_to_self()
+        if old_clip is None:
+            return tuple(rect)
+        backend = self._root._backend
+        if self._bg is not None:
+            backend.fill_rect(self._bg, rect)
+
+        # Only keep the surfaces of the lines that can be seen
+        surfaces = {}
+        x, y = rect.x + self._padx, rect.y + self._pady
+        first, last = self._get_line_range()
+        for line in range(first, last):
+            text = self._buffer.get_line(line)
+            surface = self._surfaces.get(text, None)
+            if surface is None:
+                surface = self._font.render(text, False, self._fg)
+            surfaces[text] = surface
+            backend.blit(surface, (x, y))
+            y += self._line_height
+        self._surfaces = surfaces
+
+        if self._root._focused_widget is self:
+            line, column = self._get_line_column(self._insert)
+            if first <= line < last:
+                text = self._buffer.get_line(line)
+                x += self._font.size(text[:column])[0]
+                y = rect.y + self._pady + (line - first)*self._line_height
+                backend.draw_line(self._fg, (x, y),
+                                  (x, y + self._line_height - 1), 1)
+
+        backend.set_clip(old_clip)
+        return tuple(rect)
+
+    def config(self, fg:str=None, **kwargs) -> None:
+        super().config(fg=fg, **kwargs)
+        if fg is not None:
+            self._surfaces.clear()
+        if len(tuple(filter(None, (fg, *kwargs.values())))) != 0:
+            self.redraw()
+
+    # User can call these:
+    def insert(self, index, text:str) -> None:
+        offset = self._parse_index(index)
+        first_line = self._buffer.line_from_offset(offset)
+        self._buffer.insert(offset, text)
+        if self._insert >= offset:
+            self._insert += len(text)
+        self._text_changed(first_line, "\n" in text)
+
+    def delete(self, index1, index2=None) -> None:
+        start = self._parse_index(index1)
+        if index2 is None:
+            end = start + 1
+        else:
+            end = self._parse_index(index2)
+        first_line = self._buffer.line_from_offset(start)
+        deleted = self._buffer.delete(start, end)
+        if self._insert >= end:
+            self._insert -= len(deleted)
+        elif self._insert > start:
+            self._insert = start
+        self._text_changed(first_line, "\n" in deleted)
+
+    def get(self, index1="1.0", index2="end") -> str:
+        return self._buffer.get_text(self._parse_index(index1),
+                                     self._parse_index(index2))
+
+    def index(self, index) -> str:
+        line, column = self._get_line_column(self._parse_index(index))
+        return f"{line+1}.{column}"
+
+    def mark_set(self, mark:str, index) -> None:
+        if mark != "insert":
+            raise ValueError("Only the \"insert\" mark is supported")
+        self._move_insert(self._parse_index(index))
+
+    def see(self, index) -> None:
+        line = self._buffer.line_from_offset(self._parse_index(index))
+        if line < self._offset:
+            self._set_offset(line)
+        elif line >= self._offset + self._get_shown_rows():
+            self._set_offset(line - self._get_shown_rows() + 1)
+
+    def yview_scroll(self, number:int, what:str="units") -> None:
+        if what == "pixels":
+            number //= self._line_height
+        elif what != "units":
+            raise ValueError(f"Unknown value for `what`: \"{what}\"")
+        self._set_offset(self._offset + number)
+
+    # Helpers:
+    def _parse_index(self, index) -> int:
+        length = len(self._buffer)
+        if isinstance(index, int):
+            return max(0, min(length, index))
+        if index == "insert":
+            return self._insert
+        if index == "end":
+            return length
+        if isinstance(index, str) and ("." in index):
+            line, column = index.split(".")
+            line = int(line) - 1
+            start = self._buffer.line_start(line)
+            end = self._buffer.line_end(line)
+            if column == "end":
+                return end
+            return min(end, start + int(column))
+        raise ValueError(f"Invalid index: {repr(index)}")
+
+    def _get_line_column(self, offset:int) -> (int, int):
+        line = self._buffer.line_from_offset(offset)
+        return line, offset - self._buffer.line_start(line)
+
+    def _get_shown_rows(self) -> int:
+        return max(1, (self._height - 2*self._pady)//self._line_height)
+
+    def _get_max_offset(self) -> int:
+        return max(0, self._buffer.line_count() - self._get_shown_rows())
+
+    def _get_line_range(self) -> (int, int):
+        last = self._offset + self._get_shown_rows() + 1
+        return self._offset, min(self._buffer.line_count(), last)
+
+    def _redraw_lines(self, first:int, last:int) -> None:
+        # Only redraws the lines from `first` to `last` (not included)
+        y1 = self._pady + (first - self._offset)*self._line_height
+        y2 = self._pady + (last - self._offset)*self._line_height
+        self.redraw_region(0, max(0, y1), self._width, min(self._height, y2))
+
+    def _text_changed(self, first_line:int, lines_changed:bool) -> None:
+        old_offset = self._offset
+        self.see("insert")
+        if lines_changed or (self._offset != old_offset):
+            # All of the lines after `first_line` moved
+            self._redraw_lines(first_line, self._offset + self._get_shown_rows()
+                                           + 1)
+        else:
+            self._redraw_lines(first_line, first_line + 1)
+
+    def _move_insert(self, offset:int) -> None:
+        old_line = self._buffer.line_from_offset(self._insert)
+        self._insert = max(0, min(len(self._buffer), offset))
+        new_line = self._buffer.line_from_offset(self._insert)
+        old_offset = self._offset
+        self.see("insert")
+        if self._offset == old_offset:
+            self._redraw_lines(old_line, old_line + 1)
+            self._redraw_lines(new_line, new_line + 1)
+
+    def _set_offset(self, offset:int) -> None:
+        offset = max(0, min(offset, self._get_max_offset()))
+        if offset != self._offset:
+            self._offset = offset
+            self.redraw()
+
+    def _get_offset_from_xy(self, x:int, y:int) -> int:
+        # `x` and `y` are relative to the widget
+        line = self._offset + max(0, y - self._pady)//self._line_height
+        line = min(line, self._buffer.line_count() - 1)
+        text = self._buffer.get_line(line)
+        # Find the column closest to `x`
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high)//2
+            if self._font.size(text[:middle+1])[0] < x - self._padx:
+                low = middle + 1
+            else:
+                high = middle
+        return self._buffer.line_start(line) + low
+
+    def _handle_click(self, event:Event) -> str:
+        self.focus()
+        x, y = self._get_abs_position()
+        self._move_insert(self._get_offset_from_xy(event.x - x, event.y - y))
+        return "break"
+
+    def _handle_focus_change(self, event:Event) -> str:
+        # Show/hide the insert cursor
+        line = self._buffer.line_from_offset(self._insert)
+        self._redraw_lines(line, line + 1)
+
+    def _scroll_up(self, event:Event) -> str:
+        self.yview_scroll(-1)
+        return "break"
+
+    def _scroll_down(self, event:Event) -> str:
+        self.yview_scroll(1)
+        return "break"
+
+    def _handle_key(self, event:Event) -> str:
+        name = event.names[0]
+        if name == "<Left>":
+            self._move_insert(self._insert - 1)
+        elif name == "<Right>":
+            self._move_insert(self._insert + 1)
+        elif name in ("<Up>", "<Down>"):
+            line, column = self._get_line_column(self._insert)
+            line += -1 if name == "<Up>" else 1
+            if 0 <= line < self._buffer.line_count():
+                self._move_insert(self._parse_index(f"{line+1}.{column}"))
+        elif name == "<Home>":
+            line = self._buffer.line_from_offset(self._insert)
+            self._move_insert(self._buffer.line_start(line))
+        elif name == "<End>":
+            line = self._buffer.line_from_offset(self._insert)
+            self._move_insert(self._buffer.line_end(line))
+        elif name == "<Backspace>":
+            if self._insert > 0:
+                self.delete(self._insert - 1, self._insert)
+        elif name == "<Delete>":
+            self.delete(self._insert, self._insert + 1)
+        elif name == "<Return>":
+            self.insert("insert", "\n")
+        elif name == "<Tab>":
+            self.insert("insert", "    ")
+        elif (event.char is not None) and (len(event.char) == 1) and \
+             event.char.isprintable() and \
+             not (getattr(event, "mods", 0) & (pygame.KMOD_CTRL |
+                                               pygame.KMOD_ALT)):
+            self.insert("insert", event.char)
+        else:
+            return None
+        return "break"
+
+
+class Entry(Text):
+    """
+    A single line `Text`. Indices are offsets, "insert" or "end".
+    `<Return>` isn't handled so it can be bound by the user.
+    """
+    __slots__ = ()
+
+    def __init__(self, master, text:str="", width:int=200, pady:int=5,
+                 **kwargs):
+        text = text.replace("\n", "")
+        super().__init__(master, text=text, width=width, height=0, pady=pady,
+                         **kwargs)
+        super().config(height=self._line_height + 2*pady)
+
+    def insert(self, index, text:str) -> None:
+        super().insert(index, text.replace("\n", ""))
+
+    def delete(self, first, last=None) -> None:
+        super().delete(first, last)
+
+    def get(self) -> str:
+        return self._buffer.get_text()
+
+    def icursor(self, index) -> None:
+        self.mark_set("insert", index)
+
+    def _handle_key(self, event:Event) -> str:
+        if event.names[0] in ("<Return>", "<Up>", "<Down>", "<Tab>"):
+            return None
+        return super()._handle_key(event)
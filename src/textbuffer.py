@@ -0,0 +1,335 @@
+from __future__ import annotations
+from bisect import bisect_left
+from random import random
+from array import array
+
+
+# New text is appended to an add chunk until it's this long
+ADD_CHUNK_SIZE = 4096
+
+
+class Chunk:
+    # Text that pieces point into. The positions of the "\n"s are stored
+    # so pieces can count/find lines without looking at the text.
+    __slots__ = ("text", "newlines")
+
+    def __init__(self, text:str=""):
+        self.text = ""
+        self.newlines = array("q")
+        self.append(text)
+
+    def append(self, text:str) -> int:
+        # Returns where `text` starts inside the chunk
+        start = len(self.text)
+        self.text += text
+        newline = text.find("\n")
+        while newline != -1:
+            self.newlines.append(start + newline)
+            newline = text.find("\n", newline+1)
+        return start
+
+    def count_newlines(self, start:int, end:int) -> int:
+        return bisect_left(self.newlines, end) - \
+               bisect_left(self.newlines, start)
+
+
+class Piece:
+    # A node in a treap ordered by position in the document. Each node also
+    # knows the length/number of newlines of its whole subtree.
+    __slots__ = ("chunk", "start", "length", "newlines", "priority", "left",
+                 "right", "total_length", "total_newlines")
+
+    def __init__(self, chunk:Chunk, start:int, length:int,
+                 priority:float=None):
+        self.chunk = chunk
+        self.start = start
+        self.length = length
+        self.newlines = chunk.count_newlines(start, start+length)
+        if priority is None:
+            priority = random()
+        self.priority = priority
+        self.left = self.right = None
+        self.total_length = length
+        self.total_newlines = self.newlines
+
+    def update(self) -> None:
+        self.total_length = self.length
+        self.total_newlines = self.newlines
+        if self.left is not None:
+            self.total_length += self.left.total_length
+            self.total_newlines += self.left.total_newlines
+        if self.right is not None:
+            self.total_length += self.right.total_length
+            self.total_newlines += self.right.total_newlines
+
+
+def _length(node:Piece) -> int:
+    return 0 if node is None else node.total_length
+
+
+def _newlines(node:Piece) -> int:
+    return 0 if node is None else node.total_newlines
+
+
+def _split(node:Piece, offset:int) -> (Piece, Piece):
+    # Splits the tree so that the left part has `offset` characters
+    if node is None:
+        return None, None
+    left_length = _length(node.left)
+    if offset <= left_length:
+        left, node.left = _split(node.left, offset)
+        node.update()
+        return left, node
+    offset -= left_length
+    if offset >= node.length:
+        node.right, right = _split(node.right, offset - node.length)
+        node.update()
+        return node, right
+    # The split is inside of this piece so cut it in 2
+    right = Piece(node.chunk, node.start+offset, node.length-offset,
+                  node.priority)
+    right.right, node.right = node.right, None
+    node.length = offset
+    node.newlines = node.chunk.count_newlines(node.start, node.start+offset)
+    right.update()
+    node.update()
+    return node, right
+
+
+def _merge(left:Piece, right:Piece) -> Piece:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.update()
+        return left
+    right.left = _merge(left, right.left)
+    right.update()
+    return right
+
+
+class PieceTable:
+    """
+    A text buffer that never moves the text around. The document is a list
+    of pieces that point into the original text or into add chunks (where
+    inserted text goes). The pieces are kept in a treap so inserting,
+    deleting and going from line numbers to offsets (or back) are all
+    O(log(number of pieces)).
+
+    Lines and offsets start from 0.
+    """
+    def __init__(self, text:str=""):
+        self._root = None
+        self._add_chunk = Chunk()
+        if text != "":
+            chunk = Chunk(text)
+            self._root = Piece(chunk, 0, len(text))
+
+    def __len__(self) -> int:
+        return _length(self._root)
+
+    def insert(self, offset:int, text:str) -> None:
+        if text == "":
+            return None
+        if not (0 <= offset <= len(self)):
+            raise IndexError(f"Offset out of range: {offset}")
+        if self._extend_piece(offset, text):
+            return None
+        if len(self._add_chunk.text) + len(text) > ADD_CHUNK_SIZE:
+            self._add_chunk = Chunk()
+        start = self._add_chunk.append(text)
+        piece = Piece(self._add_chunk, start, len(text))
+        left, right = _split(self._root, offset)
+        self._root = _merge(_merge(left, piece), right)
+
+    def delete(self, start:int, end:int) -> str:
+        # Returns the deleted text
+        start, end = max(0, start), min(len(self), end)
+        if start >= end:
+            return ""
+        left, right = _split(self._root, start)
+        middle, right = _split(right, end - start)
+        self._root = _merge(left, right)
+        output = []
+        self._get_text(middle, 0, end - start, output)
+        return "".join(output)
+
+    def get_text(self, start:int=0, end:int=None) -> str:
+        if end is None:
+            end = len(self)
+        start, end = max(0, start), min(len(self), end)
+        if start >= end:
+            return ""
+        output = []
+        self._get_text(self._root, start, end, output)
+        return "".join(output)
+
+    def line_count(self) -> int:
+        return _newlines(self._root) + 1
+
+    def line_start(self, line:int) -> int:
+        if line <= 0:
+            return 0
+        if line >= self.line_count():
+            return len(self)
+        return self._find_newline(line - 1) + 1
+
+    def line_end(self, line:int) -> int:
+        # The offset of the "\n" at the end of the line (or the end)
+        if line >= self.line_count() - 1:
+            return len(self)
+        return self._find_newline(max(0, line))
+
+    def get_line(self, line:int) -> str:
+        return self.get_text(self.line_start(line), self.line_end(line))
+
+    def line_from_offset(self, offset:int) -> int:
+        # The number of "\n"s before `offset`
+        node, line = self._root, 0
+        while node is not None:
+            left_length = _length(node.left)
+            if offset < left_length:
+                node = node.left
+                continue
+            line += _newlines(node.left)
+            offset -= left_length
+            if offset < node.length:
+                return line + node.chunk.count_newlines(node.start,
+                                                        node.start+offset)
+            line += node.newlines
+            offset -= node.length
+            node = node.right
+        return line
+
+    # Helpers:
+    def _extend_piece(self, offset:int, text:str) -> bool:
+        """
+        If the piece that ends at `offset` also ends at the end of the add
+        chunk (the user is typing), the text is added to that piece instead
+        of creating a new piece. Returns if it worked.
+        """
+        chunk = self._add_chunk
+        if len(chunk.text) + len(text) > ADD_CHUNK_SIZE:
+            return False
+        path, node = [], self._root
+        while node is not None:
+            path.append(node)
+            left_length = _length(node.left)
+            if offset <= left_length:
+                node = node.left
+            elif offset < left_length + node.length:
+                return False
+            elif offset == left_length + node.length:
+                break
+            else:
+                offset -= left_length + node.length
+                node = node.right
+        if (node is None) or (node.chunk is not chunk) or \
+           (node.start + node.length != len(chunk.text)):
+            return False
+        chunk.append(text)
+        node.length += len(text)
+        node.newlines = chunk.count_newlines(node.start,
+                                             node.start+node.length)
+        for node in reversed(path):
+            node.update()
+        return True
+
+    def _find_newline(self, index:int) -> int:
+        # Returns the offset of the `index`th "\n" in the document
+        node, base = self._root, 0
+        while node is not None:
+            left_newlines = _newlines(node.left)
+            if index < left_newlines:
+                node = node.left
+                continue
+            index -= left_newlines
+            base += _length(node.left)
+            if index < node.newlines:
+                newlines = node.chunk.newlines
+                first = bisect_left(newlines, node.start)
+                return base + newlines[first+index] - node.start
+            index -= node.newlines
+            base += node.length
+            node = node.right
+        raise IndexError("Not enough lines")
+
+    def _get_text(self, node:Piece, start:int, end:int, output:list) -> None:
+        # Adds the text between `start` and `end` (relative to `node`)
+        if (node is None) or (start >= end):
+            return None
+        left_length = _length(node.left)
+        if start < left_length:
+            self._get_text(node.left, start, min(end, left_length), output)
+        piece_start = max(0, start - left_length)
+        piece_end = min(node.length, end - left_length)
+        if piece_start < piece_end:
+            output.append(node.chunk.text[node.start+piece_start:
+                                          node.start+piece_end])
+        right_start = left_length + node.length
+        if end > right_start:
+            self._get_text(node.right, max(0, start - right_start),
+                           end - right_start, output)
+
+
+#################################### Tests #####################################
+def test_piece_table_edits(add_breakpoint:bool=False):
+    # Tests if `PieceTable` inserts and deletes like a normal string would
+    from random import Random
+    rng = Random(0)
+    text = "hello\nworld\n"
+    table = PieceTable(text)
+    for _ in range(300):
+        offset = rng.randint(0, len(text))
+        if rng.random() < 0.6:
+            new = rng.choice(("a", "bc\n", "\n", "xyz"))
+            table.insert(offset, new)
+            text = text[:offset] + new + text[offset:]
+        else:
+            end = offset + rng.randint(0, 5)
+            assert table.delete(offset, end) == text[offset:end]
+            text = text[:offset] + text[end:]
+
+    if add_breakpoint:
+        breakpoint()
+
+    msg = "Failed! <PieceTable> doesn't keep the text correct."
+    assert table.get_text() == text, msg
+    assert table.get_text(3, 20) == text[3:20], msg
+    assert len(table) == len(text), msg
+
+
+def test_piece_table_lines(add_breakpoint:bool=False):
+    # Tests if the line index of `PieceTable` agrees with `str.split`
+    table = PieceTable("first\nsecond\n\nfourth")
+    table.insert(8, "XX\nYY")
+    lines = table.get_text().split("\n")
+
+    if add_breakpoint:
+        breakpoint()
+
+    msg = "Failed! <PieceTable> doesn't find lines correctly."
+    assert table.line_count() == len(lines), msg
+    for line, expected in enumerate(lines):
+        assert table.get_line(line) == expected, msg
+
+    msg = "Failed! <PieceTable>.line_from_offset is wrong."
+    text = table.get_text()
+    for offset in range(len(text)+1):
+        assert table.line_from_offset(offset) == text[:offset].count("\n"), msg
+
+
+def test():
+    from sys import stderr
+    tests = (test_piece_table_edits, test_piece_table_lines)
+    for _test in tests:
+        stderr.write(f"[Debug]: Testing {_test.__name__}:\n")
+        _test()
+        stderr.write(f"[Debug]: Test passed.\n")
+    stderr.write(f"[Debug]: All tests passed.\n")
+
+
+if __name__ == "__main__":
+    test()
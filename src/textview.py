@@ -0,0 +1,266 @@
+from __future__ import annotations
+from collections import deque
+from widget import Widget
+from event import Event
+import constants
+
+
+def wrap_line(font, line:str, width:int) -> [str, ...]:
+    """
+    Splits `line` into pieces that are at most `width` pixels wide when
+    rendered with `font`. It tries to split after spaces. The spaces are
+    kept at the end of the pieces so `"".join(pieces) == line`.
+    """
+    if (width <= 0) or (font.size(line)[0] <= width):
+        return [line]
+    pieces = []
+    while line != "":
+        if font.size(line)[0] <= width:
+            pieces.append(line)
+            break
+        # Find the longest start of `line` that fits
+        low, high = 1, len(line)
+        while low < high:
+            middle = (low + high + 1)//2
+            if font.size(line[:middle])[0] <= width:
+                low = middle
+            else:
+                high = middle - 1
+        end = low
+        if line[end] == " ":
+            end += 1
+        else:
+            space = line.rfind(" ", 0, end)
+            if space != -1:
+                end = space + 1
+        pieces.append(line[:end])
+        line = line[end:]
+    return pieces
+
+
+class TextView(Widget):
+    """
+    Shows multi-line text that is wrapped to the width of the widget. Each
+    row is rendered once (when it's first seen) and the surface is cached.
+    `append` only wraps and renders the new text so tailing a log is cheap.
+
+    Only the last `max_lines` rows are kept. If the view is scrolled to the
+    bottom, it follows the new text.
+    """
+    __slots__ = ("_font", "_line_height", "_padx", "_pady", "_wrap", "_follow",
+                 "_rows", "_offset")
+    _class_bindings = {"<Button-4>": ("_scroll_up", ),
+                       "<Button-5>": ("_scroll_down", )}
+
+    def __init__(self, master, text:str="", font:tuple=None, width:int=400,
+                 height:int=200, wrap:bool=True, max_lines:int=10000,
+                 padx:int=5, pady:int=5, fg:str="white", bg:str="black",
+                 **kwargs):
+        super().__init__(master, width=width, height=height, fg=fg, bg=bg,
+                         **kwargs)
+        if font is None:
+            font = ("", 20)
+        self._font = constants.parse_font(font)
+        self._line_height = self._font.get_linesize()
+        self._wrap = wrap
+        self._padx = padx
+        self._pady = pady
+        # Each row is `[text, ends_line, surface]`. `ends_line` is `False`
+        # if the line continues in the next row (it was wrapped or it's the
+        # last line and doesn't end with "\n" yet). `surface` is `None`
+        # until the row is drawn.
+        self._rows = deque(maxlen=max_lines)
+        self._offset = 0 # The first row that can be seen
+        self._follow = True
+        self.append(text, redraw=False)
+
+    def _scroll_up(self, event:Event) -> str:
+        self.yview_scroll(-1)
+        return "break"
+
+    def _scroll_down(self, event:Event) -> str:
+        self.yview_scroll(1)
+        return "break"
+
+    # Standard:
+    def _update_width(self, new_width:int) -> None:
+        old_width = self._width
+        super()._update_width(new_width)
+        if self._wrap and (old_width != new_width):
+            self._relayout()
+
+    def _update_height(self, new_height:int) -> None:
+        super()._update_height(new_height)
+        self._fix_offset()
+
+    def _drop_caches(self) -> None:
+        for row in self._rows:
+            row[2] = None
+
+    def redraw(self) -> (int, int, int, int):
+        rect = self._get_rect()
+        old_clip = self._clip_to_self()
+        if old_clip is None:
+            return tuple(rect)
+        backend = self._root._backend
+        if self._bg is not None:
+            backend.fill_rect(self._bg, rect)
+
+        x = rect.x + self._padx
+        y = rect.y + self._pady
+        last = min(len(self._rows), self._offset + self._get_shown_rows() + 1)
+        for index in range(self._offset, last):
+            row = self._rows[index]
+            if row[2] is None:
+                row[2] = self._font.render(row[0], False, self._fg)
+            backend.blit(row[2], (x, y))
+            y += self._line_height
+
+        backend.set_clip(old_clip)
+        return tuple(rect)
+
+    def config(self, text:str=None, fg:str=None, **kwargs) -> None:
+        super().config(fg=fg, **kwargs)
+        if fg is not None:
+            for row in self._rows:
+                row[2] = None
+        if text is not None:
+            self._rows.clear()
+            self._offset = 0
+            self._follow = True
+            self.append(text, redraw=False)
+        if len(tuple(filter(None, (text, fg, *kwargs.values())))) != 0:
+            self.redraw()
+
+    # User can call these:
+    def append(self, text:str, redraw:bool=True) -> None:
+        if text == "":
+            return None
+        rows = self._rows
+        # Take back the last line if it hasn't ended yet
+        pieces = []
+        while (len(rows) != 0) and (not rows[-1][1]):
+            pieces.append(rows.pop()[0])
+        text = "".join(reversed(pieces)) + text
+        kept = len(rows)
+
+        added = 0
+        lines = text.split("\n")
+        for line in lines[:-1]:
+            added += self._add_line(line, True)
+        if lines[-1] != "":
+            added += self._add_line(lines[-1], False)
+
+        # Rows that fell off the start because of `max_lines`
+        dropped = kept + added - len(rows)
+        self._offset -= dropped
+        self._fix_offset()
+        if redraw:
+            self.redraw()
+
+    def get(self) -> str:
+        # Returns the text that is still kept
+        output = []
+        for text, ends_line, _ in self._rows:
+            output.append(text)
+            if ends_line:
+                output.append("\n")
+        return "".join(output)
+
+    def yview_scroll(self, number:int, what:str="units") -> None:
+        if what == "pixels":
+            number //= self._line_height
+        elif what != "units":
+            raise ValueError(f"Unknown value for `what`: \"{what}\"")
+        self._set_offset(self._offset + number)
+
+    def yview_moveto(self, fraction:float) -> None:
+        self._set_offset(int(fraction*len(self._rows)))
+
+    def yview(self) -> (float, float):
+        if len(self._rows) == 0:
+            return (0.0, 1.0)
+        last = self._offset + self._get_shown_rows()
+        return (self._offset/len(self._rows), min(1.0, last/len(self._rows)))
+
+    # Helpers:
+    def _get_wrap_width(self) -> int:
+        if not self._wrap:
+            return 0
+        return self._width - 2*self._padx
+
+    def _add_line(self, line:str, ends_line:bool) -> int:
+        # Returns the number of rows added
+        pieces = wrap_line(self._font, line, self._get_wrap_width())
+        for piece in pieces[:-1]:
+            self._rows.append([piece, False, None])
+        self._rows.append([pieces[-1], ends_line, None])
+        return len(pieces)
+
+    def _relayout(self) -> None:
+        text = self.get()
+        offset, old_rows = self._offset, len(self._rows)
+        self._rows.clear()
+        self.append(text, redraw=False)
+        if not self._follow:
+            # Try to keep the same part of the text in view
+            self._offset = offset*len(self._rows)//max(1, old_rows)
+            self._fix_offset()
+
+    def _get_shown_rows(self) -> int:
+        return max(0, (self._height - 2*self._pady)//self._line_height)
+
+    def _get_max_offset(self) -> int:
+        return max(0, len(self._rows) - self._get_shown_rows())
+
+    def _fix_offset(self) -> None:
+        if self._follow:
+            self._offset = self._get_max_offset()
+        else:
+            self._offset = max(0, min(self._offset, self._get_max_offset()))
+
+    def _set_offset(self, offset:int) -> None:
+        offset = max(0, min(offset, self._get_max_offset()))
+        self._follow = (offset == self._get_max_offset())
+        if offset != self._offset:
+            self._offset = offset
+            self.redraw()
+
+
+#################################### Tests #####################################
+def test_wrap_line(add_breakpoint:bool=False):
+    # Tests if `wrap_line` splits lines after spaces and never loses text
+    class Font:
+        # Every character is 10 pixels wide
+        def size(self, text:str) -> (int, int):
+            return (len(text)*10, 10)
+
+    font = Font()
+    if add_breakpoint:
+        breakpoint()
+
+    msg = "Failed! `wrap_line` shouldn't split lines that fit."
+    assert wrap_line(font, "hello world", 200) == ["hello world"], msg
+    assert wrap_line(font, "hello world", 0) == ["hello world"], msg
+
+    msg = "Failed! `wrap_line` doesn't split after spaces."
+    assert wrap_line(font, "hello world foo", 80) == ["hello ", "world ",
+                                                      "foo"], msg
+    assert wrap_line(font, "hello world", 50) == ["hello ", "world"], msg
+
+    msg = "Failed! `wrap_line` doesn't split long words."
+    assert wrap_line(font, "abcdefgh", 30) == ["abc", "def", "gh"], msg
+
+
+def test():
+    from sys import stderr
+    tests = (test_wrap_line, )
+    for _test in tests:
+        stderr.write(f"[Debug]: Testing {_test.__name__}:\n")
+        _test()
+        stderr.write(f"[Debug]: Test passed.\n")
+    stderr.write(f"[Debug]: All tests passed.\n")
+
+
+if __name__ == "__main__":
+    test()
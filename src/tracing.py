@@ -0,0 +1,121 @@
+from __future__ import annotations
+from time import perf_counter
+from array import array
+from math import ceil
+
+
+STAGES = ("received", "translated", "dispatched", "handled", "presented")
+RECEIVED, TRANSLATED, DISPATCHED, HANDLED, PRESENTED = range(len(STAGES))
+
+
+def percentile(values:list, p:float) -> float:
+    # `values` must be sorted. Uses the nearest rank
+    if len(values) == 0:
+        return 0.0
+    return values[max(0, ceil(p/100*len(values)) - 1)]
+
+
+class EventTracer:
+    """
+    Saves when each event from SDL went through each stage (look at
+    `STAGES`) in a ring buffer so only the last `size` events are kept:
+        "received":   taken from SDL's queue (pygame doesn't give us SDL's
+                      own timestamps)
+        "translated": turned into an `Event`
+        "dispatched": the widget that gets the event was found
+        "handled":    all of the bound functions returned
+        "presented":  the frame that shows the result was presented
+    The times come from `time.perf_counter` (in seconds). The records are
+    kept in one `array` so tracing doesn't create objects for each event.
+    """
+    def __init__(self, size:int=4096):
+        if size < 1:
+            raise ValueError("The size must be at least 1")
+        self.size = size
+        self.names = [None]*size
+        self.times = array("d", bytes(8*len(STAGES)*size))
+        self.next = 0 # The number of events traced so far
+        self.unpresented = 0 # The first event without a "presented" time
+        self.received_time = 0.0
+        self.current = None # Where the event being handled is in `times`
+
+    def events_received(self) -> None:
+        # Call right before taking this frame's events from SDL
+        self.received_time = perf_counter()
+
+    def start(self, name:str) -> None:
+        # Call after the event is translated
+        now = perf_counter()
+        slot = self.next % self.size
+        self.names[slot] = name
+        self.current = index = slot*len(STAGES)
+        self.times[index+RECEIVED] = self.received_time
+        self.times[index+TRANSLATED] = now
+        for stage in (DISPATCHED, HANDLED, PRESENTED):
+            self.times[index+stage] = 0.0
+        self.next += 1
+
+    def stamp(self, stage:int) -> None:
+        if self.current is not None:
+            self.times[self.current+stage] = perf_counter()
+
+    def dispatched(self) -> None:
+        # Call after the widget that gets the event is found
+        self.stamp(DISPATCHED)
+
+    def end(self) -> None:
+        self.stamp(HANDLED)
+        self.current = None
+
+    def presented(self) -> None:
+        # Call after the frame is presented
+        now = perf_counter()
+        for i in range(max(self.unpresented, self.next - self.size),
+                       self.next):
+            self.times[(i % self.size)*len(STAGES) + PRESENTED] = now
+        self.unpresented = self.next
+
+    def records(self, name:str=None) -> list:
+        """
+        Returns [(event name, (time for each stage, ...)), ...] from the
+        oldest to the newest event. Stages that didn't happen are 0.0. If
+        `name` isn't `None`, only the events with that name are returned.
+        """
+        output = []
+        for i in range(max(0, self.next - self.size), self.next):
+            slot = i % self.size
+            if (name is None) or (self.names[slot] == name):
+                index = slot*len(STAGES)
+                output.append((self.names[slot],
+                               tuple(self.times[index:index+len(STAGES)])))
+        return output
+
+    def summary(self, name:str=None) -> dict:
+        """
+        Returns {"count": int, stage: {"p50": ms, "p90": ms, "p99": ms,
+                                       "max": ms}, ..., "total": {...}}
+        for the events that were presented. Each stage's times are from
+        the stage before it and "total" is from "received" to "presented".
+        For example: `summary("<Button-1>")["total"]["p99"]`
+        """
+        durations = [[] for stage in STAGES[1:]]
+        totals = []
+        for event_name, times in self.records(name):
+            if times[PRESENTED] == 0:
+                continue
+            last = times[RECEIVED]
+            for stage in range(1, len(STAGES)):
+                # Skipped stages take no time
+                time = times[stage] or last
+                durations[stage-1].append((time - last)*1000)
+                last = time
+            totals.append((times[PRESENTED] - times[RECEIVED])*1000)
+
+        output = {"count": len(totals)}
+        for stage, values in zip((*STAGES[1:], "total"), (*durations, totals)):
+            values.sort()
+            output[stage] = {"p50": percentile(values, 50),
+                             "p90": percentile(values, 90),
+                             "p99": percentile(values, 99),
+                             "max": values[-1] if len(values) != 0 else 0.0}
+        return output
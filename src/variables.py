@@ -0,0 +1,124 @@
+from __future__ import annotations
+from layout import apply_changes
+from sys import stderr
+import traceback
+
+
+class Variable:
+    """
+    Like tkinter's variables. `set` only saves the value and marks the
+    variable as changed. The widgets that use it (through `textvariable`)
+    are updated once per frame by `VariableHandler` and only if their text
+    is different.
+
+    Functions defined:
+        get()
+        set(value) -> None
+        trace_add(mode:str, callback) -> str
+        trace_remove(mode:str, name:str) -> None
+        trace_info() -> list
+    """
+    _type = str
+    _default = ""
+    _count = 0
+
+    def __init__(self, master=None, value=None, name:str=None):
+        self._root = None if master is None else master._root
+        if value is None:
+            value = self._default
+        self._value = self._type(value)
+        if name is None:
+            Variable._count += 1
+            name = f"PY_VAR{Variable._count}"
+        self._name = name
+        self._widgets = [] # The widgets that use us as their `textvariable`
+        self._traces = {} # {name: callback}
+        self._dirty = False
+
+    def __str__(self) -> str:
+        return self._name
+
+    def get(self):
+        return self._value
+
+    def set(self, value) -> None:
+        value = self._type(value)
+        if value == self._value:
+            return None
+        self._value = value
+        if (not self._dirty) and (len(self._widgets) != 0):
+            self._dirty = True
+            self._root._variable_handler.changed.append(self)
+        for callback in tuple(self._traces.values()):
+            try:
+                callback(self._name, "", "write")
+            except Exception as error:
+                stderr.write("An exception occured in a variable's trace\n")
+                traceback.print_exc()
+
+    def trace_add(self, mode:str, callback) -> str:
+        # `callback(name, index, mode)` is called when the value changes
+        if mode != "write":
+            raise ValueError("Only the \"write\" mode is supported")
+        name = f"{self._name}_trace{len(self._traces)}"
+        while name in self._traces:
+            name += "_"
+        self._traces[name] = callback
+        return name
+
+    def trace_remove(self, mode:str, name:str) -> None:
+        self._traces.pop(name, None)
+
+    def trace_info(self) -> list:
+        return [(("write", ), name) for name in self._traces]
+
+    def _add_widget(self, widget) -> None:
+        self._root = widget._root
+        if self._root._variable_handler is None:
+            self._root._variable_handler = VariableHandler(self._root)
+        if widget not in self._widgets:
+            self._widgets.append(widget)
+
+    def _remove_widget(self, widget) -> None:
+        if widget in self._widgets:
+            self._widgets.remove(widget)
+
+
+class StringVar(Variable):
+    _type = str
+    _default = ""
+
+
+class IntVar(Variable):
+    _type = int
+    _default = 0
+
+
+class DoubleVar(Variable):
+    _type = float
+    _default = 0.0
+
+
+class VariableHandler:
+    """
+    Updates the widgets of the variables that changed once per frame (from
+    `Tk.mainloop`). All of the new texts are applied together by
+    `layout.apply_changes` so the layout runs at most once per frame.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.changed = [] # The variables that changed in this frame
+
+    def update(self) -> None:
+        if len(self.changed) == 0:
+            return None
+        variables, self.changed = self.changed, []
+        changes = {} # {widget: {"text": str}}
+        for variable in variables:
+            variable._dirty = False
+            text = str(variable._value)
+            for widget in variable._widgets:
+                if (not widget._destroyed) and (widget._text != text):
+                    changes[widget] = {"text": text}
+        if len(changes) != 0:
+            apply_changes(self.root, changes)
@@ -1,14 +1,55 @@
 from __future__ import annotations
+from grid import Grid, PositionGeneration
 from event import Event
-from grid import Grid
 import constants
 
 import pygame
 
 
+# The steps of a dispatch plan that aren't tables of tag bindings. Look at
+# `BaseWidget._get_dispatch_plan`
+OWN_BINDINGS = 0
+MASTERS_BINDINGS = 1
+
+_merged_class_bindings = {} # {class: {sequence: (method name, ...)}}
+
+
+def _get_class_bindings(cls) -> dict:
+    # Joins the `_class_bindings` of `cls` and its bases (bases go first)
+    bindings = _merged_class_bindings.get(cls, None)
+    if bindings is None:
+        bindings = {}
+        for base in reversed(cls.__mro__):
+            for sequence, names in base.__dict__.get("_class_bindings",
+                                                     {}).items():
+                bindings[sequence] = bindings.get(sequence, ()) + names
+        _merged_class_bindings[cls] = bindings
+    return bindings
+
+
+# The attributes of `BaseWidget`. They are in the `__slots__` of its
+# subclasses because `Frame` also inherits from `Grid` and both can't have
+# non-empty `__slots__`
+BASE_WIDGET_SLOTS = ("master", "_root", "_cursor", "_default_cursor", "_bg",
+                     "_fg", "_sticky", "_destroyed", "_pointer_inside",
+                     "_style", "_event_bindings", "_my_event_bindings",
+                     "_bindtags", "__weakref__")
+
+
 class BaseWidget:
+    # No `__dict__` so lots of widgets don't use lots of memory. Every
+    # widget class except `Tk` (there is only one) defines `__slots__`.
+    # Subclasses that don't still get a `__dict__`. Look at
+    # `BASE_WIDGET_SLOTS`
+    __slots__ = ()
+
+    # Internal bindings stored once per class (subclasses add to them):
+    #   {sequence: (method name, ...)}
+    _class_bindings = {"<Enter>": ("_enter_cursor", ),
+                       "<Leave>": ("_leave_cursor", )}
+
     def __init__(self, master=None, root=None, bg:str="", fg:str="",
-                 cursor:str=""):
+                 cursor:str="", style=None):
         self.master = master
         if root is None:
             root = master._root
@@ -28,12 +69,23 @@ class BaseWidget:
         self._sticky = ""
         self._destroyed = False
         self._pointer_inside = False
+        # Weak so it doesn't keep us alive (look at `Tk.memory_report`)
+        root._live_widgets.add(self)
+
+        self._style = style
+        if style is not None:
+            style._add_user(self)
+            # Explicit options take priority over the style's options
+            given = {"bg": bg, "fg": fg, "cursor": cursor}
+            options = {key: value for key, value in style._options.items()
+                       if given.get(key, None) in ("", None)}
+            BaseWidget._apply_style(self, options)
 
 ############################### Event handling ################################
-        self._event_bindings = {}
-        self._my_event_bindings = {}
-        self._bind("<Enter>", self._enter_cursor)
-        self._bind("<Leave>", self._leave_cursor)
+        # Only created by the first `bind`/`_bind`
+        self._event_bindings = None
+        self._my_event_bindings = None
+        self._bindtags = None # `None` means the default tags
 
     def event_generate(self, event_name:str, when="tail", **kwargs) -> str:
         """
@@ -49,35 +101,138 @@ class BaseWidget:
         raise ValueError(f"Unknown value for `when`: \"{when}\"")
 
     def _enter_cursor(self, event:Event=None) -> str:
+        # The root's `CursorHandler` sets the actual cursor once per frame
         self._pointer_inside = True
-        if self._cursor == "none":
-            pygame.mouse.set_visible(False)
-        else:
-            pygame.mouse.set_visible(True)
-            pygame.mouse.set_system_cursor(self._cursor)
+        self._root._cursor_handler.invalidate()
         return "break"
 
     def _leave_cursor(self, event:Event=None) -> str:
         self._pointer_inside = False
-        pygame.mouse.set_visible(True)
-        pygame.mouse.set_system_cursor(self._default_cursor)
+        self._root._cursor_handler.invalidate()
         return "break"
 
     def _handle_event(self, event:Event) -> str:
+        for step in self._get_dispatch_plan():
+            if step == OWN_BINDINGS:
+                result = self._handle_own_event(event)
+            elif step == MASTERS_BINDINGS:
+                result = self._handle_masters_event(event)
+            else:
+                result = self._handle_tag_event(step, event)
+            if result == "break":
+                return "break"
+
+    def _handle_own_event(self, event:Event) -> str:
+        # `bind` bindings, then `_class_bindings` and then `_bind` bindings
+        if self._event_bindings is not None:
+            for name in event.names:
+                if name in self._event_bindings:
+                    for function in self._event_bindings[name]:
+                        if function(event) == "break":
+                            return "break"
+        class_bindings = _get_class_bindings(self.__class__)
         for name in event.names:
-            if name in self._event_bindings:
-                for function in self._event_bindings[name]:
-                    if function(event) == "break":
+            if name in class_bindings:
+                for method_name in class_bindings[name]:
+                    if getattr(self, method_name)(event) == "break":
                         return "break"
+        if self._my_event_bindings is not None:
+            for name in event.names:
+                if name in self._my_event_bindings:
+                    for function in self._my_event_bindings[name]:
+                        if function(event) == "break":
+                            return "break"
+
+    def _handle_masters_event(self, event:Event) -> str:
+        # The event goes up to each master until one returns "break"
+        master = self.master
+        while master is not None:
+            if master._handle_own_event(event) == "break":
+                return "break"
+            master = master.master
+
+    def _handle_tag_event(self, table:dict, event:Event) -> str:
         for name in event.names:
-            if name in self._my_event_bindings:
-                for function in self._my_event_bindings[name]:
+            if name in table:
+                for function in table[name]:
                     if function(event) == "break":
                         return "break"
-        if self.master is not None:
-            self.master._handle_event(event)
+
+    def _get_dispatch_plan(self) -> tuple:
+        """
+        Returns the steps that an event goes through. Each step is
+        `OWN_BINDINGS`, `MASTERS_BINDINGS` or a table of a tag's bindings
+        ({sequence: (function, ...)}). Plans are cached by the root (per class for the default
+        tags) until `bind_class` is called again.
+        """
+        if self._bindtags is None:
+            key = (self.__class__, self.master is None)
+        else:
+            key = tuple(OWN_BINDINGS if tag is self else
+                        MASTERS_BINDINGS if tag is self._root else tag
+                        for tag in self._bindtags)
+        plans = self._root._dispatch_plans
+        plan = plans.get(key, None)
+        if plan is None:
+            plan = self._make_dispatch_plan()
+            plans[key] = plan
+        return plan
+
+    def _make_dispatch_plan(self) -> tuple:
+        plan = []
+        for tag in self.bindtags():
+            if tag is self:
+                plan.append(OWN_BINDINGS)
+                continue
+            if tag is self._root:
+                plan.append(MASTERS_BINDINGS)
+                continue
+            table = self._root._tag_bindings.get(tag, None)
+            if table is not None:
+                # One table per tag so the tags stay in order (an earlier
+                # tag's "break" stops the later tags)
+                plan.append({sequence: tuple(functions)
+                             for sequence, functions in table.items()})
+        return tuple(plan)
+
+    def bindtags(self, tags:tuple=None) -> tuple:
+        """
+        Without `tags` returns the tags that events go through (in order).
+        By default that's the widget, its class's name, the root and "all".
+        The root stands for all of the masters (events go up to each
+        master). Strings are the tags used by `bind_class`.
+        """
+        if tags is None:
+            if self._bindtags is not None:
+                return self._bindtags
+            if self.master is None:
+                return (self, self.__class__.__name__, "all")
+            return (self, self.__class__.__name__, self._root, "all")
+        for tag in tags:
+            if not isinstance(tag, str) and (tag is not self) and \
+               (tag is not self._root):
+                raise ValueError("Only the widget, the root and strings " \
+                                 "can be tags")
+        self._bindtags = tuple(tags)
+
+    def bind_class(self, class_name:str, sequence:str, function) -> None:
+        # Binds for all of the widgets with the tag `class_name`
+        tag_bindings = self._root._tag_bindings
+        if class_name not in tag_bindings:
+            tag_bindings[class_name] = {}
+        table = tag_bindings[class_name]
+        if sequence in table:
+            table[sequence].append(function)
+        else:
+            table[sequence] = [function]
+        self._root._dispatch_plans.clear()
+
+    def bind_all(self, sequence:str, function) -> None:
+        self.bind_class("all", sequence, function)
 
     def bind(self, sequence:str, function) -> None:
+        if self._event_bindings is None:
+            self._event_bindings = {}
         if sequence in self._event_bindings:
             self._event_bindings[sequence].append(function)
         else:
@@ -85,6 +240,8 @@ class BaseWidget:
 
     # Only for internal bindings please
     def _bind(self, sequence:str, function) -> None:
+        if self._my_event_bindings is None:
+            self._my_event_bindings = {}
         if sequence in self._my_event_bindings:
             self._my_event_bindings[sequence].append(function)
         else:
@@ -100,7 +257,8 @@ class BaseWidget:
         self.redraw()
 
     def after(self, time_in_ms:int, function, *args) -> int:
-        self._root._after_handler.start_after_script(time_in_ms, function, args)
+        return self._root._after_handler.start_after_script(time_in_ms,
+                                                            function, args)
 
     def after_cancel(self, id:int) -> None:
         self._root._after_handler.stop_after_script(id)
@@ -111,12 +269,83 @@ class BaseWidget:
     def redraw(self) -> None:
         return None
 
+    def redraw_region(self, x1:int, y1:int, x2:int, y2:int) -> None:
+        """
+        Only redraws the area (x1, y1, x2, y2) of the widget. The
+        coordinates are relative to the widget. Children that are outside
+        of the area aren't drawn.
+        """
+        x, y = self._get_abs_position()
+        backend = self._root._backend
+        old_clip = backend.get_clip()
+        backend.set_clip(old_clip.clip((x+x1, y+y1, x2-x1, y2-y1)))
+        self.redraw()
+        backend.set_clip(old_clip)
+
+    def _get_rect(self) -> pygame.Rect:
+        # Make sure the `width` and `height` aren't `float("inf")`:
+        width, height = self._root._display_size
+        return pygame.Rect(*self._get_abs_position(), min(width, self._width),
+                           min(height, self._height))
+
+    def _get_visible_rect(self) -> pygame.Rect:
+        # The part of the widget that isn't cut off by its masters
+        rect = self._get_rect()
+        for master in self.winfo_all_parents():
+            rect = rect.clip(master._get_rect())
+        return rect
+
+    def _clip_to_self(self) -> pygame.Rect:
+        """
+        Limits drawing to the part of the widget that is inside of the
+        current clip area. Returns the old clip area (give it back to
+        `backend.set_clip` after drawing) or `None` if nothing needs to be
+        drawn.
+        """
+        backend = self._root._backend
+        old_clip = backend.get_clip()
+        clip = old_clip.clip(self._get_rect())
+        if (clip.width == 0) or (clip.height == 0):
+            return None
+        backend.set_clip(clip)
+        return old_clip
+
     def destroy(self) -> None:
         if self._destroyed:
             raise RuntimeError("Widget already destroyed")
         self._destroyed = True
+        if self._style is not None:
+            self._style._remove_user(self)
+        # The bound functions can keep other widgets alive
+        self._event_bindings = None
+        self._my_event_bindings = None
+        self._root._forget_widget(self)
+        self._drop_caches()
+
+    def _drop_caches(self) -> None:
+        # Widgets that cache surfaces should free them here
+        return None
+
+    def _apply_style(self, options:dict) -> None:
+        # `options` are already parsed (look at `Style._parse`)
+        if "bg" in options:
+            self._bg = options["bg"]
+        if "fg" in options:
+            self._fg = options["fg"]
+        if "cursor" in options:
+            self._cursor = options["cursor"]
+            if self.winfo_pointer_inside():
+                self._enter_cursor()
 
-    def config(self, cursor:str=None, bg:str=None, fg:str=None) -> None:
+    def config(self, cursor:str=None, bg:str=None, fg:str=None,
+               style=None) -> None:
+        # The style goes first so that the explicit options override it
+        if style is not None:
+            if self._style is not None:
+                self._style._remove_user(self)
+            self._style = style
+            style._add_user(self)
+            self._apply_style(style._options)
         if cursor is not None:
             # Only pass in a set if you already called
             # `constants.parse_cursor(cursor)` on the cursor
@@ -138,7 +367,19 @@ class BaseWidget:
             self._fg = constants.parse_colour(fg)
 
     def focus(self) -> None:
-        self.root._get_widget_from_xy = self
+        # Key events go to the focused widget
+        old = self._root._focused_widget
+        if old is self:
+            return None
+        self._root._focused_widget = self
+        if (old is not None) and (not old._destroyed):
+            old.event_generate("<FocusOut>")
+        self.event_generate("<FocusIn>")
+
+    focus_set = focus
+
+    def focus_get(self) -> BaseWidget:
+        return self._root._focused_widget
 
     def winfo_pointer_inside(self) -> bool:
         return self._pointer_inside
@@ -162,10 +403,10 @@ class BaseWidget:
         return self._req_height
 
     def winfo_x(self) -> int:
-        return self._x
+        return self._get_abs_position()[0]
 
     def winfo_y(self) -> int:
-        return self._y
+        return self._get_abs_position()[1]
 
     def winfo_is_child(self, widget) -> bool:
         """
@@ -194,14 +435,21 @@ class BaseWidget:
 
 
 class Widget(BaseWidget):
+    __slots__ = BASE_WIDGET_SLOTS + ("_req_width", "_req_height", "_width",
+                                     "_height", "_x", "_y", "_abs_position",
+                                     "_abs_generation")
+
     def __init__(self, master, width:int, height:int, **kwargs):
         super().__init__(master, **kwargs)
         self._req_width = width
         self._req_height = height
         self._width = 0
         self._height = 0
+        # Relative to `master`. Use `_get_abs_position` for screen coords
         self._x = 0
         self._y = 0
+        self._abs_position = (0, 0)
+        self._abs_generation = -1
 
     def _update_height(self, new_height:int) -> None:
         self._height = new_height
@@ -210,15 +458,25 @@ class Widget(BaseWidget):
         self._width = new_width
 
     def _update_x(self, dx:int) -> None:
-        self._x += dx
+        if dx != 0:
+            self._x += dx
+            PositionGeneration.bump()
 
     def _update_y(self, dy:int) -> None:
-        self._y += dy
+        if dy != 0:
+            self._y += dy
+            PositionGeneration.bump()
+
+    def _get_abs_position(self) -> (int, int):
+        if self._abs_generation != PositionGeneration.value:
+            x, y = self.master._get_abs_position()
+            self._abs_position = (x + self._x, y + self._y)
+            self._abs_generation = PositionGeneration.value
+        return self._abs_position
 
     def destroy(self) -> None:
         super().destroy()
         self.master._widget_destroyed(self)
-        self.master.redraw()
 
     def config(self, width:int=None, height:int=None, **kwargs) -> None:
         super().config(**kwargs)
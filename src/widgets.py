@@ -1,18 +1,40 @@
-from widget import Widget, BaseWidget
+from widget import Widget, BaseWidget, BASE_WIDGET_SLOTS
 from event import Event
 from grid import Grid
 import constants
 
-import pygame
+
+def _parse_option(parsed:dict, key:str, value):
+    # Parses colours/fonts once for each value (used by `Frame.grid_many`)
+    if key in ("fg", "bg", "bdcolour"):
+        parse = constants.parse_colour
+    elif key == "font":
+        parse = constants.parse_font
+    else:
+        return value
+    try:
+        if (key, value) not in parsed:
+            parsed[(key, value)] = parse(value)
+    except TypeError:
+        # Not hashable (like a list)
+        return value
+    if parsed[(key, value)] is None:
+        # `""` (no colour) has to be passed in as it is
+        return value
+    return parsed[(key, value)]
 
 
 class Frame(Grid, BaseWidget):
+    # `Grid` already has some of `BaseWidget`'s attributes
+    __slots__ = tuple(name for name in BASE_WIDGET_SLOTS
+                      if name not in Grid.__slots__)
+
     def __init__(self, master=None, root=None, bg:str="black",
-                 dictate_own_size:bool=True, cursor:str=""):
+                 dictate_own_size:bool=True, cursor:str="", style=None):
         Grid.__init__(self, master=master, root=root,
                       dictate_own_size=dictate_own_size)
         BaseWidget.__init__(self, master=master, root=root, bg=bg,
-                            cursor=cursor)
+                            cursor=cursor, style=style)
 
     def update(self) -> (int, int, int, int):
         for child in self._children:
@@ -25,49 +47,139 @@ class Frame(Grid, BaseWidget):
     def redraw(self) -> None:
         BaseWidget.redraw(self)
         if self._bg is not None:
-            # Make sure the `width` and `height` aren't `float("inf")`:
-            width, height = self._root._display.get_size()
-            width = min(width, self._width)
-            height = min(height, self._height)
-            args = (self._x, self._y, width, height)
-            # The 0 is the thickness
-            pygame.draw.rect(self._root._display, self._bg, args, 0)
+            # Children can't draw outside of us
+            old_clip = self._clip_to_self()
+            if old_clip is None:
+                return None
+            args = tuple(self._get_rect())
+            self._root._backend.fill_rect(self._bg, args)
 
+            # Only visit the children inside of the area being redrawn
+            clip = self._root._backend.get_clip()
             for child in self._children:
-                child.redraw()
+                if clip.colliderect(child._get_rect()):
+                    child.redraw()
+            self._root._backend.set_clip(old_clip)
             return args
 
+    def grid_many(self, rows:[[tuple, ...], ...]) -> [[BaseWidget, ...], ...]:
+        """
+        Creates and grids lots of widgets with only one layout pass. `rows`
+        is a list of rows of cells. Each cell is `None` (empty) or
+        `(widget_class, kwargs)` or `(widget_class, kwargs, sticky)`.
+        Returns the widgets in the same shape.
+
+        Colours and fonts are parsed once for each different value and
+        labels with the same text/font/colour share one rendered surface.
+        """
+        parsed = {} # {(key, value): parsed value}
+        output = []
+        self._layout_suspended = True
+        self._root._text_surface_cache = {}
+        try:
+            for row, cells in enumerate(rows):
+                output.append([])
+                for column, cell in enumerate(cells):
+                    if cell is None:
+                        output[-1].append(None)
+                        continue
+                    widget_class, kwargs, sticky = (*cell, "")[:3]
+                    kwargs = {key: _parse_option(parsed, key, value)
+                              for key, value in kwargs.items()}
+                    widget = widget_class(self, **kwargs)
+                    widget._sticky = sticky
+                    self._add_widget(widget, row=row, column=column)
+                    output[-1].append(widget)
+        finally:
+            self._layout_suspended = False
+            self._root._text_surface_cache = None
+        self._update()
+        return output
+
     def config(self, cursor:str=None, width:int=None,
-               height:int=None, bg:str=None) -> None:
+               height:int=None, bg:str=None, style=None) -> None:
         Grid.config(self, width=width, height=height)
-        BaseWidget.config(self, cursor=cursor, bg=bg)
-        if bg is not None:
+        BaseWidget.config(self, cursor=cursor, bg=bg, style=style)
+        if (bg is not None) or (style is not None):
             self.redraw()
 
 
 class Label(Widget):
+    __slots__ = ("_font", "_padx", "_pady", "_text", "_surface", "_coords",
+                 "_textvariable")
+
     def __init__(self, master, text:str="", font:tuple=None,
-                 padx:int=10, pady:int=10, **kwargs):
-        if None in (padx, pady):
-            raise ValueError("Invalid padx/pady: None")
+                 padx:int=None, pady:int=None, style=None, textvariable=None,
+                 **kwargs):
+        if style is not None:
+            # Explicit options take priority over the style's options
+            if font is None:
+                font = style._options.get("font", None)
+            if padx is None:
+                padx = style._options.get("padx", None)
+            if pady is None:
+                pady = style._options.get("pady", None)
+        if padx is None:
+            padx = 10
+        if pady is None:
+            pady = 10
         if font is None:
-            self._font = pygame.font.SysFont("", 30)
+            self._font = constants.parse_font(("", 30))
 
-        super().__init__(master, height=0, width=0, **kwargs)
-        self.config(text=text, padx=padx, pady=pady, font=font)
+        super().__init__(master, height=0, width=0, style=style, **kwargs)
+        self._textvariable = None
+        self.config(text=text, padx=padx, pady=pady, font=font,
+                    textvariable=textvariable)
+
+    def destroy(self) -> None:
+        if self._textvariable is not None:
+            self._textvariable._remove_widget(self)
+        super().destroy()
 
     def _create_surface(self) -> (int, int):
-        self._surface = self._font.render(self._text, False, self._fg)
+        # Look at `Frame.grid_many`
+        cache = self._root._text_surface_cache
+        if cache is None:
+            self._surface = self._font.render(self._text, False, self._fg)
+        else:
+            key = (self._text, self._font, self._fg)
+            if key not in cache:
+                cache[key] = self._font.render(self._text, False, self._fg)
+            self._surface = cache[key]
         width, height = self._surface.get_size()
         return (width, height)
 
+    def _update_req_size(self) -> None:
+        # Doesn't tell the master. Use `.config` if you need that.
+        width, height = self._create_surface()
+        self._req_width = width + sum(self._padx)
+        self._req_height = height + sum(self._pady)
+
+    def _apply_style(self, options:dict) -> None:
+        super()._apply_style(options)
+        if "font" in options:
+            self._font = options["font"]
+        if "padx" in options:
+            self._padx = options["padx"]
+        if "pady" in options:
+            self._pady = options["pady"]
+        self._update_req_size()
+
     def config(self, text:str=None, bg:str=None, fg:str=None, pady:int=None,
-               font:tuple=None, cursor:str=None, padx:int=None) -> None:
-        super().config(bg=bg, fg=fg, cursor=cursor)
+               font:tuple=None, cursor:str=None, padx:int=None,
+               style=None, textvariable=None) -> None:
+        super().config(bg=bg, fg=fg, cursor=cursor, style=style)
+        if textvariable is not None:
+            # Look at `variables.Variable`
+            if self._textvariable is not None:
+                self._textvariable._remove_widget(self)
+            self._textvariable = textvariable
+            textvariable._add_widget(self)
+            text = str(textvariable.get())
         if text is not None:
             self._text = text
         if font is not None:
-            self._font = pygame.font.SysFont(*font)
+            self._font = constants.parse_font(font)
         if padx is not None:
             if isinstance(padx, int):
                 self._padx = (padx, padx)
@@ -80,16 +192,14 @@ class Label(Widget):
                 self._pady = pady
 
         if len(tuple(filter(None, (text, font, bg, fg)))) != 0:
-            width, height = self._create_surface()
-            width += sum(self._padx)
-            height += sum(self._pady)
-            super().config(width=width, height=height)
+            self._update_req_size()
+        if len(tuple(filter(None, (text, font, bg, fg, style)))) != 0:
+            super().config(width=self._req_width, height=self._req_height)
 
     def redraw(self) -> (int, int, int, int):
         super().redraw()
 
-        x = self._x
-        y = self._y
+        x, y = self._get_abs_position()
         width = self._width
         height = min(self._req_height, self._height)
 
@@ -105,11 +215,16 @@ class Label(Widget):
                 x += self._width - self._req_width
 
         args = (x, y, width, height)
+        if self._bg is not None:
+            self._coords = (args[0], args[1], args[2]+args[0], args[3]+args[1])
+
+        old_clip = self._clip_to_self()
+        if old_clip is None:
+            return args
 
         if self._bg is not None:
             # Background box (same as `Frame.redraw`):
-            self._coords = (args[0], args[1], args[2]+args[0], args[3]+args[1])
-            pygame.draw.rect(self._root._display, self._bg, args, 0)
+            self._root._backend.fill_rect(self._bg, args)
 
         if self._text != "":
             # Draw the text:
@@ -117,13 +232,23 @@ class Label(Widget):
             y += self._pady[0]
             width -=  self._padx[1]
             height -=  self._pady[1]
-            self._root._display.blit(self._surface, (x, y), (0, 0, width,
+            self._root._backend.blit(self._surface, (x, y), (0, 0, width,
                                                              height))
 
+        self._redraw_extra(args)
+        self._root._backend.set_clip(old_clip)
         return args
 
+    def _redraw_extra(self, rect:(int, int, int, int)) -> None:
+        # Subclasses draw things on top here (still clipped to the widget)
+        return None
+
 
 class Button(Label):
+    __slots__ = ("_bd", "_command", "_bdcolour", "_pressing")
+    _class_bindings = {"<ButtonPress-1>": ("_handle_button_press", ),
+                       "<ButtonRelease-1>": ("_handle_button_release", )}
+
     def __init__(self, master, command=None, bd=2, bdcolour="grey", **kwargs):
         self._bd = bd
         self._command = command
@@ -132,9 +257,6 @@ class Button(Label):
 
         self._pressing = False
 
-        super()._bind("<ButtonPress-1>", self._handle_button_press)
-        super()._bind("<ButtonRelease-1>", self._handle_button_release)
-
     def _handle_button_press(self, event) -> str:
         x1, y1, x2, y2 = self._coords
         if (x1 < event.x < x2) and (y1 < event.y < y2):
@@ -159,12 +281,10 @@ class Button(Label):
             self._command = command
         super().config(**kwargs)
 
-    def redraw(self) -> (int, int, int, int):
-        super().redraw()
-        x, y, width, height = super().redraw()
+    def _redraw_extra(self, rect:(int, int, int, int)) -> None:
+        x, y, width, height = rect
         if (self._bd != 0) and (self._bdcolour != ""):
             width -= self._bd
             height -= self._bd
-            args = (x, y, width, height)
-            pygame.draw.rect(self._root._display, self._bdcolour,
-                             (x, y, width, height), self._bd)
+            self._root._backend.draw_rect(self._bdcolour,
+                                          (x, y, width, height), self._bd)